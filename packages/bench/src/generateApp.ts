@@ -0,0 +1,205 @@
+import { mkdir, rm, writeFile } from 'node:fs/promises'
+import { dirname, join } from 'node:path'
+
+/**
+ * Writes a synthetic One app with `sections` copies of the same route set so
+ * route matching, layouts and middlewares scale with the app:
+ *
+ *   app/_layout.tsx                     root layout with a loader
+ *   app/_middleware.ts                  root middleware
+ *   app/s{n}/_layout.tsx                nested layout with a loader
+ *   app/s{n}/_middleware.ts             nested middleware
+ *   app/s{n}/index+ssg.tsx              ssg page with a loader
+ *   app/s{n}/[id]+ssr.tsx               ssr page with a loader
+ *   app/s{n}/shell/_layout+ssg.tsx      ssg layout around spa pages
+ *   app/s{n}/shell/[id]+spa.tsx         spa page rendered into the shell
+ *   app/api/s{n}+api.ts                 json api route
+ */
+
+export const BENCH_IDS = ['1', '2', '3', '4']
+
+// rows rendered per page, enough for the render to cost more than routing
+const ROWS = 50
+
+const files = {
+  'package.json': JSON.stringify({ name: 'bench-app', private: true, type: 'module' }),
+
+  'vite.config.ts': `import { one } from 'one/vite'
+import type { UserConfig } from 'vite'
+
+export default {
+  plugins: [
+    one({
+      config: {
+        tsConfigPaths: {
+          ignoreConfigErrors: true,
+        },
+      },
+    }),
+  ],
+} satisfies UserConfig
+`,
+
+  'tsconfig.json': JSON.stringify(
+    {
+      compilerOptions: {
+        target: 'ESNext',
+        module: 'ESNext',
+        moduleResolution: 'bundler',
+        esModuleInterop: true,
+        strict: true,
+        jsx: 'react-jsx',
+        skipLibCheck: true,
+      },
+      include: ['**/*.ts', '**/*.tsx'],
+    },
+    null,
+    2
+  ),
+
+  'app/_layout.tsx': `import { Slot } from 'one'
+
+export async function loader() {
+  return { site: 'bench' }
+}
+
+export default function RootLayout() {
+  return <Slot />
+}
+`,
+
+  'app/_middleware.ts': `import { createMiddleware } from 'one'
+
+export default createMiddleware(async ({ next }) => {
+  return await next()
+})
+`,
+
+  'app/index+ssg.tsx': `export default function Home() {
+  return <h1>bench</h1>
+}
+`,
+}
+
+function rowsComponent() {
+  return `function Rows({ items }: { items: { id: number; title: string; tags: string[] }[] }) {
+  return (
+    <ul>
+      {items.map((item) => (
+        <li key={item.id}>
+          <strong>{item.title}</strong>
+          {item.tags.map((tag) => (
+            <span key={tag}> #{tag}</span>
+          ))}
+        </li>
+      ))}
+    </ul>
+  )
+}
+
+function getItems(seed: string) {
+  return Array.from({ length: ${ROWS} }, (_, id) => ({
+    id,
+    title: \`\${seed} item \${id}\`,
+    tags: ['a', 'b', 'c'].map((tag) => \`\${tag}\${id % 7}\`),
+  }))
+}
+`
+}
+
+function sectionFiles(section: string): Record<string, string> {
+  return {
+    [`app/${section}/_layout.tsx`]: `import { Slot } from 'one'
+
+export async function loader() {
+  return { section: '${section}' }
+}
+
+export default function SectionLayout() {
+  return (
+    <main>
+      <nav>${section}</nav>
+      <Slot />
+    </main>
+  )
+}
+`,
+
+    [`app/${section}/_middleware.ts`]: `import { createMiddleware } from 'one'
+
+export default createMiddleware(async ({ next }) => {
+  return await next()
+})
+`,
+
+    [`app/${section}/index+ssg.tsx`]: `import { useLoader } from 'one'
+
+${rowsComponent()}
+export async function loader() {
+  return { items: getItems('${section}') }
+}
+
+export default function SectionIndex() {
+  const { items } = useLoader(loader)
+  return <Rows items={items} />
+}
+`,
+
+    [`app/${section}/[id]+ssr.tsx`]: `import { useLoader } from 'one'
+
+${rowsComponent()}
+export async function loader({ params }: { params: { id: string } }) {
+  return { items: getItems(\`${section} \${params.id}\`) }
+}
+
+export default function SectionPage() {
+  const { items } = useLoader(loader)
+  return <Rows items={items} />
+}
+`,
+
+    [`app/${section}/shell/_layout+ssg.tsx`]: `import { Slot } from 'one'
+
+export default function ShellLayout() {
+  return (
+    <div id="shell">
+      <header>${section} shell</header>
+      <Slot />
+    </div>
+  )
+}
+`,
+
+    [`app/${section}/shell/[id]+spa.tsx`]: `export default function ShellPage() {
+  return <p>client rendered</p>
+}
+`,
+
+    [`app/api/${section}+api.ts`]: `export async function GET(request: Request) {
+  const id = new URL(request.url).searchParams.get('id')
+  return Response.json({ section: '${section}', id })
+}
+`,
+  }
+}
+
+export function getSections(count: number) {
+  return Array.from({ length: count }, (_, index) => `s${index}`)
+}
+
+export async function generateApp(appDir: string, sections: string[]) {
+  await rm(appDir, { recursive: true, force: true })
+
+  const all: Record<string, string> = { ...files }
+  for (const section of sections) {
+    Object.assign(all, sectionFiles(section))
+  }
+
+  await Promise.all(
+    Object.entries(all).map(async ([file, contents]) => {
+      const path = join(appDir, file)
+      await mkdir(dirname(path), { recursive: true })
+      await writeFile(path, contents)
+    })
+  )
+}
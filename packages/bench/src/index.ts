@@ -0,0 +1,173 @@
+import { execFileSync } from 'node:child_process'
+import { readFile, writeFile } from 'node:fs/promises'
+import { cpus } from 'node:os'
+import { dirname, join, resolve } from 'node:path'
+import { fileURLToPath } from 'node:url'
+import { parseArgs } from 'node:util'
+import { BENCH_IDS, generateApp, getSections } from './generateApp'
+import { type LoadResult, runLoad } from './loadTest'
+import { ONE_RUN_ENTRY, runBuild, type ServerTarget, startServer } from './servers'
+
+/**
+ * Load tests the production server paths of a synthetic app and writes the
+ * results as JSON, see README.md.
+ */
+
+const { values: args } = parseArgs({
+  options: {
+    routes: { type: 'string', default: '10' },
+    concurrency: { type: 'string', default: '32' },
+    duration: { type: 'string', default: '10' },
+    targets: { type: 'string', default: 'one-serve,worker' },
+    out: { type: 'string', default: 'results.json' },
+    'skip-build-compare': { type: 'boolean', default: false },
+  },
+})
+
+const packageDir = join(dirname(fileURLToPath(import.meta.url)), '..')
+const appDir = join(packageDir, '.app')
+
+const sectionCount = Number(args.routes)
+const concurrency = Number(args.concurrency)
+const durationMs = Number(args.duration) * 1000
+const targets = args.targets.split(',') as ServerTarget[]
+
+// builds must not reuse pages from a previous run
+const baseEnv = { ...process.env }
+delete baseEnv.ONE_BUILD_INCREMENTAL
+delete baseEnv.ONE_BUFFERED_SSR
+
+type BuildResult = { ms: number; perPageMs: number }
+
+async function readBuildInfo() {
+  return JSON.parse(await readFile(join(appDir, 'dist', 'buildInfo.json'), 'utf-8'))
+}
+
+async function benchBuilds() {
+  const timed = async (workers: '0' | '1'): Promise<BuildResult> => {
+    const ms = await runBuild(appDir, { ...baseEnv, ONE_BUILD_WORKERS: workers })
+    const pages = Object.keys((await readBuildInfo()).routeMap).length
+    return { ms: Math.round(ms), perPageMs: Math.round((ms / pages) * 100) / 100 }
+  }
+
+  if (args['skip-build-compare']) {
+    console.info(`[bench] building`)
+    return { workerPool: await timed('1') }
+  }
+
+  console.info(`[bench] building with pLimit`)
+  const pLimit = await timed('0')
+  // the worker build runs last so its output is what gets served
+  console.info(`[bench] building with BuildWorkerPool`)
+  const workerPool = await timed('1')
+  return { pLimit, workerPool }
+}
+
+function getScenarios(cacheKey: string) {
+  const sections = getSections(sectionCount)
+  const each = (toPath: (section: string, id: string) => string) =>
+    sections.flatMap((section) => BENCH_IDS.map((id) => toPath(section, id)))
+
+  return {
+    ssr: each((section, id) => `/${section}/${id}`),
+    ssg: sections.map((section) => `/${section}`),
+    spaShell: each((section, id) => `/${section}/shell/${id}`),
+    // what client navigations to the ssr pages request
+    loader: each((section, id) => `/assets/${section}_${id}_${cacheKey}_vxrn_loader.js`),
+    api: each((section, id) => `/api/${section}?id=${id}`),
+  }
+}
+
+async function benchServer(
+  target: ServerTarget,
+  scenarios: ReturnType<typeof getScenarios>
+) {
+  const results: Record<string, LoadResult> = {}
+
+  const measure = async (name: string, baseUrl: string, paths: string[]) => {
+    console.info(`[bench] ${target} ${name}`)
+    results[name] = await runLoad({ baseUrl, paths, concurrency, durationMs })
+  }
+
+  // only ssr rendering changes with ONE_BUFFERED_SSR, the rest runs once
+  const streaming = await startServer({ target, appDir, env: baseEnv })
+  try {
+    await measure('ssrStream', streaming.url, scenarios.ssr)
+    await measure('ssg', streaming.url, scenarios.ssg)
+    await measure('spaShell', streaming.url, scenarios.spaShell)
+    await measure('loader', streaming.url, scenarios.loader)
+    await measure('api', streaming.url, scenarios.api)
+  } finally {
+    await streaming.stop()
+  }
+
+  const buffered = await startServer({
+    target,
+    appDir,
+    env: { ...baseEnv, ONE_BUFFERED_SSR: '1' },
+  })
+  try {
+    await measure('ssrBuffered', buffered.url, scenarios.ssr)
+  } finally {
+    await buffered.stop()
+  }
+
+  return results
+}
+
+console.info(`[bench] generating ${sectionCount} route sections in ${appDir}`)
+await generateApp(appDir, getSections(sectionCount))
+
+const build = await benchBuilds()
+const buildInfo = await readBuildInfo()
+const scenarios = getScenarios(buildInfo.constants.CACHE_KEY)
+
+const servers: Record<string, Record<string, LoadResult>> = {}
+for (const target of targets) {
+  servers[target] = await benchServer(target, scenarios)
+}
+
+const onePackage = JSON.parse(
+  await readFile(join(dirname(ONE_RUN_ENTRY), 'package.json'), 'utf-8')
+)
+
+const results = {
+  date: new Date().toISOString(),
+  one: onePackage.version,
+  environment: {
+    node: execFileSync('node', ['--version'], { encoding: 'utf-8' }).trim(),
+    platform: `${process.platform}-${process.arch}`,
+    cpu: cpus()[0]?.model,
+    cpus: cpus().length,
+  },
+  options: { routes: sectionCount, concurrency, durationMs },
+  app: {
+    routes: buildInfo.manifest.pageRoutes.length,
+    pages: Object.keys(buildInfo.routeMap).length,
+  },
+  build,
+  servers,
+}
+
+const outFile = resolve(args.out)
+await writeFile(outFile, JSON.stringify(results, null, 2) + '\n')
+
+for (const [target, scenarioResults] of Object.entries(servers)) {
+  console.info(`\n${target}`)
+  console.table(
+    Object.fromEntries(
+      Object.entries(scenarioResults).map(([name, result]) => [
+        name,
+        {
+          'req/s': result.requestsPerSecond,
+          p50: result.latencyMs.p50,
+          p95: result.latencyMs.p95,
+          p99: result.latencyMs.p99,
+          errors: result.errors,
+        },
+      ])
+    )
+  )
+}
+
+console.info(`\n[bench] wrote ${outFile}`)
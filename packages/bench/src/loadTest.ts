@@ -0,0 +1,121 @@
+import { Agent, request } from 'node:http'
+
+export type LoadResult = {
+  requests: number
+  errors: number
+  durationMs: number
+  requestsPerSecond: number
+  latencyMs: {
+    mean: number
+    p50: number
+    p95: number
+    p99: number
+    max: number
+  }
+}
+
+// nearest-rank percentile over sorted samples
+function percentile(sorted: Float64Array, p: number) {
+  if (!sorted.length) return 0
+  const rank = Math.ceil((p / 100) * sorted.length)
+  return sorted[Math.min(sorted.length, Math.max(rank, 1)) - 1]
+}
+
+function round(value: number) {
+  return Math.round(value * 1000) / 1000
+}
+
+function get(agent: Agent, url: URL): Promise<number> {
+  return new Promise((resolve, reject) => {
+    const req = request(url, { agent }, (res) => {
+      // drain the body so the socket goes back to the pool
+      res.on('data', () => {})
+      res.on('end', () => resolve(res.statusCode || 0))
+      res.on('error', reject)
+    })
+    req.on('error', reject)
+    req.end()
+  })
+}
+
+/**
+ * Sends requests for `paths` round robin from `concurrency` keep-alive
+ * connections for `durationMs`, after one warmup request per path so module
+ * imports and first renders aren't measured. Non 2xx/3xx responses count as
+ * errors and are left out of the latencies.
+ */
+export async function runLoad({
+  baseUrl,
+  paths,
+  concurrency,
+  durationMs,
+}: {
+  baseUrl: string
+  paths: string[]
+  concurrency: number
+  durationMs: number
+}): Promise<LoadResult> {
+  const agent = new Agent({ keepAlive: true, maxSockets: concurrency })
+  const urls = paths.map((path) => new URL(path, baseUrl))
+
+  for (const url of urls) {
+    const status = await get(agent, url)
+    if (status >= 400) {
+      agent.destroy()
+      throw new Error(`[bench] warmup request to ${url} failed with ${status}`)
+    }
+  }
+
+  let samples = new Float64Array(1 << 16)
+  let count = 0
+  let errors = 0
+  let next = 0
+
+  const startedAt = performance.now()
+  const deadline = startedAt + durationMs
+
+  async function connection() {
+    while (performance.now() < deadline) {
+      const url = urls[next++ % urls.length]
+      const requestStart = performance.now()
+      try {
+        const status = await get(agent, url)
+        if (status >= 400) {
+          errors++
+          continue
+        }
+      } catch {
+        errors++
+        continue
+      }
+      if (count === samples.length) {
+        const grown = new Float64Array(samples.length * 2)
+        grown.set(samples)
+        samples = grown
+      }
+      samples[count++] = performance.now() - requestStart
+    }
+  }
+
+  await Promise.all(Array.from({ length: concurrency }, connection))
+  const elapsed = performance.now() - startedAt
+  agent.destroy()
+
+  const sorted = samples.subarray(0, count).sort()
+  let total = 0
+  for (const sample of sorted) total += sample
+
+  return {
+    requests: count,
+    errors,
+    durationMs: round(elapsed),
+    requestsPerSecond: round((count / elapsed) * 1000),
+    latencyMs: {
+      mean: round(count ? total / count : 0),
+      p50: round(percentile(sorted, 50)),
+      p95: round(percentile(sorted, 95)),
+      p99: round(percentile(sorted, 99)),
+      max: round(count ? sorted[count - 1] : 0),
+    },
+  }
+}
@@ -0,0 +1,116 @@
+import { spawn } from 'node:child_process'
+import { createRequire } from 'node:module'
+import { createServer } from 'node:net'
+import { dirname, join } from 'node:path'
+import { fileURLToPath } from 'node:url'
+
+// resolved through package.json, same as @vxrn/test, so it works without .bin shims
+const requireFromHere = createRequire(import.meta.url)
+export const ONE_RUN_ENTRY = join(
+  dirname(requireFromHere.resolve('one/package.json')),
+  'run.mjs'
+)
+const WORKER_SERVER_ENTRY = join(
+  dirname(fileURLToPath(import.meta.url)),
+  'workerServer.ts'
+)
+
+export type ServerTarget = 'one-serve' | 'worker'
+
+export type RunningServer = {
+  url: string
+  stop: () => Promise<void>
+}
+
+// servers run under node, the runtime `one serve` targets
+function run(args: string[], options: { cwd: string; env: NodeJS.ProcessEnv }) {
+  const child = spawn('node', args, { ...options, stdio: 'pipe', detached: true })
+  let output = ''
+  child.stdout?.on('data', (data) => (output += data))
+  child.stderr?.on('data', (data) => (output += data))
+  const exited = new Promise<number | null>((resolve) => child.once('exit', resolve))
+  return { child, exited, getOutput: () => output }
+}
+
+function killGroup(pid: number | undefined, signal: NodeJS.Signals) {
+  if (!pid) return
+  try {
+    process.kill(-pid, signal)
+  } catch {
+    // already gone
+  }
+}
+
+export async function getFreePort(): Promise<number> {
+  return await new Promise((resolve, reject) => {
+    const server = createServer()
+    server.once('error', reject)
+    server.listen(0, () => {
+      const address = server.address()
+      server.close(() => resolve(typeof address === 'object' ? address!.port : 0))
+    })
+  })
+}
+
+/**
+ * Runs `one build` in the app directory and returns the wall clock time.
+ */
+export async function runBuild(appDir: string, env: NodeJS.ProcessEnv) {
+  const startedAt = performance.now()
+  const build = run([ONE_RUN_ENTRY, 'build'], { cwd: appDir, env })
+  const code = await build.exited
+  if (code !== 0) {
+    throw new Error(`[bench] one build exited with ${code}\n${build.getOutput()}`)
+  }
+  return performance.now() - startedAt
+}
+
+export async function startServer({
+  target,
+  appDir,
+  env,
+}: {
+  target: ServerTarget
+  appDir: string
+  env: NodeJS.ProcessEnv
+}): Promise<RunningServer> {
+  const port = await getFreePort()
+  const url = `http://localhost:${port}`
+  const args =
+    target === 'one-serve'
+      ? [ONE_RUN_ENTRY, 'serve', '--port', `${port}`]
+      : [WORKER_SERVER_ENTRY, `${port}`]
+
+  const server = run(args, { cwd: appDir, env: { ...env, ONE_SERVER_URL: url } })
+
+  let exitCode: number | null | undefined
+  server.exited.then((code) => {
+    exitCode = code
+  })
+
+  const stop = async () => {
+    if (exitCode !== undefined) return
+    killGroup(server.child.pid, 'SIGTERM')
+    const timeout = setTimeout(() => killGroup(server.child.pid, 'SIGKILL'), 2000)
+    await server.exited
+    clearTimeout(timeout)
+  }
+
+  const deadline = Date.now() + 60_000
+  while (Date.now() < deadline) {
+    if (exitCode !== undefined) {
+      throw new Error(
+        `[bench] ${target} server exited with ${exitCode}\n${server.getOutput()}`
+      )
+    }
+    try {
+      await fetch(url)
+      return { url, stop }
+    } catch {
+      await new Promise((resolve) => setTimeout(resolve, 200))
+    }
+  }
+
+  await stop()
+  throw new Error(`[bench] ${target} server didn't start\n${server.getOutput()}`)
+}
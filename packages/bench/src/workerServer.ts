@@ -0,0 +1,115 @@
+import { readFile } from 'node:fs/promises'
+import { createServer } from 'node:http'
+import { join, resolve } from 'node:path'
+import { pathToFileURL } from 'node:url'
+import { serve, setFetchStaticHtml } from 'one/serve-worker'
+
+/**
+ * Serves a built app through createWorkerHandler (`one/serve-worker`) from node,
+ * standing in for the worker runtime: lazy routes import the node build output
+ * and static files are read from dist/client the way an ASSETS binding would.
+ *
+ * usage: node src/workerServer.ts <port>, from the app directory
+ */
+
+const port = Number(process.argv[2])
+const outDir = resolve('dist')
+const clientDir = join(outDir, 'client')
+
+const buildInfo = JSON.parse(await readFile(join(outDir, 'buildInfo.json'), 'utf-8'))
+
+function load(path: string) {
+  return () => import(pathToFileURL(resolve(path)).href)
+}
+
+const pages: Record<string, () => Promise<any>> = {}
+for (const [routeFile, info] of Object.entries<any>(buildInfo.routeToBuildInfo)) {
+  if (info.serverJsPath) {
+    pages[routeFile] = load(info.serverJsPath)
+  }
+}
+
+const api: Record<string, () => Promise<any>> = {}
+for (const route of buildInfo.manifest.apiRoutes) {
+  // same file naming as oneServe's handleAPI
+  const fileName = route.page.slice(1).replace(/\[/g, '_').replace(/\]/g, '_')
+  api[route.page] = load(join(outDir, 'api', `${fileName}.js`))
+}
+
+const middlewares: Record<string, () => Promise<any>> = {}
+for (const route of [...buildInfo.manifest.pageRoutes, ...buildInfo.manifest.apiRoutes]) {
+  for (const middleware of route.middlewares || []) {
+    middlewares[middleware.contextKey] ||= load(middleware.contextKey)
+  }
+}
+
+const server = await serve(buildInfo, {
+  serverEntry: load(join(outDir, 'server', '_virtual_one-entry.js')),
+  pages,
+  api,
+  middlewares,
+})
+
+async function readStatic(pathname: string) {
+  // keep reads inside dist/client
+  const file = join(clientDir, pathname)
+  if (!file.startsWith(clientDir)) return null
+  try {
+    return await readFile(file)
+  } catch {
+    return null
+  }
+}
+
+setFetchStaticHtml(async (path) => {
+  const html = await readStatic(path)
+  return html ? html.toString('utf-8') : null
+})
+
+createServer(async (req, res) => {
+  try {
+    const request = new Request(`http://localhost:${port}${req.url}`, {
+      method: req.method,
+      headers: req.headers as Record<string, string>,
+    })
+
+    let response: Response | null = await server.fetch(request)
+
+    if (!response || response.status === 404) {
+      const file = await readStatic(new URL(request.url).pathname)
+      if (file) {
+        response = new Response(file, {
+          headers: {
+            'content-type': req.url?.endsWith('.js') ? 'text/javascript' : 'text/html',
+          },
+        })
+      }
+    }
+
+    if (!response) {
+      res.writeHead(404).end()
+      return
+    }
+
+    const headers: Record<string, string | string[]> = {}
+    response.headers.forEach((value, key) => {
+      headers[key] = value
+    })
+    res.writeHead(response.status, headers)
+
+    if (response.body) {
+      const reader = response.body.getReader()
+      while (true) {
+        const { done, value } = await reader.read()
+        if (done) break
+        res.write(value)
+      }
+    }
+    res.end()
+  } catch (err) {
+    console.error(err)
+    res.writeHead(500).end()
+  }
+}).listen(port, () => {
+  console.info(`[bench] worker handler listening on http://localhost:${port}`)
+})
@@ -0,0 +1,153 @@
+import {
+  appendFileSync,
+  mkdtempSync,
+  rmSync,
+  statSync,
+  utimesSync,
+  writeFileSync,
+} from 'node:fs'
+import { tmpdir } from 'node:os'
+import { join } from 'node:path'
+import { afterEach, describe, expect, it } from 'vitest'
+import { createTransformCache, type TransformCache } from './cache'
+
+const key = (n: number) => n.toString(16).padStart(40, '0')
+
+let dir: string
+const opened: TransformCache[] = []
+
+function open(maxBytes?: number) {
+  dir ||= mkdtempSync(join(tmpdir(), 'vxrn-compiler-cache-'))
+  const cache = createTransformCache({ dir, maxBytes })
+  opened.push(cache)
+  return cache
+}
+
+afterEach(() => {
+  for (const cache of opened.splice(0)) cache.close()
+  if (dir) rmSync(dir, { recursive: true, force: true })
+  dir = ''
+})
+
+describe('createTransformCache', () => {
+  it('reads entries back after a restart', () => {
+    const first = open()
+    first.set(key(1), 'aaaa', { code: 'export const a = "é"' })
+    first.set(key(2), 'bbbb', { code: 'b', map: { mappings: ';;' } })
+    first.close()
+
+    const second = open()
+    expect(second.get(key(1), 'aaaa')).toEqual({
+      code: 'export const a = "é"',
+      map: undefined,
+    })
+    expect(second.get(key(2), 'bbbb')).toEqual({ code: 'b', map: { mappings: ';;' } })
+    expect(second.size.entries).toBe(2)
+  })
+
+  it('misses when the source changed and keeps the latest write', () => {
+    const cache = open()
+    cache.set(key(1), 'aaaa', { code: 'old' })
+    expect(cache.get(key(1), 'cccc')).toBeNull()
+
+    cache.set(key(1), 'cccc', { code: 'new' })
+    expect(cache.get(key(1), 'cccc')?.code).toBe('new')
+    expect(cache.size.deadBytes > 0).toBe(true)
+    cache.close()
+
+    expect(open().get(key(1), 'cccc')?.code).toBe('new')
+  })
+
+  it('drops a cut off write at the end of the pack', () => {
+    const first = open()
+    first.set(key(1), 'aaaa', { code: 'kept' })
+    first.close()
+    appendFileSync(join(dir, 'transforms.pack'), `${key(2)} bbbb 100 0\npartial`)
+
+    const second = open()
+    expect(second.get(key(1), 'aaaa')?.code).toBe('kept')
+    second.set(key(3), 'cccc', { code: 'after' })
+    second.close()
+
+    const third = open()
+    expect(third.get(key(2), 'bbbb')).toBeNull()
+    expect(third.get(key(3), 'cccc')?.code).toBe('after')
+  })
+
+  it('leaves a write another process is still making', () => {
+    const first = open()
+    first.set(key(1), 'aaaa', { code: 'kept' })
+    first.close()
+
+    // another process holds the lock halfway through an append
+    const packPath = join(dir, 'transforms.pack')
+    const lockPath = `${packPath}.lock`
+    writeFileSync(lockPath, '')
+    appendFileSync(packPath, `${key(2)} bbbb 8 0\npart`)
+    const size = statSync(packPath).size
+
+    const second = open()
+    expect(second.get(key(1), 'aaaa')?.code).toBe('kept')
+    // writes wait for the lock, they're skipped instead of blocking
+    second.set(key(3), 'cccc', { code: 'skipped' })
+    expect(statSync(packPath).size).toBe(size)
+
+    appendFileSync(packPath, 'ial!')
+    rmSync(lockPath)
+    second.set(key(4), 'dddd', { code: 'after' })
+    expect(second.get(key(2), 'bbbb')?.code).toBe('partial!')
+    expect(second.get(key(3), 'cccc')).toBeNull()
+
+    // a lock left behind by a process that exited is taken over
+    writeFileSync(lockPath, '')
+    utimesSync(lockPath, new Date(0), new Date(0))
+    second.set(key(5), 'eeee', { code: 'stale' })
+    second.close()
+
+    const third = open()
+    expect(third.get(key(4), 'dddd')?.code).toBe('after')
+    expect(third.get(key(5), 'eeee')?.code).toBe('stale')
+  })
+
+  it('follows a pack another process compacted', () => {
+    const a = open()
+    const b = open()
+    expect(b.size.entries).toBe(0)
+    a.set(key(1), 'aaaa', { code: 'one' })
+    // loaded before a wrote, its writes catch up with the pack
+    expect(b.get(key(1), 'aaaa')).toBeNull()
+    b.set(key(2), 'bbbb', { code: 'two' })
+
+    a.compact()
+    // still readable from the pack b opened
+    expect(b.get(key(2), 'bbbb')?.code).toBe('two')
+    b.set(key(3), 'cccc', { code: 'three' })
+    expect(b.get(key(1), 'aaaa')?.code).toBe('one')
+
+    const c = open()
+    expect(c.get(key(1), 'aaaa')?.code).toBe('one')
+    expect(c.get(key(2), 'bbbb')?.code).toBe('two')
+    expect(c.get(key(3), 'cccc')?.code).toBe('three')
+  })
+
+  it('evicts the least recently used entries past maxBytes', () => {
+    const code = 'x'.repeat(1000)
+    const cache = open(5000)
+    for (let i = 1; i <= 4; i++) {
+      cache.set(key(i), 'hash', { code })
+    }
+    // used last, so it survives
+    cache.get(key(1), 'hash')
+    cache.set(key(5), 'hash', { code })
+
+    expect(cache.get(key(1), 'hash')?.code).toBe(code)
+    expect(cache.get(key(5), 'hash')?.code).toBe(code)
+    expect(cache.get(key(2), 'hash')).toBeNull()
+    expect(statSync(join(dir, 'transforms.pack')).size <= 5000 * 0.75).toBe(true)
+    cache.close()
+
+    const reopened = open(5000)
+    expect(reopened.get(key(5), 'hash')?.code).toBe(code)
+    expect(reopened.get(key(2), 'hash')).toBeNull()
+  })
+})
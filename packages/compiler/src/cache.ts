@@ -1,44 +1,456 @@
 import { createHash } from 'node:crypto'
-import { existsSync, mkdirSync, readFileSync, statSync, writeFileSync } from 'node:fs'
+import {
+  closeSync,
+  existsSync,
+  fstatSync,
+  ftruncateSync,
+  mkdirSync,
+  openSync,
+  readdirSync,
+  readSync,
+  renameSync,
+  rmSync,
+  statSync,
+  writeSync,
+} from 'node:fs'
 import { join } from 'node:path'
 import { configuration } from './configure'
 
 /**
- * Fast file-based cache for babel transforms
- * Uses file mtime + content hash + config fingerprint for invalidation
+ * Transform cache for babel and react compiler output.
+ *
+ * Every entry lives in one append-only pack file. Its index (key → offset) is
+ * read once on first use, after that a hit is one positioned read and a write
+ * is one append under a lock file shared with other processes. Rewritten
+ * entries leave their old bytes behind, compaction drops those along with the
+ * least recently used entries once the pack grows past its size limit.
+ *
+ * Entries are validated by a hash of the source, so a hit needs no stat call.
  */
 
-interface CacheEntry {
-  /** File modification time when cached */
-  mtime: number
-  /** Hash of file content for additional validation */
+interface CacheStats {
+  hits: number
+  misses: number
+  writes: number
+  evictions: number
+}
+
+const stats: CacheStats = { hits: 0, misses: 0, writes: 0, evictions: 0 }
+
+// bump when the record layout changes, older packs are discarded
+const PACK_HEADER = Buffer.from('vxrn-compiler-pack 1\n')
+const PACK_FILE = 'transforms.pack'
+
+// a record is `<key> <hash> <codeBytes> <mapBytes>\n<code><map json>`
+const KEY_LENGTH = 40
+const RECORD_HEADER_MAX = 128
+// loading reads headers through a window, so small records cost no extra reads
+const SCAN_WINDOW = 64 * 1024
+
+const DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+// rewritten entries are only worth dropping once there's enough of them
+const MIN_DEAD_BYTES = 8 * 1024 * 1024
+// compacting a full pack takes a second or two, a lock older than this was
+// left behind by a process that exited
+const STALE_LOCK_MS = 30_000
+
+interface IndexEntry {
+  /** Hash of the source the output was made from */
   hash: string
-  /** Cached transform result */
-  code: string
-  /** Optional source map */
-  map?: any
+  /** Offset of the record in the pack */
+  offset: number
+  /** Record size, header included */
+  size: number
+  headerBytes: number
+  codeBytes: number
+  mapBytes: number
+  /** Recency for eviction, pack order on load then bumped on every use */
+  used: number
 }
 
-interface CacheStats {
-  hits: 0
-  misses: 0
-  writes: 0
+type ScanWindow = { buffer: Buffer; start: number; end: number }
+
+export type TransformCacheOptions = {
+  dir: string
+  /** Compacts down to 3/4 of this once the pack grows past it */
+  maxBytes?: number
+}
+
+export function createTransformCache({
+  dir,
+  maxBytes = DEFAULT_MAX_BYTES,
+}: TransformCacheOptions) {
+  const packPath = join(dir, PACK_FILE)
+  const lockPath = `${packPath}.lock`
+  const index = new Map<string, IndexEntry>()
+  let fd = -1
+  // end of the records read into the index, 0 until the pack has a header
+  let packBytes = 0
+  let deadBytes = 0
+  let clock = 0
+  let lockHeld = false
+  // a failed compaction (e.g. the pack is locked on windows) isn't retried
+  let compactable = true
+
+  function readRecordHeader(window: ScanWindow, offset: number) {
+    if (offset < window.start || offset + RECORD_HEADER_MAX > window.end) {
+      window.start = offset
+      window.end = offset + readSync(fd, window.buffer, 0, SCAN_WINDOW, offset)
+    }
+    const from = offset - window.start
+    const to = Math.min(from + RECORD_HEADER_MAX, window.end - window.start)
+    const lineEnd = window.buffer.subarray(from, to).indexOf(10)
+    if (lineEnd === -1) return null
+
+    const [key, hash, code, map] = window.buffer
+      .toString('latin1', from, from + lineEnd)
+      .split(' ')
+    const codeBytes = Number(code)
+    const mapBytes = Number(map)
+    if (key?.length !== KEY_LENGTH || !hash || !(codeBytes >= 0) || !(mapBytes >= 0)) {
+      return null
+    }
+
+    const headerBytes = lineEnd + 1
+    return {
+      key,
+      entry: {
+        hash,
+        offset,
+        size: headerBytes + codeBytes + mapBytes,
+        headerBytes,
+        codeBytes,
+        mapBytes,
+        used: clock++,
+      },
+    }
+  }
+
+  // Dev and build can share the cache, so everything that writes the pack
+  // (appends, truncating, compaction) holds an exclusive lock file. Without it
+  // a process could append to a pack another one is replacing. Returns false
+  // when another process holds the lock.
+  function withLock(fn: () => void): boolean {
+    if (lockHeld) {
+      fn()
+      return true
+    }
+    if (!acquireLock()) return false
+    lockHeld = true
+    try {
+      fn()
+    } finally {
+      lockHeld = false
+      rmSync(lockPath, { force: true })
+    }
+    return true
+  }
+
+  function acquireLock() {
+    try {
+      closeSync(openSync(lockPath, 'wx'))
+      return true
+    } catch (err) {
+      if ((err as NodeJS.ErrnoException).code !== 'EEXIST') throw err
+    }
+    // left behind by a process that exited while holding it
+    const lock = statSync(lockPath, { throwIfNoEntry: false })
+    if (lock && Date.now() - lock.mtimeMs > STALE_LOCK_MS) {
+      rmSync(lockPath, { force: true })
+      try {
+        closeSync(openSync(lockPath, 'wx'))
+        return true
+      } catch {}
+    }
+    return false
+  }
+
+  function hasHeader() {
+    const header = Buffer.alloc(PACK_HEADER.length)
+    const read = readSync(fd, header, 0, header.length, 0)
+    return read === header.length && header.equals(PACK_HEADER)
+  }
+
+  // reads the records from packBytes up to size into the index, returns
+  // where the readable records end
+  function scan(size: number) {
+    const window: ScanWindow = {
+      buffer: Buffer.allocUnsafe(SCAN_WINDOW),
+      start: 0,
+      end: 0,
+    }
+    let offset = packBytes
+    while (offset < size) {
+      const record = readRecordHeader(window, offset)
+      if (!record || offset + record.entry.size > size) break
+      const previous = index.get(record.key)
+      if (previous) deadBytes += previous.size
+      index.set(record.key, record.entry)
+      offset += record.entry.size
+    }
+    return offset
+  }
+
+  function load() {
+    if (fd !== -1) return
+    if (!existsSync(dir)) {
+      mkdirSync(dir, { recursive: true })
+    }
+
+    const isNew = !existsSync(packPath)
+    fd = openSync(packPath, 'a+')
+
+    if (!hasHeader()) {
+      // a new pack or one from an older layout, reset by whoever holds the lock
+      withLock(() => {
+        if (hasHeader()) return
+        ftruncateSync(fd, 0)
+        writeSync(fd, PACK_HEADER)
+        if (isNew) removeLegacyEntries(dir)
+      })
+      // another process is writing the header, sync() picks the pack up later
+      if (!hasHeader()) return
+    }
+
+    packBytes = PACK_HEADER.length
+    const size = fstatSync(fd).size
+    packBytes = scan(size)
+    // an unreadable tail is either a write still going on in another process
+    // or one that was cut off, sync() tells them apart under the lock
+    if (packBytes < size) {
+      withLock(sync)
+    }
+
+    compactIfNeeded()
+  }
+
+  function reload() {
+    closeSync(fd)
+    fd = -1
+    index.clear()
+    packBytes = 0
+    deadBytes = 0
+    load()
+  }
+
+  // catches the index up with what other processes appended, only called with
+  // the lock held. appends hold it too, so a tail that still can't be read was
+  // cut off and is truncated.
+  function sync() {
+    const current = statSync(packPath, { throwIfNoEntry: false })
+    if (!packBytes || !current || current.ino !== fstatSync(fd).ino) {
+      // another process replaced the pack, the offsets in the index are stale
+      reload()
+      return
+    }
+    const size = fstatSync(fd).size
+    packBytes = scan(size)
+    if (packBytes < size) {
+      ftruncateSync(fd, packBytes)
+    }
+  }
+
+  function get(key: string, hash: string): { code: string; map?: any } | null {
+    load()
+    const entry = index.get(key)
+    if (!entry || entry.hash !== hash) return null
+
+    const record = Buffer.allocUnsafe(entry.size)
+    const read = readSync(fd, record, 0, entry.size, entry.offset)
+    // another process may have compacted the pack under us
+    if (read !== entry.size || record.toString('latin1', 0, KEY_LENGTH) !== key) {
+      index.delete(key)
+      return null
+    }
+
+    entry.used = clock++
+    const codeEnd = entry.headerBytes + entry.codeBytes
+    return {
+      code: record.toString('utf-8', entry.headerBytes, codeEnd),
+      map: entry.mapBytes
+        ? JSON.parse(record.toString('utf-8', codeEnd, codeEnd + entry.mapBytes))
+        : undefined,
+    }
+  }
+
+  function set(key: string, hash: string, result: { code: string; map?: any }) {
+    load()
+    const code = Buffer.from(result.code)
+    const map = result.map ? Buffer.from(JSON.stringify(result.map)) : null
+    const header = Buffer.from(
+      `${key} ${hash} ${code.length} ${map ? map.length : 0}\n`,
+      'latin1'
+    )
+    const record = Buffer.concat(map ? [header, code, map] : [header, code])
+
+    // skipped while another process writes or compacts, it's only a cache
+    withLock(() => {
+      sync()
+      const offset = packBytes
+      writeSync(fd, record)
+      packBytes = offset + record.length
+
+      const previous = index.get(key)
+      if (previous) deadBytes += previous.size
+      index.set(key, {
+        hash,
+        offset,
+        size: record.length,
+        headerBytes: header.length,
+        codeBytes: code.length,
+        mapBytes: map ? map.length : 0,
+        used: clock++,
+      })
+    })
+
+    compactIfNeeded()
+  }
+
+  function needsCompaction() {
+    return (
+      packBytes > maxBytes || (deadBytes > MIN_DEAD_BYTES && deadBytes > packBytes / 2)
+    )
+  }
+
+  function compactIfNeeded() {
+    if (!compactable || !needsCompaction()) return
+    withLock(() => {
+      // records other processes appended are compacted along with ours
+      sync()
+      if (!compactable || !needsCompaction()) return
+      try {
+        compact()
+      } catch (err) {
+        compactable = false
+        rmSync(`${packPath}.${process.pid}.tmp`, { force: true })
+        console.warn(`[cache] Failed to compact ${packPath}:`, err)
+      }
+    })
+  }
+
+  // rewrites the pack with the most recently used entries that fit, only
+  // called with the lock held. other processes see the new pack on their next
+  // write, until then their reads go to the old one, which stays intact.
+  function compact() {
+    const target = maxBytes * 0.75
+    const entries = [...index].sort((a, b) => b[1].used - a[1].used)
+
+    let keptBytes = PACK_HEADER.length
+    let keepCount = 0
+    while (
+      keepCount < entries.length &&
+      keptBytes + entries[keepCount][1].size <= target
+    ) {
+      keptBytes += entries[keepCount][1].size
+      keepCount++
+    }
+
+    const tmpPath = `${packPath}.${process.pid}.tmp`
+    const out = openSync(tmpPath, 'w')
+    const offsets = new Array<number>(keepCount)
+    let offset = PACK_HEADER.length
+    try {
+      writeSync(out, PACK_HEADER)
+      // oldest first, so pack order stays the recency order on the next load
+      for (let i = keepCount - 1; i >= 0; i--) {
+        const entry = entries[i][1]
+        const record = Buffer.allocUnsafe(entry.size)
+        readSync(fd, record, 0, entry.size, entry.offset)
+        writeSync(out, record)
+        offsets[i] = offset
+        offset += entry.size
+      }
+    } finally {
+      closeSync(out)
+    }
+
+    renameSync(tmpPath, packPath)
+    closeSync(fd)
+    fd = openSync(packPath, 'a+')
+
+    for (let i = 0; i < keepCount; i++) {
+      entries[i][1].offset = offsets[i]
+    }
+    for (let i = keepCount; i < entries.length; i++) {
+      index.delete(entries[i][0])
+    }
+    stats.evictions += entries.length - keepCount
+    packBytes = offset
+    deadBytes = 0
+  }
+
+  function close() {
+    if (fd !== -1) {
+      closeSync(fd)
+      fd = -1
+    }
+    index.clear()
+    packBytes = 0
+    deadBytes = 0
+  }
+
+  return {
+    get,
+    set,
+    compact() {
+      load()
+      withLock(() => {
+        sync()
+        compact()
+      })
+    },
+    close,
+    get size() {
+      load()
+      return { entries: index.size, bytes: packBytes, deadBytes }
+    },
+  }
+}
+
+export type TransformCache = ReturnType<typeof createTransformCache>
+
+// entries of the previous cache, one json file per module
+function removeLegacyEntries(dir: string) {
+  try {
+    for (const file of readdirSync(dir)) {
+      if (file.endsWith('.json')) {
+        rmSync(join(dir, file), { force: true })
+      }
+    }
+  } catch {
+    // only a cleanup
+  }
 }
 
-const stats: CacheStats = { hits: 0, misses: 0, writes: 0 }
+let cache: TransformCache | null = null
 
-function getCacheDir(): string {
-  // Use .vxrn cache directory
-  const cacheDir = join(process.cwd(), 'node_modules', '.vxrn', 'compiler-cache')
-  if (!existsSync(cacheDir)) {
-    mkdirSync(cacheDir, { recursive: true })
+function getCache(): TransformCache {
+  if (!cache) {
+    const maxMb = Number(process.env.VXRN_COMPILER_CACHE_MAX_MB)
+    cache = createTransformCache({
+      dir: join(process.cwd(), 'node_modules', '.vxrn', 'compiler-cache'),
+      maxBytes: maxMb > 0 ? maxMb * 1024 * 1024 : undefined,
+    })
   }
-  return cacheDir
+  return cache
 }
 
+let fingerprint: { inputs: unknown[]; value: string } | null = null
+
 // hash config state so cache invalidates when compiler/reanimated/nativewind toggles change
 function getConfigFingerprint(): string {
-  return createHash('sha1')
+  const inputs = [
+    configuration.enableCompiler,
+    configuration.enableReanimated,
+    configuration.enableNativewind,
+    configuration.enableNativeCSS,
+  ]
+  // configuration only changes through configureVXRNCompilerPlugin, rarely
+  if (fingerprint && inputs.every((input, i) => input === fingerprint!.inputs[i])) {
+    return fingerprint.value
+  }
+
+  const value = createHash('sha1')
     .update(
       JSON.stringify({
         compiler: configuration.enableCompiler,
@@ -52,6 +464,9 @@ function getConfigFingerprint(): string {
     )
     .digest('hex')
     .slice(0, 8)
+
+  fingerprint = { inputs, value }
+  return value
 }
 
 function getCacheKey(filePath: string, environment: string): string {
@@ -74,33 +489,18 @@ export function getCachedTransform(
   try {
     // Strip leading null byte (Vite virtual module prefix) if present
     const cleanPath = filePath.startsWith('\0') ? filePath.slice(1) : filePath
-    const cacheDir = getCacheDir()
-    const cacheKey = getCacheKey(cleanPath, environment)
-    const cachePath = join(cacheDir, `${cacheKey}.json`)
-
-    if (!existsSync(cachePath)) {
-      stats.misses++
-      return null
-    }
-
-    const cached: CacheEntry = JSON.parse(readFileSync(cachePath, 'utf-8'))
-
-    // Check file mtime
-    const currentMtime = statSync(cleanPath).mtimeMs
-    if (cached.mtime !== currentMtime) {
-      stats.misses++
-      return null
-    }
+    const cached = getCache().get(
+      getCacheKey(cleanPath, environment),
+      getContentHash(code)
+    )
 
-    // Double-check with content hash for safety
-    const currentHash = getContentHash(code)
-    if (cached.hash !== currentHash) {
+    if (!cached) {
       stats.misses++
       return null
     }
 
     stats.hits++
-    return { code: cached.code, map: cached.map }
+    return cached
   } catch (err) {
     // If cache read fails, just treat as miss
     stats.misses++
@@ -117,21 +517,7 @@ export function setCachedTransform(
   try {
     // Strip leading null byte (Vite virtual module prefix) if present
     const cleanPath = filePath.startsWith('\0') ? filePath.slice(1) : filePath
-    const cacheDir = getCacheDir()
-    const cacheKey = getCacheKey(cleanPath, environment)
-    const cachePath = join(cacheDir, `${cacheKey}.json`)
-
-    const mtime = statSync(cleanPath).mtimeMs
-    const hash = getContentHash(code)
-
-    const entry: CacheEntry = {
-      mtime,
-      hash,
-      code: result.code,
-      map: result.map,
-    }
-
-    writeFileSync(cachePath, JSON.stringify(entry), 'utf-8')
+    getCache().set(getCacheKey(cleanPath, environment), getContentHash(code), result)
     stats.writes++
   } catch (err) {
     // Silently fail cache writes
@@ -154,6 +540,6 @@ export function logCacheStats(): void {
 
   const hitRate = ((stats.hits / total) * 100).toFixed(1)
   console.info(
-    `\n💾 [Cache Stats] ${stats.hits} hits / ${stats.misses} misses (${hitRate}% hit rate), ${stats.writes} writes`
+    `\n💾 [Cache Stats] ${stats.hits} hits / ${stats.misses} misses (${hitRate}% hit rate), ${stats.writes} writes, ${stats.evictions} evicted`
   )
 }
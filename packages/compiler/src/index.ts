@@ -21,6 +21,7 @@ import {
 } from './transformBabel'
 import type { Environment, GetTransformProps, Options } from './types'
 import { getCachedTransform, logCacheStats, setCachedTransform } from './cache'
+import { getTransformWorkerPool } from './transformWorkerPool'
 
 export * from './configure'
 export * from './transformBabel'
@@ -185,7 +186,8 @@ async function performBabelTransform({
       const startTime = Date.now()
       const babelOut = compilerOnly
         ? await transformOxcReactCompiler(id, code, compilerTarget)
-        : await transformBabel(id, code, babelOptions)
+        : await (getTransformWorkerPool()?.transform(id, code, babelOptions) ??
+            transformBabel(id, code, babelOptions))
       const babelTime = Date.now() - startTime
 
       if (babelOut?.code) {
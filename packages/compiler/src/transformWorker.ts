@@ -0,0 +1,35 @@
+/**
+ * Worker thread for babel transforms, see transformWorkerPool.ts.
+ */
+import { parentPort } from 'node:worker_threads'
+import { transformBabel } from './transformBabel'
+
+if (!parentPort) {
+  console.error('Must be run as a worker thread')
+  process.exit(1)
+}
+
+type TransformMessage = {
+  id: number
+  filePath: string
+  code: string
+  options: any
+}
+
+parentPort.on('message', async (msg: TransformMessage) => {
+  try {
+    const out = await transformBabel(msg.filePath, msg.code, msg.options)
+    parentPort!.postMessage({
+      type: 'done',
+      id: msg.id,
+      // the full babel result holds plugin instances, only send what's used
+      result: out ? { code: out.code, map: out.map } : undefined,
+    })
+  } catch (err: any) {
+    parentPort!.postMessage({
+      type: 'error',
+      id: msg.id,
+      error: err?.stack ?? String(err),
+    })
+  }
+})
@@ -0,0 +1,143 @@
+/**
+ * Worker pool for babel transforms that missed the cache.
+ *
+ * Off by default: each worker loads its own copy of babel, which only pays
+ * off when a cold start has many files to transform. Enable it with
+ * `VXRN_COMPILER_WORKERS=<count>`, or `=true` for one less than the cpu count.
+ */
+import { availableParallelism } from 'node:os'
+import { dirname, join } from 'node:path'
+import { fileURLToPath } from 'node:url'
+import { Worker } from 'node:worker_threads'
+import type babel from '@babel/core'
+import { transformBabel } from './transformBabel'
+
+type TransformResult = { code?: string | null; map?: any } | undefined
+
+interface Task {
+  msg: { id: number; filePath: string; code: string; options: babel.TransformOptions }
+  resolve: (result: TransformResult) => void
+  reject: (error: Error) => void
+}
+
+export class TransformWorkerPool {
+  private workers: Worker[] = []
+  private available: Worker[] = []
+  private queue: Task[] = []
+  private running = new Map<Worker, Task>()
+  private nextId = 0
+  private size: number
+
+  constructor(size: number) {
+    this.size = size
+  }
+
+  private spawn() {
+    // use .mjs for proper ESM module resolution in worker threads
+    const worker = new Worker(
+      join(dirname(fileURLToPath(import.meta.url)), 'transformWorker.mjs')
+    )
+    // idle workers shouldn't keep the process alive, see dispatch
+    worker.unref()
+
+    worker.on('message', (msg: any) => {
+      const task = this.running.get(worker)
+      if (!task) return
+      this.running.delete(worker)
+      if (msg.type === 'done') {
+        task.resolve(msg.result)
+      } else {
+        task.reject(new Error(msg.error))
+      }
+      worker.unref()
+      this.available.push(worker)
+      this.dispatch()
+    })
+
+    worker.on('error', (err) => {
+      console.error('[TransformWorkerPool] Worker error:', err)
+    })
+
+    // a crashed worker fails its task and is replaced on the next dispatch
+    worker.on('exit', () => {
+      this.workers = this.workers.filter((w) => w !== worker)
+      this.available = this.available.filter((w) => w !== worker)
+      const task = this.running.get(worker)
+      if (task) {
+        this.running.delete(worker)
+        task.reject(new Error(`[TransformWorkerPool] Worker exited`))
+      }
+      this.dispatch()
+    })
+
+    this.workers.push(worker)
+    this.available.push(worker)
+  }
+
+  private dispatch() {
+    while (this.queue.length) {
+      if (!this.available.length && this.workers.length < this.size) {
+        this.spawn()
+      }
+      const worker = this.available.shift()
+      if (!worker) return
+
+      const task = this.queue.shift()!
+      try {
+        worker.postMessage(task.msg)
+      } catch (err) {
+        // options with functions (from a user transform) can't be cloned
+        this.available.push(worker)
+        transformBabel(task.msg.filePath, task.msg.code, task.msg.options).then(
+          task.resolve,
+          task.reject
+        )
+        continue
+      }
+      this.running.set(worker, task)
+      // a transform in flight keeps the process alive
+      worker.ref()
+    }
+  }
+
+  transform(
+    filePath: string,
+    code: string,
+    options: babel.TransformOptions
+  ): Promise<TransformResult> {
+    return new Promise((resolve, reject) => {
+      this.queue.push({
+        msg: { id: this.nextId++, filePath, code, options },
+        resolve,
+        reject,
+      })
+      this.dispatch()
+    })
+  }
+
+  async terminate() {
+    const workers = this.workers
+    this.workers = []
+    this.available = []
+    await Promise.all(workers.map((w) => w.terminate()))
+  }
+}
+
+let pool: TransformWorkerPool | null | undefined
+
+export function getTransformWorkerPool(): TransformWorkerPool | null {
+  if (pool === undefined) {
+    const setting = process.env.VXRN_COMPILER_WORKERS
+    const count =
+      setting === 'true' ? Math.max(1, availableParallelism() - 1) : Number(setting)
+    pool = count > 0 ? new TransformWorkerPool(count) : null
+  }
+  return pool
+}
+
+export async function terminateTransformWorkerPool() {
+  if (pool) {
+    await pool.terminate()
+    pool = undefined
+  }
+}
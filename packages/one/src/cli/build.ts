@@ -37,6 +37,17 @@ import { buildPage, printBuildTimings } from './buildPage'
 import { checkNodeVersion } from './checkNodeVersion'
 import { getWorkerPool, terminateWorkerPool } from './workerPool'
 import { generateSitemap, type RouteSitemapData } from './generateSitemap'
+import {
+  createChunkGraphHasher,
+  getDependencyFingerprint,
+  hashValues,
+  incrementalCacheDir,
+  type IncrementalPageEntry,
+  loadIncrementalManifest,
+  shouldBuildIncrementally,
+  writeIncrementalManifest,
+} from './incrementalBuild'
+import { precompressHtml } from './precompressHtml'
 import { labelProcess } from './label-process'
 import { pLimit } from '../utils/pLimit'
 import { getCriticalCSSOutputPaths } from '../vite/plugins/criticalCSSPlugin'
@@ -676,6 +687,11 @@ export async function build(args: {
   const assets: OutputAsset[] = []
 
   const builtRoutes: One.RouteBuildInfo[] = []
+  // ssg routes with revalidate whose pages are all rendered by the server
+  const onDemandRoutes: One.RouteBuildInfo[] = []
+  // vercel output only ships prebuilt html for ssg routes, so nothing would
+  // render the pages left to the server
+  const canRenderOnDemand = deployConfig?.target !== 'vercel'
   const sitemapData: RouteSitemapData[] = []
 
   // caches for expensive operations
@@ -721,6 +737,42 @@ export async function build(args: {
     throw new Error(`No server output`)
   }
 
+  // incremental builds: pages whose inputs and loader data match the previous
+  // build reuse its html and loader files instead of rendering again
+  const incremental = shouldBuildIncrementally(oneOptions)
+  const incrementalDir = toAbsolute(incrementalCacheDir)
+  const previousIncremental = incremental
+    ? await loadIncrementalManifest(incrementalDir)
+    : null
+  const incrementalPages: Record<string, IncrementalPageEntry> = {}
+  let skippedPages = 0
+  let getServerGraphHash: ReturnType<typeof createChunkGraphHasher> | undefined
+  let buildInputsHash = ''
+
+  if (incremental) {
+    const serverChunks = vxrnOutput.serverOutput.filter((x) => x.type === 'chunk')
+    getServerGraphHash = createChunkGraphHasher(serverChunks)
+    // the render entry lazily imports every route, only follow its static
+    // imports here, each route adds its own module graph below
+    const serverEntryFileName = normalizePath(
+      relative(join(outDir, 'server'), vxrnOutput.serverEntry)
+    )
+    buildInputsHash = hashValues(
+      constants.CACHE_KEY,
+      await getDependencyFingerprint(),
+      JSON.stringify(oneOptions, (_key, value) =>
+        typeof value === 'function' ? undefined : value
+      ),
+      getServerGraphHash(serverEntryFileName, { dynamic: false })
+    )
+
+    if (previousIncremental && previousIncremental.cacheKey !== constants.CACHE_KEY) {
+      console.info(
+        `\n ♻️ incremental: CACHE_KEY changed since the last build, rebuilding every page (pin ONE_CACHE_KEY to reuse pages)\n`
+      )
+    }
+  }
+
   // build a direct mapping from source file path to client chunk info
   // this is more reliable than manifest.json which can have ambiguous keys
   const clientChunksBySource = new Map<string, { fileName: string; imports: string[] }>()
@@ -1120,6 +1172,19 @@ export async function build(args: {
     // loader — otherwise workerd may crash evaluating RN/Tamagui deps.
     foundRoute.hasLoader = typeof exported.loader === 'function'
 
+    // incremental static regeneration: `one serve` renders params outside
+    // generateStaticParams on demand and regenerates pages older than
+    // `revalidate` seconds (false only regenerates through revalidatePath)
+    if (foundRoute.type === 'ssg' && exported.revalidate !== undefined) {
+      const { revalidate } = exported
+      if (revalidate !== false && !(typeof revalidate === 'number' && revalidate >= 0)) {
+        throw new Error(
+          `[one] Error: revalidate in ${foundRoute.page} must be a number of seconds or false, got ${revalidate}`
+        )
+      }
+      foundRoute.revalidate = revalidate
+    }
+
     const isDynamic = !!Object.keys(foundRoute.routeKeys).length
 
     if (
@@ -1127,7 +1192,8 @@ export async function build(args: {
       isDynamic &&
       !foundRoute.page.includes('+not-found') &&
       !foundRoute.page.includes('_sitemap') &&
-      !exported.generateStaticParams
+      !exported.generateStaticParams &&
+      (foundRoute.revalidate === undefined || !canRenderOnDemand)
     ) {
       throw new Error(`[one] Error: Missing generateStaticParams
 
@@ -1139,10 +1205,48 @@ export async function build(args: {
 `)
     }
 
-    const paramsList = ((await exported.generateStaticParams?.()) ?? [{}]) as Record<
-      string,
-      string
-    >[]
+    // a dynamic route with revalidate can leave every page to the server
+    const rendersOnDemand = isDynamic && foundRoute.revalidate !== undefined
+    const paramsList = ((await exported.generateStaticParams?.()) ??
+      (rendersOnDemand ? [] : [{}])) as Record<string, string>[]
+
+    if (!paramsList.length && foundRoute.revalidate !== undefined && !canRenderOnDemand) {
+      throw new Error(`[one] Error: No pages for ${foundRoute.page}
+
+  Route ${foundRoute.page} exports revalidate but generateStaticParams returned no params.
+  Deploying to ${deployConfig!.target} only serves prebuilt ssg pages, so it needs at least one.
+
+`)
+    }
+
+    // no page was prebuilt, keep what the server needs to render them
+    if (!paramsList.length && foundRoute.revalidate !== undefined) {
+      const path = getPathnameFromFilePath(relativeId, {}, true)
+      onDemandRoutes.push({
+        type: foundRoute.type,
+        css: allCSS,
+        layoutCSS,
+        cssContents: allCSSContents,
+        routeFile: foundRoute.file,
+        middlewares: (foundRoute.middlewares || []).map(
+          (mw) => builtMiddlewares[mw.contextKey]
+        ),
+        cleanPath: path,
+        // nothing is written for these pages at build time
+        preloadPath: '',
+        cssPreloadPath: '',
+        loaderPath: '',
+        htmlPath: '',
+        clientJsPath: '',
+        serverJsPath,
+        loaderData: undefined,
+        params: {},
+        path,
+        preloads,
+        criticalPreloads,
+        deferredPreloads,
+      })
+    }
 
     console.info(`\n [build] page ${relativeId} (with ${paramsList.length} routes)\n`)
 
@@ -1153,6 +1257,36 @@ export async function build(args: {
     // Get route-level sitemap export if present
     const routeSitemapExport = exported.sitemap as One.RouteSitemap | undefined
 
+    // everything the rendered output depends on besides path, params and
+    // loader data. ssr pages aren't rendered at build time so never reused.
+    const routeInputsHash =
+      getServerGraphHash && foundRoute.type !== 'ssr'
+        ? hashValues(
+            buildInputsHash,
+            foundRoute.type,
+            getServerGraphHash(serverFileName),
+            foundRoute.layouts?.map((layout) => [
+              layout.layoutRenderMode,
+              layout.loaderServerPath && getServerGraphHash!(layout.loaderServerPath),
+            ]),
+            await Promise.all(
+              (foundRoute.middlewares || []).map((mw) => {
+                const builtPath = builtMiddlewares[mw.contextKey]
+                return builtPath ? FSExtra.readFile(builtPath, 'utf-8') : ''
+              })
+            ),
+            clientManifestEntry?.file,
+            preloads,
+            criticalPreloads,
+            deferredPreloads,
+            routePreloads,
+            allCSS,
+            layoutCSS,
+            allCSSContents,
+            scriptLoadingMode
+          )
+        : undefined
+
     // Determine if after-lcp script loading should be used for this route
     // Only applies to SSG pages (SPA pages need JS to render anything)
     const isAfterLCPMode =
@@ -1174,6 +1308,14 @@ export async function build(args: {
     const pageBuilds = paramsList.map((params) => {
       const path = getPathnameFromFilePath(relativeId, params, foundRoute.type === 'ssg')
 
+      const incrementalPage = routeInputsHash
+        ? {
+            cacheDir: incrementalDir,
+            inputsHash: hashValues(routeInputsHash, path, params),
+            previous: previousIncremental?.pages[path],
+          }
+        : undefined
+
       // use worker pool for true multicore parallelism if enabled
       if (workerPool) {
         console.info(`  ↦ route ${path}`)
@@ -1198,6 +1340,7 @@ export async function build(args: {
             deferredPreloads,
             useAfterLCP,
             useAfterLCPAggressive,
+            incremental: incrementalPage,
           })
           .then((built) => ({ built, path }))
       }
@@ -1226,7 +1369,8 @@ export async function build(args: {
             criticalPreloads,
             deferredPreloads,
             useAfterLCP,
-            useAfterLCPAggressive
+            useAfterLCPAggressive,
+            incrementalPage
           )
         })
 
@@ -1236,9 +1380,17 @@ export async function build(args: {
 
     const results = await Promise.all(pageBuilds)
 
-    for (const { built, path } of results) {
+    for (const {
+      built: { incremental: incrementalResult, ...built },
+      path,
+    } of results) {
       builtRoutes.push(built)
 
+      if (incrementalResult?.skipped) skippedPages++
+      if (incrementalResult?.entry) {
+        incrementalPages[path] = incrementalResult.entry
+      }
+
       // Collect sitemap data for page routes (exclude API, not-found, layouts)
       if (shouldCollectSitemap) {
         sitemapData.push({
@@ -1260,6 +1412,23 @@ export async function build(args: {
   )
   printBuildTimings()
 
+  if (incremental) {
+    // `--only` builds a subset, keep what the rest of the site last built
+    const pages =
+      vxrnOutput.buildArgs?.only &&
+      previousIncremental?.cacheKey === constants.CACHE_KEY
+        ? { ...previousIncremental.pages, ...incrementalPages }
+        : incrementalPages
+    await writeIncrementalManifest(incrementalDir, {
+      cacheKey: constants.CACHE_KEY,
+      pages,
+    })
+    const rendered = builtRoutes.filter((route) => route.type !== 'ssr').length
+    console.info(
+      `\n ♻️ incremental: ${skippedPages} pages skipped, ${rendered - skippedPages} rebuilt\n`
+    )
+  }
+
   // once done building static we can move it to client dir:
   await moveAllFiles(staticDir, clientDir)
   await FSExtra.remove(staticDir)
@@ -1281,10 +1450,7 @@ export async function build(args: {
   // the manifest.
   let cssContentsByPath: Record<string, string> | undefined
 
-  for (const route of builtRoutes) {
-    if (!route.cleanPath.includes('*')) {
-      routeMap[route.cleanPath] = route.htmlPath
-    }
+  function toRouteBuildInfo(route: One.RouteBuildInfo) {
     const {
       // dont include loaderData it can be huge
       loaderData: _loaderData,
@@ -1300,7 +1466,15 @@ export async function build(args: {
       })
     }
 
-    routeToBuildInfo[route.routeFile] = rest
+    return rest
+  }
+
+  for (const route of builtRoutes) {
+    if (!route.cleanPath.includes('*')) {
+      routeMap[route.cleanPath] = route.htmlPath
+    }
+
+    routeToBuildInfo[route.routeFile] = toRouteBuildInfo(route)
     for (const p of getCleanPaths([route.path, route.cleanPath])) {
       pathToRoute[p] = route.routeFile
     }
@@ -1309,6 +1483,22 @@ export async function build(args: {
     loaders[route.loaderPath] = true
   }
 
+  for (const route of onDemandRoutes) {
+    routeToBuildInfo[route.routeFile] = toRouteBuildInfo(route)
+  }
+
+  let htmlEtags: Record<string, string> | undefined
+  if (oneOptions.server?.htmlCache) {
+    htmlEtags = await precompressHtml({
+      clientDir,
+      htmlPaths: builtRoutes.map((route) => route.htmlPath),
+      concurrency: buildConcurrency,
+    })
+    console.info(
+      `\n 🗜 precompressed ${Object.keys(htmlEtags).length} html files for htmlCache\n`
+    )
+  }
+
   function createBuildManifestRoute(route: RouteInfo) {
     // remove the full layouts (they're huge with all children), but keep minimal info
     // needed for running layout loaders in production
@@ -1353,6 +1543,7 @@ export async function build(args: {
     oneOptions,
     routeToBuildInfo,
     cssContentsByPath,
+    htmlEtags,
     pathToRoute,
     manifest: {
       pageRoutes: manifest.pageRoutes.map(createBuildManifestRoute),
@@ -14,6 +14,13 @@ import { isResponse } from '../utils/isResponse'
 import { toAbsolute, toAbsoluteUrl } from '../utils/toAbsolute'
 import { replaceLoader } from '../vite/replaceLoader'
 import type { One, RouteInfo } from '../vite/types'
+import {
+  getLoaderDataHash,
+  type IncrementalPageOptions,
+  type IncrementalPageResult,
+  restorePageOutputs,
+  savePageOutputs,
+} from './incrementalBuild'
 
 const { readFile, outputFile } = FSExtra
 
@@ -62,8 +69,9 @@ export async function buildPage(
   criticalPreloads?: string[],
   deferredPreloads?: string[],
   useAfterLCP?: boolean,
-  useAfterLCPAggressive?: boolean
-): Promise<One.RouteBuildInfo> {
+  useAfterLCPAggressive?: boolean,
+  incremental?: IncrementalPageOptions
+): Promise<One.RouteBuildInfo & { incremental?: IncrementalPageResult }> {
   let t0 = performance.now()
 
   const render = await getRender(serverEntry)
@@ -87,6 +95,16 @@ export async function buildPage(
 
   let loaderData = {}
 
+  // html and loader files, kept so an incremental build can reuse them
+  const outDir = toAbsolute(join(clientDir, '..'))
+  const outputs: Array<[filePath: string, content: string]> = []
+  async function writeOutput(filePath: string, content: string) {
+    await outputFile(filePath, content)
+    if (incremental) outputs.push([filePath, content])
+  }
+  let loaderDataHash: string | undefined
+  let skipped = false
+
   try {
     // generate preload file with route module registration
     const routeImports: string[] = []
@@ -265,56 +283,85 @@ prefetchCSS()
         loaderRedirectInfo = extractRedirectInfo(loaderData as Response)
         loaderData = {}
       }
+    }
 
-      if (clientJsPath) {
-        const loaderPartialPath = join(clientDir, urlPathToFilePath(getLoaderPath(path)))
+    // the loaders are the last input, if they returned the same data as the
+    // previous build the html and loader files from that build are still valid
+    if (incremental) {
+      const { previous } = incremental
+      loaderDataHash = getLoaderDataHash(
+        matches.map((match) => match.loaderData),
+        loaderData,
+        loaderRedirectInfo
+      )
+      skipped =
+        !!previous &&
+        !!loaderDataHash &&
+        previous.inputsHash === incremental.inputsHash &&
+        previous.loaderDataHash === loaderDataHash &&
+        (await restorePageOutputs(incremental.cacheDir, path, previous, outDir))
+      if (skipped) {
+        loaderPath = previous!.loaderPath
+        if (loaderRedirectInfo && clientJsPath) loaderData = {}
+      }
+    }
 
-        // uncached native loader path for native prod (metro can't inline cache keys)
-        const uncachedNativePath = loaderPartialPath
-          .replace(constants.LOADER_JS_POSTFIX, LOADER_JS_POSTFIX_UNCACHED)
-          .replace(/\.js$/, '.native.js')
+    // ssg routes with revalidate get their loader data from the server, which
+    // keeps client navigations in sync with the regenerated html
+    const writesLoader =
+      exported.loader && foundRoute.type !== 'ssr' && foundRoute.revalidate === undefined
 
-        if (loaderRedirectInfo) {
-          // generate a static redirect loader — the client detects __oneRedirect
-          // and navigates before the protected page ever renders
-          const redirectData = JSON.stringify({
-            __oneRedirect: loaderRedirectInfo.path,
-            __oneRedirectStatus: loaderRedirectInfo.status,
-          })
-          await outputFile(
-            loaderPartialPath,
-            `export function loader(){return ${redirectData}}`
-          )
-          // native-friendly CJS version
-          const nativeCjs = `exports.loader = function(){return ${redirectData}}`
-          await outputFile(loaderPartialPath.replace(/\.js$/, '.native.js'), nativeCjs)
-          await outputFile(uncachedNativePath, nativeCjs)
-          loaderPath = getLoaderPath(path)
-          loaderData = {}
-        } else {
-          const code = await readFile(clientJsPath, 'utf-8')
-          const withLoader =
-            // super dirty to quickly make ssr loaders work until we have better
-            `
+    if (!skipped && writesLoader && clientJsPath) {
+      const loaderPartialPath = join(clientDir, urlPathToFilePath(getLoaderPath(path)))
+
+      // uncached native loader path for native prod (metro can't inline cache keys)
+      const uncachedNativePath = loaderPartialPath
+        .replace(constants.LOADER_JS_POSTFIX, LOADER_JS_POSTFIX_UNCACHED)
+        .replace(/\.js$/, '.native.js')
+
+      if (loaderRedirectInfo) {
+        // generate a static redirect loader — the client detects __oneRedirect
+        // and navigates before the protected page ever renders
+        const redirectData = JSON.stringify({
+          __oneRedirect: loaderRedirectInfo.path,
+          __oneRedirectStatus: loaderRedirectInfo.status,
+        })
+        await writeOutput(
+          loaderPartialPath,
+          `export function loader(){return ${redirectData}}`
+        )
+        // native-friendly CJS version
+        const nativeCjs = `exports.loader = function(){return ${redirectData}}`
+        await writeOutput(loaderPartialPath.replace(/\.js$/, '.native.js'), nativeCjs)
+        await writeOutput(uncachedNativePath, nativeCjs)
+        loaderPath = getLoaderPath(path)
+        loaderData = {}
+      } else {
+        const code = await readFile(clientJsPath, 'utf-8')
+        const withLoader =
+          // super dirty to quickly make ssr loaders work until we have better
+          `
 if (typeof document === 'undefined') globalThis.document = {}
 ` +
-            replaceLoader({
-              code,
-              loaderData,
-            })
-          await outputFile(loaderPartialPath, withLoader)
-          // native-friendly CJS version with just the data (no ESM imports)
-          const nativeCjs = `exports.loader = function(){return ${JSON.stringify(loaderData)}}`
-          await outputFile(loaderPartialPath.replace(/\.js$/, '.native.js'), nativeCjs)
-          await outputFile(uncachedNativePath, nativeCjs)
-          loaderPath = getLoaderPath(path)
-        }
+          replaceLoader({
+            code,
+            loaderData,
+          })
+        await writeOutput(loaderPartialPath, withLoader)
+        // native-friendly CJS version with just the data (no ESM imports)
+        const nativeCjs = `exports.loader = function(){return ${JSON.stringify(loaderData)}}`
+        await writeOutput(loaderPartialPath.replace(/\.js$/, '.native.js'), nativeCjs)
+        await writeOutput(uncachedNativePath, nativeCjs)
+        loaderPath = getLoaderPath(path)
       }
     }
 
-    if (!exported.loader && foundRoute.type === 'spa') {
+    if (!skipped && !exported.loader && foundRoute.type === 'spa') {
       const loaderPartialPath = join(clientDir, urlPathToFilePath(getLoaderPath(path)))
-      await outputFile(loaderPartialPath, 'export function loader() { return undefined }')
+      await writeOutput(
+        loaderPartialPath,
+        'export function loader() { return undefined }'
+      )
       loaderPath = getLoaderPath(path)
     }
     recordTiming('pageLoader', performance.now() - t0)
@@ -328,7 +375,7 @@ if (typeof document === 'undefined') globalThis.document = {}
     })
 
     // ssr, we basically skip at build-time and just compile it the js we need
-    if (foundRoute.type !== 'ssr') {
+    if (foundRoute.type !== 'ssr' && !skipped) {
       // importing resetState causes issues :/
       globalThis['__vxrnresetState']?.()
 
@@ -361,7 +408,7 @@ if (typeof document === 'undefined') globalThis.document = {}
         }
 
         t0 = performance.now()
-        await outputFile(htmlOutPath, html)
+        await writeOutput(htmlOutPath, html)
         recordTiming('writeHTML', performance.now() - t0)
       } else if (foundRoute.type === 'spa') {
         // spa-shell: render if any parent layout has ssg/ssr render mode
@@ -404,7 +451,7 @@ if (typeof document === 'undefined') globalThis.document = {}
           }
 
           t0 = performance.now()
-          await outputFile(htmlOutPath, html)
+          await writeOutput(htmlOutPath, html)
           recordTiming('writeHTML', performance.now() - t0)
         } else {
           // separate layout css (before scripts) from page css (after scripts)
@@ -438,7 +485,7 @@ if (typeof document === 'undefined') globalThis.document = {}
           // handles its own loading, and route preloading happens on hover intent
           // emitting hundreds of modulepreload links saturates connections for no benefit
 
-          await outputFile(
+          await writeOutput(
             htmlOutPath,
             `<!DOCTYPE html><html><head>
             ${constants.getSpaHeaderElements({ serverContext: { loaderProps, loaderData } })}
@@ -465,6 +512,27 @@ params:\n\n${JSON.stringify(params || null, null, 2)}`
     throw err
   }
 
+  let incrementalResult: IncrementalPageResult | undefined
+  if (incremental) {
+    incrementalResult = { skipped }
+    if (skipped) {
+      incrementalResult.entry = incremental.previous
+    } else if (loaderDataHash) {
+      try {
+        incrementalResult.entry = await savePageOutputs(
+          incremental.cacheDir,
+          path,
+          { inputsHash: incremental.inputsHash, loaderDataHash, loaderPath },
+          outDir,
+          outputs
+        )
+      } catch (err) {
+        // the page built fine, it just won't be reused next time
+        console.warn(`[one] Warning: could not cache build output for ${path}:`, err)
+      }
+    }
+  }
+
   const middlewares = (foundRoute.middlewares || []).map(
     (x) => builtMiddlewares[x.contextKey]
   )
@@ -491,6 +559,7 @@ params:\n\n${JSON.stringify(params || null, null, 2)}`
     preloads,
     criticalPreloads,
     deferredPreloads,
+    incremental: incrementalResult,
   }
 }
 
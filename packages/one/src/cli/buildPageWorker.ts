@@ -85,7 +85,8 @@ parentPort.on('message', async (msg: any) => {
           msg.args.criticalPreloads,
           msg.args.deferredPreloads,
           msg.args.useAfterLCP,
-          msg.args.useAfterLCPAggressive
+          msg.args.useAfterLCPAggressive,
+          msg.args.incremental
         )
       })
       parentPort!.postMessage({ type: 'done', id: msg.id, result })
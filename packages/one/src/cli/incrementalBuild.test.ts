@@ -0,0 +1,135 @@
+import { mkdtempSync } from 'node:fs'
+import { tmpdir } from 'node:os'
+import { join } from 'node:path'
+import FSExtra from 'fs-extra'
+import { afterEach, beforeEach, describe, expect, it } from 'vitest'
+import {
+  createChunkGraphHasher,
+  loadIncrementalManifest,
+  restorePageOutputs,
+  savePageOutputs,
+  writeIncrementalManifest,
+} from './incrementalBuild'
+
+describe('createChunkGraphHasher', () => {
+  const chunks = [
+    {
+      fileName: 'entry.js',
+      code: 'entry',
+      imports: ['shared.js'],
+      dynamicImports: ['a.js'],
+    },
+    { fileName: 'a.js', code: 'a', imports: ['shared.js'] },
+    { fileName: 'b.js', code: 'b', imports: ['shared.js', 'c.js'] },
+    { fileName: 'c.js', code: 'c', imports: ['b.js'] },
+    { fileName: 'shared.js', code: 'shared' },
+  ]
+
+  it('changes when any imported chunk changes', () => {
+    const before = createChunkGraphHasher(chunks)
+    const after = createChunkGraphHasher(
+      chunks.map((chunk) =>
+        chunk.fileName === 'shared.js' ? { ...chunk, code: 'shared!' } : chunk
+      )
+    )
+    expect(after('a.js')).not.toBe(before('a.js'))
+    expect(after('b.js')).not.toBe(before('b.js'))
+  })
+
+  it('ignores chunks outside the graph', () => {
+    const before = createChunkGraphHasher(chunks)
+    const after = createChunkGraphHasher(
+      chunks.map((chunk) =>
+        chunk.fileName === 'b.js' ? { ...chunk, code: 'b!' } : chunk
+      )
+    )
+    expect(after('a.js')).toBe(before('a.js'))
+    // cyclic imports still hash
+    expect(after('c.js')).not.toBe(before('c.js'))
+  })
+
+  it('can skip dynamic imports', () => {
+    const before = createChunkGraphHasher(chunks)
+    const after = createChunkGraphHasher(
+      chunks.map((chunk) =>
+        chunk.fileName === 'a.js' ? { ...chunk, code: 'a!' } : chunk
+      )
+    )
+    expect(after('entry.js', { dynamic: false })).toBe(
+      before('entry.js', { dynamic: false })
+    )
+    expect(after('entry.js')).not.toBe(before('entry.js'))
+  })
+})
+
+describe('incremental page outputs', () => {
+  let root = ''
+  let cacheDir = ''
+  let outDir = ''
+
+  beforeEach(() => {
+    root = mkdtempSync(join(tmpdir(), 'one-incremental-'))
+    cacheDir = join(root, 'cache')
+    outDir = join(root, 'dist')
+  })
+
+  afterEach(async () => {
+    await FSExtra.remove(root)
+  })
+
+  it('restores saved outputs into a fresh output dir', async () => {
+    const entry = await savePageOutputs(
+      cacheDir,
+      '/blog/hello',
+      { inputsHash: 'inputs', loaderDataHash: 'data', loaderPath: '/assets/loader.js' },
+      outDir,
+      [
+        [join(outDir, 'static', 'blog', 'hello.html'), '<html>hello</html>'],
+        [join(outDir, 'client', 'assets', 'loader.js'), 'export function loader() {}'],
+      ]
+    )
+    expect(entry.outputs).toEqual(['static/blog/hello.html', 'client/assets/loader.js'])
+
+    await FSExtra.remove(outDir)
+    expect(await restorePageOutputs(cacheDir, '/blog/hello', entry, outDir)).toBe(true)
+    expect(
+      await FSExtra.readFile(join(outDir, 'static', 'blog', 'hello.html'), 'utf-8')
+    ).toBe('<html>hello</html>')
+
+    // a page whose cached output is gone has to be rebuilt
+    expect(
+      await restorePageOutputs(cacheDir, '/blog/other', entry, join(root, 'other'))
+    ).toBe(false)
+  })
+
+  it('writes the manifest and prunes unreferenced outputs', async () => {
+    const kept = await savePageOutputs(
+      cacheDir,
+      '/kept',
+      { inputsHash: 'a', loaderDataHash: 'a', loaderPath: '' },
+      outDir,
+      [[join(outDir, 'static', 'kept.html'), 'kept']]
+    )
+    const dropped = await savePageOutputs(
+      cacheDir,
+      '/dropped',
+      { inputsHash: 'b', loaderDataHash: 'b', loaderPath: '' },
+      outDir,
+      [[join(outDir, 'static', 'dropped.html'), 'dropped']]
+    )
+
+    await writeIncrementalManifest(cacheDir, { cacheKey: '1', pages: { '/kept': kept } })
+
+    expect(await loadIncrementalManifest(cacheDir)).toEqual({
+      version: 1,
+      cacheKey: '1',
+      pages: { '/kept': kept },
+    })
+    expect(await restorePageOutputs(cacheDir, '/kept', kept, outDir)).toBe(true)
+    expect(await restorePageOutputs(cacheDir, '/dropped', dropped, outDir)).toBe(false)
+  })
+
+  it('ignores a missing manifest', async () => {
+    expect(await loadIncrementalManifest(cacheDir)).toBeNull()
+  })
+})
@@ -0,0 +1,249 @@
+import { createHash } from 'node:crypto'
+import { dirname, join, relative } from 'node:path'
+import FSExtra from 'fs-extra'
+import { toAbsolute } from '../utils/toAbsolute'
+
+/**
+ * Incremental static builds (`build.incremental`).
+ *
+ * Every ssg/spa page gets an inputs hash (server module graph, layout and
+ * middleware chunks, css, preloads, params) computed on the main thread. The
+ * page's loaders still run on every build, and their serialized output is
+ * hashed too. When both hashes match the previous build, buildPage copies the
+ * html and loader files it wrote last time instead of rendering again.
+ *
+ * Outputs are stored under a directory keyed by path + both hashes, so a build
+ * that fails half way never leaves the previous manifest pointing at files from
+ * a different build. Unreferenced directories are pruned after a successful build.
+ */
+
+// stored under the project cwd, next to the build output pointer
+export const incrementalCacheDir = join('node_modules', '.cache', 'one', 'incremental')
+
+const MANIFEST_VERSION = 1
+
+export type IncrementalPageEntry = {
+  inputsHash: string
+  loaderDataHash: string
+  loaderPath: string
+  // written files, relative to the output dir (`static/...` or `client/...`)
+  outputs: string[]
+}
+
+export type IncrementalBuildManifest = {
+  version: number
+  // CACHE_KEY ends up in every page, so a new key rebuilds everything
+  cacheKey: string
+  pages: Record<string, IncrementalPageEntry>
+}
+
+/** passed to buildPage for pages that can be reused */
+export type IncrementalPageOptions = {
+  cacheDir: string
+  inputsHash: string
+  previous?: IncrementalPageEntry
+}
+
+/** returned from buildPage alongside the route build info */
+export type IncrementalPageResult = {
+  skipped: boolean
+  entry?: IncrementalPageEntry
+}
+
+export function shouldBuildIncrementally(oneOptions?: {
+  build?: { incremental?: boolean }
+}) {
+  // env var takes precedence (ONE_BUILD_INCREMENTAL=0 to disable, =1 to force enable)
+  if (process.env.ONE_BUILD_INCREMENTAL === '0') return false
+  if (process.env.ONE_BUILD_INCREMENTAL === '1') return true
+  return oneOptions?.build?.incremental === true
+}
+
+export function hashValues(...values: unknown[]): string {
+  const hash = createHash('sha1')
+  for (const value of values) {
+    hash.update(typeof value === 'string' ? value : (JSON.stringify(value) ?? ''))
+    hash.update('\0')
+  }
+  return hash.digest('base64url')
+}
+
+/**
+ * serialized loader data for a page (layout loaders, page loader, redirect).
+ * returns undefined when it can't be serialized, which always rebuilds.
+ */
+export function getLoaderDataHash(...loaderData: unknown[]): string | undefined {
+  try {
+    return hashValues(...loaderData)
+  } catch {
+    return undefined
+  }
+}
+
+export async function loadIncrementalManifest(
+  cacheDir: string
+): Promise<IncrementalBuildManifest | null> {
+  try {
+    const manifest = await FSExtra.readJSON(join(cacheDir, 'manifest.json'))
+    if (manifest?.version === MANIFEST_VERSION && manifest.pages) {
+      return manifest
+    }
+  } catch {
+    // no previous build, or an unreadable manifest: rebuild everything
+  }
+  return null
+}
+
+function getPageCacheDir(cacheDir: string, path: string, entry: IncrementalPageEntry) {
+  return join(cacheDir, 'pages', hashValues(path, entry.inputsHash, entry.loaderDataHash))
+}
+
+/**
+ * copy the outputs of a previous build back into place.
+ * returns false if any of them are gone, in which case the page is rebuilt.
+ */
+export async function restorePageOutputs(
+  cacheDir: string,
+  path: string,
+  entry: IncrementalPageEntry,
+  outDir: string
+): Promise<boolean> {
+  const pageDir = getPageCacheDir(cacheDir, path, entry)
+  try {
+    await Promise.all(
+      entry.outputs.map((output) =>
+        FSExtra.copy(join(pageDir, output), join(outDir, output), { overwrite: true })
+      )
+    )
+    return true
+  } catch {
+    return false
+  }
+}
+
+export async function savePageOutputs(
+  cacheDir: string,
+  path: string,
+  entry: Omit<IncrementalPageEntry, 'outputs'>,
+  outDir: string,
+  files: Array<[filePath: string, content: string]>
+): Promise<IncrementalPageEntry> {
+  const outputs = files.map(([filePath]) =>
+    relative(outDir, toAbsolute(filePath)).split('\\').join('/')
+  )
+  const saved = { ...entry, outputs }
+  const pageDir = getPageCacheDir(cacheDir, path, saved)
+  await Promise.all(
+    files.map(([, content], index) =>
+      FSExtra.outputFile(join(pageDir, outputs[index]), content)
+    )
+  )
+  return saved
+}
+
+/**
+ * write the manifest for this build and drop cached outputs no page refers to
+ */
+export async function writeIncrementalManifest(
+  cacheDir: string,
+  manifest: Omit<IncrementalBuildManifest, 'version'>
+) {
+  const referenced = new Set(
+    Object.entries(manifest.pages).map(([path, entry]) =>
+      getPageCacheDir(cacheDir, path, entry)
+    )
+  )
+
+  const pagesDir = join(cacheDir, 'pages')
+  const existing = await FSExtra.readdir(pagesDir).catch(() => [] as string[])
+  await Promise.all(
+    existing
+      .map((name) => join(pagesDir, name))
+      .filter((pageDir) => !referenced.has(pageDir))
+      .map((pageDir) => FSExtra.remove(pageDir))
+  )
+
+  await FSExtra.ensureDir(cacheDir)
+  await FSExtra.writeJSON(join(cacheDir, 'manifest.json'), {
+    version: MANIFEST_VERSION,
+    ...manifest,
+  })
+}
+
+/**
+ * hashes a chunk plus everything it imports, so a page is rebuilt when any
+ * module it renders changes. chunk graphs can be cyclic, so each entry's
+ * transitive closure is collected iteratively before hashing.
+ */
+export function createChunkGraphHasher(
+  chunks: Array<{
+    fileName: string
+    code?: string
+    imports?: string[]
+    dynamicImports?: string[]
+  }>
+) {
+  const byFileName = new Map(chunks.map((chunk) => [chunk.fileName, chunk]))
+  const chunkHashes = new Map<string, string>()
+  const graphHashes = new Map<string, string>()
+
+  function getChunkHash(fileName: string) {
+    let hash = chunkHashes.get(fileName)
+    if (!hash) {
+      hash = hashValues(byFileName.get(fileName)?.code ?? fileName)
+      chunkHashes.set(fileName, hash)
+    }
+    return hash
+  }
+
+  return function getGraphHash(fileName: string, { dynamic = true } = {}) {
+    const cacheKey = `${fileName}:${dynamic}`
+    const cached = graphHashes.get(cacheKey)
+    if (cached) return cached
+
+    const seen = new Set<string>([fileName])
+    const queue = [fileName]
+    while (queue.length) {
+      const chunk = byFileName.get(queue.pop()!)
+      if (!chunk) continue
+      const imports = dynamic
+        ? [...(chunk.imports || []), ...(chunk.dynamicImports || [])]
+        : chunk.imports || []
+      for (const imported of imports) {
+        if (seen.has(imported)) continue
+        seen.add(imported)
+        queue.push(imported)
+      }
+    }
+
+    const hash = hashValues([...seen].sort().map(getChunkHash))
+    graphHashes.set(cacheKey, hash)
+    return hash
+  }
+}
+
+const lockfiles = [
+  'bun.lock',
+  'bun.lockb',
+  'pnpm-lock.yaml',
+  'yarn.lock',
+  'package-lock.json',
+]
+
+/**
+ * dependencies that stay external to the server bundle (react, react-dom...)
+ * don't show up in chunk hashes, so the nearest lockfile stands in for them
+ */
+export async function getDependencyFingerprint(root = process.cwd()) {
+  let dir = toAbsolute(root)
+  while (true) {
+    for (const lockfile of lockfiles) {
+      try {
+        return hashValues(lockfile, await FSExtra.readFile(join(dir, lockfile), 'utf-8'))
+      } catch {}
+    }
+    const parent = dirname(dir)
+    if (parent === dir) return ''
+    dir = parent
+  }
+}
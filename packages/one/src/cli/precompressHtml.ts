@@ -0,0 +1,61 @@
+import { join } from 'node:path'
+import { promisify } from 'node:util'
+import { brotliCompress, constants as zlibConstants, gzip } from 'node:zlib'
+import FSExtra from 'fs-extra'
+import { getHtmlEtag } from '../server/staticHtmlCache'
+import { pLimit } from '../utils/pLimit'
+
+const brotliCompressAsync = promisify(brotliCompress)
+const gzipAsync = promisify(gzip)
+
+/**
+ * writes `.br` and `.gz` siblings next to every built html file and returns
+ * a map of html path → etag. done once at build time so neither the server
+ * nor a reverse proxy has to compress static pages per request.
+ */
+export async function precompressHtml({
+  clientDir,
+  htmlPaths,
+  concurrency,
+}: {
+  clientDir: string
+  htmlPaths: string[]
+  concurrency: number
+}): Promise<Record<string, string>> {
+  const limit = pLimit(concurrency)
+  const etags: Record<string, string> = {}
+
+  await Promise.all(
+    [...new Set(htmlPaths)].map((htmlPath) =>
+      limit(async () => {
+        const fsPath = join(clientDir, htmlPath)
+        let content: Buffer
+        try {
+          content = await FSExtra.readFile(fsPath)
+        } catch {
+          return
+        }
+
+        const [br, gz] = await Promise.all([
+          brotliCompressAsync(content, {
+            params: {
+              [zlibConstants.BROTLI_PARAM_MODE]: zlibConstants.BROTLI_MODE_TEXT,
+              [zlibConstants.BROTLI_PARAM_QUALITY]: zlibConstants.BROTLI_MAX_QUALITY,
+              [zlibConstants.BROTLI_PARAM_SIZE_HINT]: content.length,
+            },
+          }),
+          gzipAsync(content, { level: zlibConstants.Z_BEST_COMPRESSION }),
+        ])
+
+        await Promise.all([
+          FSExtra.writeFile(`${fsPath}.br`, br),
+          FSExtra.writeFile(`${fsPath}.gz`, gz),
+        ])
+
+        etags[htmlPath] = getHtmlEtag(content)
+      })
+    )
+  )
+
+  return etags
+}
@@ -5,6 +5,7 @@ import { Worker } from 'node:worker_threads'
 import { cpus } from 'node:os'
 import { fileURLToPath } from 'node:url'
 import { dirname, join } from 'node:path'
+import type { IncrementalPageOptions } from './incrementalBuild'
 
 const __filename = fileURLToPath(import.meta.url)
 const __dirname = dirname(__filename)
@@ -123,6 +124,7 @@ export class BuildWorkerPool {
     deferredPreloads?: string[]
     useAfterLCP?: boolean
     useAfterLCPAggressive?: boolean
+    incremental?: IncrementalPageOptions
   }): Promise<any> {
     if (this._terminated) {
       throw new Error('Worker pool has been terminated')
@@ -1,7 +1,19 @@
 import { LOADER_JS_POSTFIX_UNCACHED } from './constants'
 import type { Middleware, MiddlewareContext } from './createMiddleware'
+import type { RouteTree } from './router/getRoutes'
 import type { RouteNode } from './router/Route'
 import type { RouteInfoCompiled } from './server/createRoutesManifest'
+import {
+  addPhase,
+  configureRequestMetrics,
+  createPrometheusResponse,
+  forwardRequestTiming,
+  getRequestTiming,
+  type RequestMetricsOptions,
+  setRequestRoute,
+  withRequestMetrics,
+} from './server/requestMetrics'
+import { createRouteMatcher, type RouteMatcher } from './server/routeMatcher'
 import type { LoaderProps } from './types'
 import { getPathFromLoaderPath } from './utils/cleanUrl'
 import { isResponse } from './utils/isResponse'
@@ -67,6 +79,12 @@ export async function runMiddlewares(
     throw new Error(`No middleware handler configured`)
   }
 
+  // the middleware phase only counts the middlewares themselves, so the time
+  // spent importing them and in the wrapped response is taken out
+  const timing = getRequestTiming(request)
+  const chainStart = timing ? performance.now() : 0
+  let excludedMs = 0
+
   if (debugRouter) {
     console.info(`[one] 🔗 middleware chain (${middlewares.length}) for ${route.page}`)
   }
@@ -81,16 +99,28 @@ export async function runMiddlewares(
       if (debugRouter) {
         console.info(`[one] ✓ middleware chain complete`)
       }
-      return ensureResponse(await getResponse())
+      if (!timing) {
+        return ensureResponse(await getResponse())
+      }
+      const responseStart = performance.now()
+      try {
+        return ensureResponse(await getResponse())
+      } finally {
+        excludedMs += performance.now() - responseStart
+      }
     }
 
     if (debugRouter) {
       console.info(`[one]   → middleware[${index}]: ${middlewareModule.contextKey}`)
     }
 
+    const loadStart = timing ? performance.now() : 0
     const exported = (await handlers.loadMiddleware!(middlewareModule))?.default as
       | Middleware
       | undefined
+    if (timing) {
+      excludedMs += addPhase(timing, 'middlewareLoad', loadStart)
+    }
 
     if (!exported) {
       throw new Error(
@@ -120,7 +150,12 @@ export async function runMiddlewares(
   }
 
   // Start with the first middleware (index 0).
-  return dispatch(0)
+  if (!timing) {
+    return dispatch(0)
+  }
+  const response = await dispatch(0)
+  addPhase(timing, 'middleware', chainStart + excludedMs)
+  return response
 }
 
 export async function resolveAPIRoute(
@@ -133,6 +168,7 @@ export async function resolveAPIRoute(
 ) {
   const { pathname } = url
   const params = getRouteParams(pathname, route)
+  setRequestRoute(request, route.page, 'api')
 
   if (debugRouter) {
     console.info(`[one] 📡 API ${request.method} ${pathname} → ${route.file}`, params)
@@ -187,6 +223,7 @@ export async function resolveLoaderRoute(
   if (debugRouter) {
     console.info(`[one] 📦 loader ${url.pathname} → ${route.file}`)
   }
+  setRequestRoute(request, route.page, 'loader')
 
   const isNativeRequest =
     url.searchParams.get('platform') === 'ios' ||
@@ -298,6 +335,7 @@ export async function resolvePageRoute(
   if (debugRouter) {
     console.info(`[one] 📄 page ${pathname} → ${route.file} (${route.type})`)
   }
+  setRequestRoute(request, route.page, 'page')
 
   const loaderProps = {
     path: pathname,
@@ -368,13 +406,28 @@ export function compileManifest(manifest: {
 }): {
   pageRoutes: RouteInfoCompiled[]
   apiRoutes: RouteInfoCompiled[]
+  pageMatcher: RouteMatcher
+  apiMatcher: RouteMatcher
 } {
+  const pageRoutes = manifest.pageRoutes.map(compileRouteRegex)
+  const apiRoutes = manifest.apiRoutes.map(compileRouteRegex)
   return {
-    pageRoutes: manifest.pageRoutes.map(compileRouteRegex),
-    apiRoutes: manifest.apiRoutes.map(compileRouteRegex),
+    pageRoutes,
+    apiRoutes,
+    // segment tries: same result as scanning the sorted routes in order, but
+    // the cost doesn't grow with the number of routes
+    pageMatcher: createRouteMatcher(pageRoutes),
+    apiMatcher: createRouteMatcher(apiRoutes),
   }
 }
 
+// the root not found route has no file, loader lookups skip it
+export const hasRouteFile = (route: RouteInfoCompiled) => route.file !== ''
+
+// +not-found routes are dynamic too, but stay matchable for static asset probes
+const isNotDynamicPageRoute = (route: RouteInfoCompiled) =>
+  route.page.endsWith('/+not-found') || Object.keys(route.routeKeys).length === 0
+
 // in dev mode we do it more simply:
 export function createHandleRequest(
   handlers: RequestHandlers,
@@ -382,21 +435,35 @@ export function createHandleRequest(
     routerRoot,
     ignoredRouteFiles,
     routePaths,
-  }: { routerRoot: string; ignoredRouteFiles?: string[]; routePaths?: string[] }
+    routeTree,
+    metrics,
+  }: {
+    routerRoot: string
+    ignoredRouteFiles?: string[]
+    routePaths?: string[]
+    routeTree?: RouteTree
+    metrics?: RequestMetricsOptions
+  }
 ) {
-  const manifest = getManifest({ routerRoot, ignoredRouteFiles, routePaths })
+  const manifest = getManifest({ routerRoot, ignoredRouteFiles, routePaths, routeTree })
   if (!manifest) {
     throw new Error(`No routes manifest`)
   }
   const compiledManifest = compileManifest(manifest)
+  const { enabled: metricsEnabled, prometheusPath } = configureRequestMetrics(metrics)
 
-  return {
+  const handleRequest = {
     manifest,
     handler: async function handleRequest(
       request: Request
     ): Promise<RequestHandlerResponse> {
       const url = getURLfromRequestURL(request)
       const { pathname, search } = url
+      const timing = getRequestTiming(request)
+
+      if (pathname === prometheusPath) {
+        return createPrometheusResponse()
+      }
 
       // skip paths handled by vite internals or react native dev middleware
       if (
@@ -414,9 +481,9 @@ export function createHandleRequest(
       const looksLikeStaticFile = isStaticAssetRequestPath(pathname)
 
       if (handlers.handleAPI) {
-        const apiRoute = compiledManifest.apiRoutes.find((route) => {
-          return route.compiledRegex.test(pathname)
-        })
+        const matchStart = timing ? performance.now() : 0
+        const apiRoute = compiledManifest.apiMatcher.match(pathname)?.route
+        if (timing) addPhase(timing, 'match', matchStart)
         if (apiRoute) {
           if (debugRouter) {
             console.info(`[one] ⚡ ${pathname} → matched API route: ${apiRoute.page}`)
@@ -451,19 +518,17 @@ export function createHandleRequest(
 
           const originalUrl = getPathFromLoaderPath(pathname)
 
-          for (const route of compiledManifest.pageRoutes) {
-            if (route.file === '') {
-              // ignore not found route
-              continue
-            }
-
-            const finalUrl = new URL(originalUrl, url.origin)
-            finalUrl.search = url.search
+          const finalUrl = new URL(originalUrl, url.origin)
+          finalUrl.search = url.search
 
-            if (!route.compiledRegex.test(finalUrl.pathname)) {
-              continue
-            }
+          const matchStart = timing ? performance.now() : 0
+          const route = compiledManifest.pageMatcher.match(
+            finalUrl.pathname,
+            hasRouteFile
+          )?.route
+          if (timing) addPhase(timing, 'match', matchStart)
 
+          if (route) {
             // route is known to export no loader → return empty module without
             // importing the page bundle. on workerd/cloudflare, evaluating a
             // no-loader SSG page's server bundle can crash when it pulls in
@@ -478,6 +543,7 @@ export function createHandleRequest(
             }
 
             const cleanedRequest = new Request(finalUrl, request)
+            forwardRequestTiming(request, cleanedRequest)
             return resolveLoaderRoute(handlers, cleanedRequest, finalUrl, route)
           }
 
@@ -492,18 +558,20 @@ export function createHandleRequest(
       }
 
       if (handlers.handlePage) {
-        for (const route of compiledManifest.pageRoutes) {
-          if (!route.compiledRegex.test(pathname)) {
-            continue
-          }
-
-          // static asset requests (sourcemaps, favicons, fonts, …) should not
-          // SSR the user's +not-found page or hijack a dynamic route. for
-          // +not-found we still run middleware so it can intercept, then
+        // static asset requests (sourcemaps, favicons, fonts, …) should not
+        // hijack a dynamic route, so skip past those to the next match
+        const matchStart = timing ? performance.now() : 0
+        const route = compiledManifest.pageMatcher.match(
+          pathname,
+          looksLikeStaticFile ? isNotDynamicPageRoute : undefined
+        )?.route
+        if (timing) addPhase(timing, 'match', matchStart)
+
+        if (route) {
+          // static asset requests should not SSR the user's +not-found page
+          // either. we still run middleware so it can intercept, then
           // short-circuit to a bare 404 instead of rendering the page tree.
-          const isDynamicRoute = Object.keys(route.routeKeys).length > 0
-          const isNotFoundRoute = route.page.endsWith('/+not-found')
-          if (looksLikeStaticFile && isNotFoundRoute) {
+          if (looksLikeStaticFile && route.page.endsWith('/+not-found')) {
             if (debugRouter) {
               console.info(
                 `[one] ⚡ ${pathname} → bare 404 for static probe on ${route.page}`
@@ -519,14 +587,6 @@ export function createHandleRequest(
               })
             })
           }
-          if (looksLikeStaticFile && isDynamicRoute) {
-            if (debugRouter) {
-              console.info(
-                `[one] ⚡ ${pathname} → skipping dynamic route ${route.page} for static asset`
-              )
-            }
-            continue
-          }
 
           if (debugRouter) {
             console.info(
@@ -541,6 +601,12 @@ export function createHandleRequest(
       return null
     },
   }
+
+  if (metricsEnabled) {
+    handleRequest.handler = withRequestMetrics(handleRequest.handler)
+  }
+
+  return handleRequest
 }
 
 export function getLoaderParams(
@@ -35,6 +35,18 @@ export { createWorkerHandler, type LazyRoutes } from './server/workerHandler'
 export { compileManifest } from './createHandleRequest'
 export type { RequestHandlers } from './createHandleRequest'
 export { getFetchStaticHtml, setFetchStaticHtml } from './server/staticHtmlFetcher'
+export {
+  createMemoryISRCache,
+  setISRCache,
+  type ISRCache,
+  type ISRPage,
+} from './server/isr'
+export {
+  getPrometheusMetrics,
+  setRequestMetricsHandler,
+  type RequestMetrics,
+  type RequestPhase,
+} from './server/requestMetrics'
 export type { One } from './vite/types'
 
 import { setServerGlobals } from './server/setServerGlobals'
@@ -184,6 +184,7 @@ export {
 export { isResponse } from './utils/isResponse'
 export { redirect } from './utils/redirect'
 export { removeParams } from './utils/removeParams'
+export { revalidatePath } from './utils/revalidatePath'
 export { watchFile } from './utils/watchFile'
 // resilient dynamic-import recovery: retry a transient chunk-fetch failure in
 // place (so it never poisons a React.lazy memo), then fall back to one's
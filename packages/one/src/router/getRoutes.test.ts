@@ -1,5 +1,5 @@
 import { describe, expect, it } from 'vitest'
-import { getRoutes } from './getRoutes'
+import { createRouteTree, getRoutes } from './getRoutes'
 import type { One } from '../vite/types'
 
 function createMockContext(files: Record<string, any>): One.RouteContext {
@@ -13,6 +13,16 @@ function createMockContext(files: Record<string, any>): One.RouteContext {
   return ctx
 }
 
+// the parts of a route tree that don't hold functions, in order
+function describeTree(node: any): any {
+  return {
+    route: node.route,
+    contextKey: node.contextKey,
+    type: node.type,
+    children: node.children.map(describeTree),
+  }
+}
+
 function collectRoutes(node: any, routes: any[] = []): any[] {
   if (node.children?.length === 0 && node.route) {
     routes.push(node)
@@ -72,3 +82,57 @@ describe('getRoutes', () => {
     expect(notFoundRoutes[0].generated).toBe(true)
   })
 })
+
+describe('createRouteTree', () => {
+  const options = { ignoreEntryPoints: true, ignoreRequireErrors: true }
+  const contextOf = (files: Iterable<string>) =>
+    createMockContext(Object.fromEntries([...files].map((file) => [file, {}])))
+  const build = (files: string[]) => describeTree(getRoutes(contextOf(files), options))
+
+  it('matches a full build after files are added, renamed and removed', () => {
+    const files = new Set([
+      './_layout.tsx',
+      './index.tsx',
+      './blog/_layout.tsx',
+      './blog/[slug].tsx',
+      './(a,b)/shared.tsx',
+      './(b)/other.tsx',
+      './dash+ssr/index.tsx',
+      './dash/settings.tsx',
+      './dash-x/index.tsx',
+    ])
+    const tree = createRouteTree(contextOf(files), options)
+    const steps: [add: string[], remove: string[]][] = [
+      [['./about.tsx', './blog/archive.tsx'], []],
+      [['./(a)/first.tsx', './blog/(group)/_layout.tsx'], []],
+      // rename
+      [['./blog/[id].tsx'], ['./blog/[slug].tsx']],
+      [[], ['./(a,b)/shared.tsx', './blog/_layout.tsx']],
+      [['./(a,b)/shared.tsx'], ['./index.tsx']],
+      // dash is now first reached after dash-x
+      [[], ['./dash+ssr/index.tsx']],
+    ]
+
+    for (const [added, removed] of steps) {
+      for (const file of added) {
+        files.add(file)
+        tree.add(file)
+      }
+      for (const file of removed) {
+        files.delete(file)
+        tree.remove(file)
+      }
+      expect(describeTree(tree.getRoutes())).toEqual(build([...files].sort()))
+    }
+  })
+
+  it('throws for conflicting files until one is removed', () => {
+    const tree = createRouteTree(contextOf(['./_layout.tsx', './about.tsx']), options)
+    tree.add('./about.js')
+
+    expect(() => tree.getRoutes()).toThrow()
+
+    tree.remove('./about.tsx')
+    expect(describeTree(tree.getRoutes())).toEqual(build(['./_layout.tsx', './about.js']))
+  })
+})
@@ -33,6 +33,15 @@ type DirectoryNode = {
   slots: Map<string, DirectoryNode>
   /** Render mode for this directory (e.g., from dashboard+ssr or api+api) */
   renderMode?: One.RouteRenderMode | 'api'
+  /** Where a full build would first reach this directory, see getOrderKey */
+  orderKey?: string
+}
+
+type FileEntry = {
+  filePath: string
+  meta: ReturnType<typeof getFileMeta>
+  node: RouteNode
+  routes: Set<string>
 }
 
 const validPlatforms = new Set(['android', 'ios', 'native', 'web'])
@@ -74,7 +83,154 @@ export function getRoutes(
  */
 function getDirectoryTree(contextModule: One.RouteContext, options: Options) {
   const importMode = options.importMode || process.env.One_ROUTER_IMPORT_MODE
+  const ignoreList = getDirectoryIgnoreList(options)
+  const rootDirectory = createDirectoryNode()
+
+  let hasRoutes = false
+  let isValid = false
+
+  for (const filePath of contextModule.keys()) {
+    if (ignoreList.some((regex) => regex.test(filePath))) {
+      continue
+    }
+
+    isValid = true
+
+    const entry = getFileEntry(contextModule, filePath, options, importMode)
+    if (entry && addFileEntry(rootDirectory, entry, options) > 0) {
+      hasRoutes = true
+    }
+  }
+
+  // If there are no routes/layouts then we should display the tutorial.
+  if (!isValid) {
+    return null
+  }
+
+  return finishDirectoryTree(rootDirectory, hasRoutes)
+}
+
+/**
+ * A directory tree that is kept between updates, so adding or removing a file
+ * only parses that file and patches the directories along its route.
+ *
+ * Entries are kept in the order a full build over sorted paths would produce,
+ * so `getRoutes()` matches `getRoutes(contextModule)` with the same files.
+ */
+export function createRouteTree(contextModule: One.RouteContext, options: Options = {}) {
+  const importMode = options.importMode || process.env.One_ROUTER_IMPORT_MODE
+  const ignoreList = getDirectoryIgnoreList(options)
+
+  // null for files that don't become routes, eg for another platform
+  const entries = new Map<string, FileEntry | null>()
+  // files with invalid names fail the build until they are removed
+  const invalid = new Map<string, unknown>()
+
+  let rootDirectory = createDirectoryNode()
+  let routeCount = 0
+  // set when a patch can't be applied in place, the next read rebuilds
+  let stale = true
+
+  function rebuild() {
+    const directory = createDirectoryNode()
+    let count = 0
+    for (const filePath of [...entries.keys()].sort()) {
+      const entry = entries.get(filePath)
+      if (entry) {
+        count += addFileEntry(directory, entry, options)
+      }
+    }
+    rootDirectory = directory
+    routeCount = count
+    stale = false
+  }
+
+  function add(filePath: string) {
+    if (entries.has(filePath) || invalid.has(filePath)) return
+    if (ignoreList.some((regex) => regex.test(filePath))) return
+
+    let entry: FileEntry | null
+    try {
+      entry = getFileEntry(contextModule, filePath, options, importMode)
+    } catch (error) {
+      invalid.set(filePath, error)
+      return
+    }
+
+    entries.set(filePath, entry)
+    if (!entry || stale) return
+
+    // a later middleware in the same directory replaces an earlier one
+    if (entry.meta.isMiddleware) {
+      stale = true
+      return
+    }
+
+    try {
+      routeCount += addFileEntry(rootDirectory, entry, options)
+      for (const route of entry.routes) {
+        sortDirectoryChain(rootDirectory, route)
+      }
+    } catch {
+      // conflicting files, rebuilding throws the error when routes are read
+      stale = true
+    }
+  }
+
+  function remove(filePath: string) {
+    invalid.delete(filePath)
+    const entry = entries.get(filePath)
+    if (!entries.delete(filePath) || !entry || stale) return
+
+    if (entry.meta.isMiddleware) {
+      stale = true
+      return
+    }
+
+    routeCount -= removeFileEntry(rootDirectory, entry)
+    for (const route of entry.routes) {
+      sortDirectoryChain(rootDirectory, route)
+    }
+  }
+
+  for (const filePath of contextModule.keys()) {
+    add(filePath)
+  }
+
+  return {
+    add,
+    remove,
+
+    getRoutes(): RouteNode | null {
+      for (const error of invalid.values()) {
+        throw error
+      }
+      if (stale) {
+        rebuild()
+      }
+      if (!entries.size) {
+        return null
+      }
+
+      // the generated layout and routes go on a copy of the root
+      const directory = finishDirectoryTree(
+        { ...rootDirectory, files: new Map(rootDirectory.files) },
+        routeCount > 0
+      )
+      const rootNode = flattenDirectoryTreeToRoutes(directory, options)
+
+      if (!options.ignoreEntryPoints) {
+        crawlAndAppendInitialRoutesAndEntryFiles(rootNode, options)
+      }
+
+      return rootNode
+    },
+  }
+}
+
+export type RouteTree = ReturnType<typeof createRouteTree>
 
+function getDirectoryIgnoreList(options: Options) {
   const ignoreList: RegExp[] = [
     /^\.\/\+html\.[tj]sx?$/, // Ignore the top level ./+html file
     /\.d\.ts$/, // Ignore TypeScript declaration files
@@ -87,220 +243,406 @@ function getDirectoryTree(contextModule: One.RouteContext, options: Options) {
     ignoreList.push(/\+api\.[tj]sx?$/)
   }
 
-  const rootDirectory: DirectoryNode = {
+  return ignoreList
+}
+
+function createDirectoryNode(renderMode?: One.RouteRenderMode | 'api'): DirectoryNode {
+  return {
     files: new Map(),
     subdirectories: new Map(),
     slots: new Map(),
+    renderMode,
   }
+}
 
-  let hasRoutes = false
-  let isValid = false
-
-  for (const filePath of contextModule.keys()) {
-    if (ignoreList.some((regex) => regex.test(filePath))) {
-      continue
+/**
+ * Parses a file path into the node it adds to the tree, or null if the file
+ * doesn't become a route.
+ */
+function getFileEntry(
+  contextModule: One.RouteContext,
+  filePath: string,
+  options: Options,
+  importMode?: string
+): FileEntry | null {
+  // First pass: determine parent render mode by traversing directories
+  let parentRenderMode: One.RouteRenderMode | 'api' | undefined
+  const pathParts = filePath.replace(/^\.\//, '').split('/')
+  const directoryParts = pathParts.slice(0, -1)
+
+  for (const part of directoryParts) {
+    const dirRenderMode = matchDirectoryRenderMode(part)
+    if (dirRenderMode) {
+      // Inner folders override outer folders
+      parentRenderMode = dirRenderMode.renderMode
     }
+  }
 
-    isValid = true
+  const meta = getFileMeta(filePath, options, parentRenderMode)
 
-    // First pass: determine parent render mode by traversing directories
-    let parentRenderMode: One.RouteRenderMode | 'api' | undefined
-    const pathParts = filePath.replace(/^\.\//, '').split('/')
-    const directoryParts = pathParts.slice(0, -1)
+  // This is a file that should be ignored. e.g maybe it has an invalid platform?
+  if (meta.specificity < 0) {
+    return null
+  }
 
-    for (const part of directoryParts) {
-      const dirRenderMode = matchDirectoryRenderMode(part)
-      if (dirRenderMode) {
-        // Inner folders override outer folders
-        parentRenderMode = dirRenderMode.renderMode
+  const type = meta.isLayout ? 'layout' : meta.renderMode || getDefaultRenderMode()
+  // for layouts, capture their render mode if specified (e.g., _layout+ssg.tsx)
+  // filter out 'api' since layouts can't have api render mode
+  const layoutRenderMode =
+    meta.isLayout && meta.renderMode && meta.renderMode !== 'api'
+      ? meta.renderMode
+      : undefined
+
+  const node: RouteNode = {
+    type,
+    // store layout render mode if this is a layout with an explicit mode
+    ...(layoutRenderMode && { layoutRenderMode }),
+
+    loadRoute() {
+      if (options.ignoreRequireErrors) {
+        try {
+          return contextModule(filePath)
+        } catch {
+          return {}
+        }
+      } else {
+        return contextModule(filePath)
       }
-    }
+    },
 
-    const meta = getFileMeta(filePath, options, parentRenderMode)
+    contextKey: filePath,
+    route: '', // This is overwritten during hoisting based upon the _layout
+    dynamic: null,
+    children: [], // While we are building the directory tree, we don't know the node's children just yet. This is added during hoisting
+  }
 
-    // This is a file that should be ignored. e.g maybe it has an invalid platform?
-    if (meta.specificity < 0) {
-      continue
+  if (process.env.NODE_ENV === 'development') {
+    // If the user has set the `One_ROUTER_IMPORT_MODE` to `sync` then we should
+    // filter the missing routes.
+    if (node.type !== 'api' && importMode === 'sync') {
+      if (!getPageExport(node.loadRoute())) {
+        return null
+      }
     }
+  }
 
-    const type = meta.isLayout ? 'layout' : meta.renderMode || getDefaultRenderMode()
-    // for layouts, capture their render mode if specified (e.g., _layout+ssg.tsx)
-    // filter out 'api' since layouts can't have api render mode
-    const layoutRenderMode =
-      meta.isLayout && meta.renderMode && meta.renderMode !== 'api'
-        ? meta.renderMode
-        : undefined
-
-    let node: RouteNode = {
-      type,
-      // store layout render mode if this is a layout with an explicit mode
-      ...(layoutRenderMode && { layoutRenderMode }),
-
-      loadRoute() {
-        if (options.ignoreRequireErrors) {
-          try {
-            return contextModule(filePath)
-          } catch {
-            return {}
-          }
-        } else {
-          return contextModule(filePath)
-        }
-      },
+  /**
+   * A single filepath may be extrapolated into multiple routes if it contains array syntax.
+   * Another way to thinking about is that a filepath node is present in multiple leaves of the directory tree.
+   */
+  return { filePath, meta, node, routes: extrapolateGroups(meta.route) }
+}
 
-      contextKey: filePath,
-      route: '', // This is overwritten during hoisting based upon the _layout
-      dynamic: null,
-      children: [], // While we are building the directory tree, we don't know the node's children just yet. This is added during hoisting
-    }
+/**
+ * Adds a file to the directory tree, returning how many page routes it added.
+ */
+function addFileEntry(rootDirectory: DirectoryNode, entry: FileEntry, options: Options) {
+  const { filePath, meta } = entry
+  let node = entry.node
+  let added = 0
+  let routeIndex = 0
 
-    if (process.env.NODE_ENV === 'development') {
-      // If the user has set the `One_ROUTER_IMPORT_MODE` to `sync` then we should
-      // filter the missing routes.
-      if (node.type !== 'api' && importMode === 'sync') {
-        if (!getPageExport(node.loadRoute())) {
-          continue
-        }
+  for (const route of entry.routes) {
+    const orderKey = getOrderKey(filePath, routeIndex++)
+
+    // Traverse the directory tree to its leaf node, creating any missing directories along the way
+    const chain = getDirectoryChain(rootDirectory, route, true)!
+
+    for (const { directory } of chain) {
+      if (directory.orderKey === undefined || orderKey < directory.orderKey) {
+        directory.orderKey = orderKey
       }
     }
 
-    /**
-     * A single filepath may be extrapolated into multiple routes if it contains array syntax.
-     * Another way to thinking about is that a filepath node is present in multiple leaves of the directory tree.
-     */
-
-    for (const route of extrapolateGroups(meta.route)) {
-      // Traverse the directory tree to its leaf node, creating any missing directories along the way
-      const subdirectoryParts = route.split('/').slice(0, -1)
-
-      // Start at the root directory and traverse the path to the leaf directory
-      let directory = rootDirectory
-
-      for (const part of subdirectoryParts) {
-        // Check if this is a slot directory (@modal, @sidebar, etc.)
-        const slotName = matchSlotName(part)
-
-        if (slotName) {
-          // Handle slot directory
-          let slotDirectory = directory.slots.get(slotName)
-          if (!slotDirectory) {
-            slotDirectory = {
-              files: new Map(),
-              subdirectories: new Map(),
-              slots: new Map(),
-            }
-            directory.slots.set(slotName, slotDirectory)
-          }
-          directory = slotDirectory
-        } else {
-          // Check for directory render mode suffix (e.g., dashboard+ssr)
-          const dirRenderMode = matchDirectoryRenderMode(part)
-          const dirName = dirRenderMode?.name ?? part
-
-          // Handle regular subdirectory
-          let subDirectory = directory.subdirectories.get(dirName)
-
-          // Create any missing subdirectories
-          if (!subDirectory) {
-            subDirectory = {
-              files: new Map(),
-              subdirectories: new Map(),
-              slots: new Map(),
-              renderMode: dirRenderMode?.renderMode,
-            }
-            directory.subdirectories.set(dirName, subDirectory)
+    const directory = chain[chain.length - 1].directory
+
+    // Clone the node for this route with slot and intercept info
+    node = {
+      ...node,
+      route,
+      slotName: meta.slotName,
+      intercept: meta.interceptMatch
+        ? {
+            levels: meta.interceptMatch.levels,
+            targetPath: meta.interceptMatch.targetPath,
           }
+        : undefined,
+    }
 
-          directory = subDirectory
+    if (meta.isLayout) {
+      directory.layout ??= []
+      const existing = directory.layout[meta.specificity]
+      if (existing) {
+        // In production, use the first route found
+        if (process.env.NODE_ENV !== 'production') {
+          throw new Error(
+            `The layouts "${filePath}" and "${existing.contextKey}" conflict on the route "/${route}". Please remove or rename one of these files.`
+          )
         }
+      } else {
+        node = getLayoutNode(node, options)
+        directory.layout[meta.specificity] = node
+        orderKeys.set(node, orderKey)
       }
-
-      // Clone the node for this route with slot and intercept info
-      node = {
-        ...node,
-        route,
-        slotName: meta.slotName,
-        intercept: meta.interceptMatch
-          ? {
-              levels: meta.interceptMatch.levels,
-              targetPath: meta.interceptMatch.targetPath,
-            }
-          : undefined,
+    } else if (meta.isMiddleware) {
+      directory.middleware = node
+      orderKeys.set(node, orderKey)
+    } else if (node.type === 'api') {
+      const fileKey = `${route}+api`
+      let nodes = directory.files.get(fileKey)
+
+      if (!nodes) {
+        nodes = []
+        directory.files.set(fileKey, nodes)
       }
 
-      if (meta.isLayout) {
-        directory.layout ??= []
-        const existing = directory.layout[meta.specificity]
-        if (existing) {
-          // In production, use the first route found
-          if (process.env.NODE_ENV !== 'production') {
-            throw new Error(
-              `The layouts "${filePath}" and "${existing.contextKey}" conflict on the route "/${route}". Please remove or rename one of these files.`
-            )
-          }
-        } else {
-          node = getLayoutNode(node, options)
-          directory.layout[meta.specificity] = node
-        }
-      } else if (meta.isMiddleware) {
-        directory.middleware = node
-      } else if (type === 'api') {
-        const fileKey = `${route}+api`
-        let nodes = directory.files.get(fileKey)
-
-        if (!nodes) {
-          nodes = []
-          directory.files.set(fileKey, nodes)
+      // API Routes have no specificity, they are always the first node
+      const existing = nodes[0]
+
+      if (existing) {
+        // In production, use the first route found
+        if (process.env.NODE_ENV !== 'production') {
+          throw new Error(
+            `The API route file "${filePath}" and "${existing.contextKey}" conflict on the route "/${route}". Please remove or rename one of these files.`
+          )
         }
+      } else {
+        nodes[0] = node
+        orderKeys.set(node, orderKey)
+      }
+    } else {
+      let nodes = directory.files.get(route)
 
-        // API Routes have no specificity, they are always the first node
-        const existing = nodes[0]
+      if (!nodes) {
+        nodes = []
+        directory.files.set(route, nodes)
+      }
 
-        if (existing) {
-          // In production, use the first route found
-          if (process.env.NODE_ENV !== 'production') {
-            throw new Error(
-              `The API route file "${filePath}" and "${existing.contextKey}" conflict on the route "/${route}". Please remove or rename one of these files.`
-            )
-          }
-        } else {
-          nodes[0] = node
+      /**
+       * If there is an existing node with the same specificity, then we have a conflict.
+       * NOTE(Platform Routes):
+       *    We cannot check for specificity conflicts here, as we haven't processed all the context keys yet!
+       *    This will be checked during hoisting, as well as enforcing that all routes have a non-platform route.
+       */
+      const existing = nodes[meta.specificity]
+      if (existing) {
+        // In production, use the first route found
+        if (process.env.NODE_ENV !== 'production') {
+          throw new Error(
+            `The route files "${filePath}" and "${existing.contextKey}" conflict on the route "/${route}". Please remove or rename one of these files.`
+          )
         }
       } else {
-        let nodes = directory.files.get(route)
+        added++
+        nodes[meta.specificity] = node
+        orderKeys.set(node, orderKey)
+      }
+    }
+  }
 
-        if (!nodes) {
-          nodes = []
-          directory.files.set(route, nodes)
-        }
+  return added
+}
 
-        /**
-         * If there is an existing node with the same specificity, then we have a conflict.
-         * NOTE(Platform Routes):
-         *    We cannot check for specificity conflicts here, as we haven't processed all the context keys yet!
-         *    This will be checked during hoisting, as well as enforcing that all routes have a non-platform route.
-         */
-        const existing = nodes[meta.specificity]
-        if (existing) {
-          // In production, use the first route found
-          if (process.env.NODE_ENV !== 'production') {
-            throw new Error(
-              `The route files "${filePath}" and "${existing.contextKey}" conflict on the route "/${route}". Please remove or rename one of these files.`
-            )
-          }
-        } else {
-          hasRoutes ||= true
-          nodes[meta.specificity] = node
+/**
+ * Removes a file added by addFileEntry along with any directories it leaves
+ * empty, returning how many page routes it removed.
+ */
+function removeFileEntry(rootDirectory: DirectoryNode, entry: FileEntry) {
+  const { filePath, meta } = entry
+  let removed = 0
+  let routeIndex = 0
+
+  for (const route of entry.routes) {
+    const orderKey = getOrderKey(filePath, routeIndex++)
+    const chain = getDirectoryChain(rootDirectory, route, false)
+    if (!chain) continue
+
+    const directory = chain[chain.length - 1].directory
+
+    if (meta.isLayout) {
+      if (directory.layout?.[meta.specificity]?.contextKey === filePath) {
+        delete directory.layout[meta.specificity]
+        if (!trimHoles(directory.layout)) {
+          directory.layout = undefined
         }
       }
+    } else if (meta.isMiddleware) {
+      if (directory.middleware?.contextKey === filePath) {
+        directory.middleware = undefined
+      }
+    } else {
+      const isApi = entry.node.type === 'api'
+      const fileKey = isApi ? `${route}+api` : route
+      const index = isApi ? 0 : meta.specificity
+      const nodes = directory.files.get(fileKey)
+      if (nodes?.[index]?.contextKey === filePath) {
+        delete nodes[index]
+        if (!isApi) removed++
+        if (!trimHoles(nodes)) {
+          directory.files.delete(fileKey)
+        }
+      }
+    }
+
+    for (let i = chain.length - 1; i > 0; i--) {
+      const { directory, parent, name } = chain[i]
+      if (isEmptyDirectory(directory)) {
+        parent!.delete(name!)
+      } else if (directory.orderKey === orderKey) {
+        directory.orderKey = getDirectoryOrderKey(directory)
+      }
     }
   }
 
-  // If there are no routes/layouts then we should display the tutorial.
-  if (!isValid) {
-    return null
+  return removed
+}
+
+type DirectoryLink = {
+  directory: DirectoryNode
+  parent?: Map<string, DirectoryNode>
+  name?: string
+}
+
+/**
+ * The directories from the root down to the one holding `route`, or null if
+ * one is missing and `create` isn't set.
+ */
+function getDirectoryChain(
+  rootDirectory: DirectoryNode,
+  route: string,
+  create: boolean
+): DirectoryLink[] | null {
+  const chain: DirectoryLink[] = [{ directory: rootDirectory }]
+  let directory = rootDirectory
+
+  for (const part of route.split('/').slice(0, -1)) {
+    const { parent, name, renderMode } = getDirectoryKey(directory, part)
+    let child = parent.get(name)
+
+    // Create any missing subdirectories
+    if (!child) {
+      if (!create) return null
+      child = createDirectoryNode(renderMode)
+      parent.set(name, child)
+    }
+
+    chain.push({ directory: child, parent, name })
+    directory = child
+  }
+
+  return chain
+}
+
+function getDirectoryKey(directory: DirectoryNode, part: string) {
+  // Check if this is a slot directory (@modal, @sidebar, etc.)
+  const slotName = matchSlotName(part)
+  if (slotName) {
+    return { parent: directory.slots, name: slotName, renderMode: undefined }
+  }
+
+  // Check for directory render mode suffix (e.g., dashboard+ssr)
+  const dirRenderMode = matchDirectoryRenderMode(part)
+  return {
+    parent: directory.subdirectories,
+    name: dirRenderMode?.name ?? part,
+    renderMode: dirRenderMode?.renderMode,
+  }
+}
+
+/**
+ * Restores build order along a route after a patch. A full build inserts
+ * entries in the order of the first file path that reached them.
+ */
+function sortDirectoryChain(rootDirectory: DirectoryNode, route: string) {
+  let directory = rootDirectory
+
+  for (const part of route.split('/').slice(0, -1)) {
+    const { parent, name } = getDirectoryKey(directory, part)
+    sortMap(parent, (child) => child.orderKey!)
+
+    // the rest of the route was removed
+    const child = parent.get(name)
+    if (!child) return
+    directory = child
   }
 
+  sortMap(directory.files, getNodesOrderKey)
+}
+
+function sortMap<T>(map: Map<string, T>, getKey: (value: T) => string) {
+  let previous: string | undefined
+  for (const value of map.values()) {
+    const key = getKey(value)
+    if (previous !== undefined && key < previous) {
+      const sorted = [...map].sort(([, a], [, b]) => {
+        const keyA = getKey(a)
+        const keyB = getKey(b)
+        return keyA < keyB ? -1 : keyA > keyB ? 1 : 0
+      })
+      map.clear()
+      for (const [name, value] of sorted) {
+        map.set(name, value)
+      }
+      return
+    }
+    previous = key
+  }
+}
+
+/**
+ * A full build over sorted paths creates entries in order of the first file
+ * that reaches them, then by which of that file's extrapolated routes did.
+ * The newline sorts a path before any longer path it prefixes.
+ */
+function getOrderKey(filePath: string, routeIndex: number) {
+  return `${filePath}\n${routeIndex.toString().padStart(4, '0')}`
+}
+
+const orderKeys = new WeakMap<RouteNode, string>()
+
+function getNodesOrderKey(nodes: RouteNode[]) {
+  let first: string | undefined
+  for (const node of nodes) {
+    const key = node && orderKeys.get(node)!
+    if (key && (first === undefined || key < first)) {
+      first = key
+    }
+  }
+  return first!
+}
+
+function getDirectoryOrderKey(directory: DirectoryNode) {
+  const keys: string[] = []
+  if (directory.layout) keys.push(getNodesOrderKey(directory.layout))
+  if (directory.middleware) keys.push(orderKeys.get(directory.middleware)!)
+  for (const nodes of directory.files.values()) keys.push(getNodesOrderKey(nodes))
+  for (const child of directory.subdirectories.values()) keys.push(child.orderKey!)
+  for (const child of directory.slots.values()) keys.push(child.orderKey!)
+  return keys.reduce((first, key) => (key < first ? key : first))
+}
+
+function isEmptyDirectory(directory: DirectoryNode) {
+  return (
+    !directory.layout &&
+    !directory.middleware &&
+    !directory.files.size &&
+    !directory.subdirectories.size &&
+    !directory.slots.size
+  )
+}
+
+/**
+ * Drops trailing holes so the last element stays the most specific, returns
+ * the new length.
+ */
+function trimHoles(nodes: RouteNode[]) {
+  while (nodes.length && !nodes[nodes.length - 1]) {
+    nodes.length--
+  }
+  return nodes.length
+}
+
+function finishDirectoryTree(rootDirectory: DirectoryNode, hasRoutes: boolean) {
   /**
    * If there are no top-level _layout, add a default _layout
    */
@@ -360,7 +702,8 @@ function flattenDirectoryTreeToRoutes(
    */
   if (directory.layout) {
     const previousLayout = layout
-    layout = getMostSpecific(directory.layout)
+    // copied so the directory tree can be flattened again, see createRouteTree
+    layout = { ...getMostSpecific(directory.layout), children: [] }
 
     // Add the new layout as a child of its parent
     if (previousLayout) {
@@ -385,7 +728,7 @@ function flattenDirectoryTreeToRoutes(
 
   for (const routes of directory.files.values()) {
     // TODO(Platform Routes): We need to pick the most specific layout and ensure that all routes have a non-platform route.
-    const routeNode = getMostSpecific(routes)
+    const routeNode = { ...getMostSpecific(routes) }
 
     // `route` is the absolute pathname. We need to make this relative to the nearest layout
     routeNode.route = routeNode.route.replace(pathToRemove, '')
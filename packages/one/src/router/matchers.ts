@@ -98,6 +98,8 @@ export function matchGroupName(name: string): string | undefined {
 
 /** Match the first array group name `(a,b,c)/(d,c)` -> `'a,b,c'` */
 export function matchArrayGroupName(name: string) {
+  // the pattern needs a comma and is slow to fail on long paths
+  if (!name.includes(',')) return undefined
   return name.match(/(?:[^\\(\\)])*?\(?([^\\/()]+,[^\\/()]+)\)?.*?$/)?.[1]
 }
 
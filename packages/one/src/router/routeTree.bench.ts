@@ -0,0 +1,70 @@
+import { bench, describe } from 'vitest'
+import {
+  createMockModuleWithContext,
+  getRoutesManifestOptions,
+} from '../server/createRoutesManifest'
+import { createRouteTree, getRoutes } from './getRoutes'
+
+// run with: bun run vitest bench --run src/router/routeTree.bench.ts
+// a full build parses every route file on each change, while the route tree
+// only parses the changed file, so it should stay roughly flat as routes grow
+
+const options = getRoutesManifestOptions({})
+
+function createSyntheticRoutes(sections: number) {
+  const files = ['./_layout.tsx', './index.tsx', './+not-found.tsx']
+  for (let i = 0; i < sections; i++) {
+    files.push(
+      `./section${i}/_layout.tsx`,
+      `./section${i}/index.tsx`,
+      `./section${i}/[id].tsx`,
+      `./section${i}/[id]/edit.tsx`,
+      `./(marketing)/section${i}/about+ssg.tsx`
+    )
+  }
+  return files.sort()
+}
+
+function buildRoutes(files: string[]) {
+  return getRoutes(createMockModuleWithContext([...files].sort()), options)
+}
+
+for (const sections of [200, 1000, 4000]) {
+  const files = createSyntheticRoutes(sections)
+  const section = `./section${Math.floor(sections / 2)}`
+  const added = `${section}/new.tsx`
+  const from = `${section}/[id]/edit.tsx`
+  const to = `${section}/[id]/settings.tsx`
+  const renamedFiles = files.map((file) => (file === from ? to : file))
+
+  const tree = createRouteTree(createMockModuleWithContext(files), options)
+  tree.getRoutes()
+
+  describe(`${files.length} route files`, () => {
+    bench('full build: add then delete', () => {
+      buildRoutes([...files, added])
+      buildRoutes(files)
+    })
+
+    bench('route tree: add then delete', () => {
+      tree.add(added)
+      tree.getRoutes()
+      tree.remove(added)
+      tree.getRoutes()
+    })
+
+    bench('full build: rename and back', () => {
+      buildRoutes(renamedFiles)
+      buildRoutes(files)
+    })
+
+    bench('route tree: rename and back', () => {
+      tree.remove(from)
+      tree.add(to)
+      tree.getRoutes()
+      tree.remove(to)
+      tree.add(from)
+      tree.getRoutes()
+    })
+  })
+}
@@ -6,6 +6,18 @@ import type { One } from './vite/types'
 
 // re-export static HTML fetcher utilities for worker use
 export { getFetchStaticHtml, setFetchStaticHtml } from './server/staticHtmlFetcher'
+export {
+  createMemoryISRCache,
+  setISRCache,
+  type ISRCache,
+  type ISRPage,
+} from './server/isr'
+export {
+  getPrometheusMetrics,
+  setRequestMetricsHandler,
+  type RequestMetrics,
+  type RequestPhase,
+} from './server/requestMetrics'
 
 // re-export for use in generated worker code
 export type { LazyRoutes }
@@ -9,6 +9,26 @@ import { ensureExists } from './utils/ensureExists'
 import { resolveServeOutDir } from './utils/buildOutputPointer'
 import type { One } from './vite/types'
 
+// incremental static regeneration, see server/isr.ts
+export {
+  createMemoryISRCache,
+  setISRCache,
+  type ISRCache,
+  type ISRPage,
+} from './server/isr'
+export { createFileSystemISRCache } from './server/isrFileSystemCache'
+export {
+  setSSRCacheStatsHandler,
+  type SSRCacheEvent,
+  type SSRCacheStats,
+} from './server/ssrCache'
+export {
+  getPrometheusMetrics,
+  setRequestMetricsHandler,
+  type RequestMetrics,
+  type RequestPhase,
+} from './server/requestMetrics'
+
 // formatErrorSafely + the prepareStackTrace guard prevent a buggy transitive
 // formatter (source-map-support without recursion guard) from pinning the
 // serve process forever. see cli/install-error-handlers.ts for the full
@@ -91,7 +111,12 @@ async function serveWithReusePort(args: Parameters<typeof serve>[0], numWorkers:
       process.argv[1]!,
       process.argv.slice(2).filter((a) => !a.startsWith('--cluster')),
       {
-        env: { ...process.env, ONE_CLUSTER_WORKER: '1' },
+        env: {
+          ...process.env,
+          ONE_CLUSTER_WORKER: '1',
+          // render workers split the cores between processes, see renderPool.ts
+          ONE_CLUSTER_SIZE: String(numWorkers),
+        },
         stdio: 'inherit',
       }
     )
@@ -146,8 +171,11 @@ async function serveWithCluster(args: Parameters<typeof serve>[0], numWorkers: n
   if (cluster.default.isPrimary) {
     console.info(`[one] cluster: starting ${numWorkers} workers (IPC)`)
 
+    // render workers split the cores between processes, see renderPool.ts
+    const env = { ONE_CLUSTER_SIZE: String(numWorkers) }
+
     for (let i = 0; i < numWorkers; i++) {
-      cluster.default.fork()
+      cluster.default.fork(env)
     }
 
     let recentCrashes = 0
@@ -172,7 +200,10 @@ async function serveWithCluster(args: Parameters<typeof serve>[0], numWorkers: n
       console.error(
         `[one] worker ${worker.process.pid} died (code ${code}, signal ${signal}), restarting`
       )
-      setTimeout(() => cluster.default.fork(), Math.min(recentCrashes * 500, 5000))
+      setTimeout(
+        () => cluster.default.fork(env),
+        Math.min(recentCrashes * 500, 5000)
+      )
     })
 
     const shutdown = () => {
@@ -221,22 +252,30 @@ async function startWorker(args: Parameters<typeof serve>[0]) {
     ? compileCacheRules(oneOptions.server.cacheControl)
     : undefined
 
-  return await vxrnServe({
-    outDir: buildInfo.outDir || outDir,
-    app: args?.app,
-    ...oneOptions.server,
-    ...removeUndefined({
-      port: args?.port ? +args.port : undefined,
-      host: args?.host,
-      compress: args?.compress,
-    }),
-
-    async beforeRegisterRoutes(options, app) {
-      await oneServe(oneOptions, buildInfo, app, {
-        serveStaticAssets: (ctx) => serveStaticAssets({ ...ctx, cacheRules }),
-      })
-    },
-
-    async afterRegisterRoutes(options, app) {},
-  })
+  let closeOneServe: (() => Promise<void>) | undefined
+
+  try {
+    return await vxrnServe({
+      outDir: buildInfo.outDir || outDir,
+      app: args?.app,
+      ...oneOptions.server,
+      ...removeUndefined({
+        port: args?.port ? +args.port : undefined,
+        host: args?.host,
+        compress: args?.compress,
+      }),
+
+      async beforeRegisterRoutes(options, app) {
+        const served = await oneServe(oneOptions, buildInfo, app, {
+          serveStaticAssets: (ctx) => serveStaticAssets({ ...ctx, cacheRules }),
+        })
+        closeOneServe = served.close
+      },
+
+      async afterRegisterRoutes(options, app) {},
+    })
+  } finally {
+    // vxrn's serve resolves once the server has closed, on SIGINT/SIGTERM
+    await closeOneServe?.()
+  }
 }
@@ -1,4 +1,4 @@
-import { getRoutes, type Options } from '../router/getRoutes'
+import { getRoutes, type Options, type RouteTree } from '../router/getRoutes'
 import type { One, RouteInfo } from '../vite/types'
 import { getServerManifest } from './getServerManifest'
 
@@ -15,7 +15,7 @@ export type RoutesManifest<TRegex = string> = {
   allRoutes: RouteInfo<TRegex>[]
 }
 
-function createMockModuleWithContext(map: string[] = []) {
+export function createMockModuleWithContext(map: string[] = []) {
   const contextModule = (key) => ({ default() {} })
 
   Object.defineProperty(contextModule, 'keys', {
@@ -25,17 +25,24 @@ function createMockModuleWithContext(map: string[] = []) {
   return contextModule as One.RouteContext
 }
 
-export function createRoutesManifest(
-  paths: string[],
-  options: Options
-): RoutesManifest | null {
-  const routeTree = getRoutes(createMockModuleWithContext(paths), {
+export function getRoutesManifestOptions(options: Options): Options {
+  return {
     ...options,
     preserveApiRoutes: true,
     ignoreRequireErrors: true,
     ignoreEntryPoints: true,
     platform: 'web',
-  })
+  }
+}
+
+export function createRoutesManifest(
+  paths: string[],
+  options: Options
+): RoutesManifest | null {
+  const routeTree = getRoutes(
+    createMockModuleWithContext(paths),
+    getRoutesManifestOptions(options)
+  )
 
   if (!routeTree) {
     throw new Error(`No route tree found in paths: ${JSON.stringify(paths)}`)
@@ -43,3 +50,17 @@ export function createRoutesManifest(
 
   return getServerManifest(routeTree)
 }
+
+/**
+ * Same as createRoutesManifest, for a route tree created with
+ * getRoutesManifestOptions.
+ */
+export function createRoutesManifestFromTree(routeTree: RouteTree): RoutesManifest {
+  const rootNode = routeTree.getRoutes()
+
+  if (!rootNode) {
+    throw new Error(`No route tree found`)
+  }
+
+  return getServerManifest(rootNode)
+}
@@ -0,0 +1,25 @@
+import { toAbsoluteUrl } from '../utils/toAbsolute'
+import { toServerOutputPath } from '../utils/toServerOutputPath'
+import type { ImportRoute } from './routeLoaders'
+
+/**
+ * Imports route modules for `one serve` from `lazyPages` when given, otherwise
+ * from the server build output in `outDir`.
+ */
+export function createServerRouteImporter({
+  outDir,
+  lazyPages,
+}: {
+  outDir: string
+  lazyPages?: Record<string, () => Promise<any>>
+}): ImportRoute {
+  return async (serverPath, lazyKey) => {
+    if (!lazyKey) {
+      return await import(toAbsoluteUrl(serverPath!))
+    }
+    if (lazyPages?.[lazyKey]) {
+      return await lazyPages[lazyKey]()
+    }
+    return await import(toAbsoluteUrl(toServerOutputPath(serverPath || lazyKey, outDir)))
+  }
+}
@@ -0,0 +1,214 @@
+import { mkdtempSync, readdirSync, rmSync } from 'node:fs'
+import { tmpdir } from 'node:os'
+import { join } from 'node:path'
+import { afterEach, describe, expect, it } from 'vitest'
+import { revalidatePath } from '../utils/revalidatePath'
+import type { RouteInfoCompiled } from './createRoutesManifest'
+import {
+  createIncrementalRegeneration,
+  createMemoryISRCache,
+  type ISRPage,
+} from './isr'
+import { createFileSystemISRCache, pruneFileSystemISRCache } from './isrFileSystemCache'
+
+function createRoute(revalidate: number | false) {
+  return {
+    file: './blog/[slug]+ssg.tsx',
+    page: '/blog/[slug]',
+    type: 'ssg',
+    routeKeys: { slug: 'slug' },
+    revalidate,
+  } as unknown as RouteInfoCompiled
+}
+
+const disposers: Array<() => void> = []
+
+afterEach(() => {
+  while (disposers.length) disposers.pop()!()
+})
+
+function setup(revalidate: number | false) {
+  const route = createRoute(revalidate)
+  const cache = createMemoryISRCache()
+  const renders: string[] = []
+
+  const isr = createIncrementalRegeneration({
+    cache,
+    buildKey: 'build-1',
+    async renderPage(_route, path, params) {
+      renders.push(path)
+      await new Promise((resolve) => setTimeout(resolve, 5))
+      if (params.slug === 'missing') return null
+      return {
+        html: `<p>${params.slug} #${renders.length}</p>`,
+        loaderData: { slug: params.slug },
+        generatedAt: Date.now(),
+      }
+    },
+    matchRoute(path) {
+      return { route, params: { slug: path.split('/').pop()! } }
+    },
+  })
+  disposers.push(isr.dispose)
+
+  return { isr, route, cache, renders }
+}
+
+const tick = () => new Promise((resolve) => setTimeout(resolve, 20))
+
+describe('createIncrementalRegeneration', () => {
+  it('renders unknown paths once and caches them', async () => {
+    const { isr, route, renders } = setup(60)
+    const params = { slug: 'new' }
+
+    const [first, second] = await Promise.all([
+      isr.getPage(route, '/blog/new', params),
+      isr.getPage(route, '/blog/new', params),
+    ])
+    expect(first).toBe(second)
+    expect((first as ISRPage).html).toBe('<p>new #1</p>')
+
+    expect(await isr.getPage(route, '/blog/new', params)).toBe(first)
+    expect(renders).toEqual(['/blog/new'])
+
+    expect(await isr.getPage(route, '/blog/missing', { slug: 'missing' })).toBeNull()
+  })
+
+  it('serves a stale page while a single render replaces it', async () => {
+    const { isr, route, cache, renders } = setup(60)
+    const stale = {
+      html: 'stale',
+      loaderData: null,
+      generatedAt: Date.now() - 61_000,
+      buildKey: 'build-1',
+    }
+    cache.set('/blog/old', stale)
+
+    const params = { slug: 'old' }
+    expect(await isr.getPage(route, '/blog/old', params)).toBe(stale)
+    expect(await isr.getPage(route, '/blog/old', params)).toBe(stale)
+    await tick()
+
+    expect(renders).toEqual(['/blog/old'])
+    expect((await isr.getPage(route, '/blog/old', params)) as ISRPage).toMatchObject({
+      html: '<p>old #1</p>',
+    })
+    expect(renders).toHaveLength(1)
+  })
+
+  it('hands background renders to waitUntil', async () => {
+    const { isr, route, cache } = setup(60)
+    cache.set('/blog/old', {
+      html: 'stale',
+      loaderData: null,
+      generatedAt: 0,
+      buildKey: 'build-1',
+    })
+
+    const scheduled: Promise<unknown>[] = []
+    const waitUntil = (promise: Promise<unknown>) => scheduled.push(promise)
+    const params = { slug: 'old' }
+    await isr.getPage(route, '/blog/old', params, { waitUntil })
+    await isr.getPage(route, '/blog/new', { slug: 'new' }, { prebuilt: true, waitUntil })
+    expect(scheduled).toHaveLength(2)
+
+    await Promise.all(scheduled)
+    // both renders finished once the scheduled promises did
+    expect(await cache.get('/blog/old')).toMatchObject({ loaderData: { slug: 'old' } })
+    expect(await cache.get('/blog/new')).toMatchObject({ loaderData: { slug: 'new' } })
+  })
+
+  it('leaves prebuilt pages to the build output until rendered', async () => {
+    const timed = setup(60)
+    const params = { slug: 'built' }
+    expect(
+      await timed.isr.getPage(timed.route, '/blog/built', params, { prebuilt: true })
+    ).toBeNull()
+    await tick()
+    expect(timed.renders).toEqual(['/blog/built'])
+    expect(
+      await timed.isr.getPage(timed.route, '/blog/built', params, { prebuilt: true })
+    ).toMatchObject({ html: '<p>built #1</p>' })
+
+    // without an interval a prebuilt page only changes through revalidatePath
+    const onDemand = setup(false)
+    expect(
+      await onDemand.isr.getPage(onDemand.route, '/blog/built', params, {
+        prebuilt: true,
+      })
+    ).toBeNull()
+    await tick()
+    expect(onDemand.renders).toEqual([])
+  })
+
+  it('treats pages stored by another build as missing', async () => {
+    const { isr, route, cache, renders } = setup(false)
+    const params = { slug: 'old' }
+    cache.set('/blog/old', {
+      html: 'old build',
+      loaderData: null,
+      generatedAt: Date.now(),
+      buildKey: 'build-0',
+    })
+
+    const page = await isr.getPage(route, '/blog/old', params)
+    expect(page).toMatchObject({ html: '<p>old #1</p>', buildKey: 'build-1' })
+    expect(renders).toEqual(['/blog/old'])
+    expect(await cache.get('/blog/old')).toBe(page)
+  })
+
+  it('evicts and re-renders paths passed to revalidatePath', async () => {
+    const { isr, route, cache, renders } = setup(false)
+    const params = { slug: 'built' }
+    cache.set('/blog/built', {
+      html: 'old',
+      loaderData: null,
+      generatedAt: 0,
+      buildKey: 'build-1',
+    })
+
+    await revalidatePath('/blog/built')
+    expect(await cache.get('/blog/built')).toBeUndefined()
+
+    // the prebuilt html is older than what was evicted, wait for the render
+    const page = await isr.getPage(route, '/blog/built', params, { prebuilt: true })
+    expect(page).toMatchObject({ html: '<p>built #1</p>' })
+    expect(renders).toEqual(['/blog/built'])
+  })
+})
+
+describe('createFileSystemISRCache', () => {
+  let dir = ''
+
+  afterEach(() => {
+    rmSync(dir, { recursive: true, force: true })
+  })
+
+  it('stores pages across instances', async () => {
+    dir = mkdtempSync(join(tmpdir(), 'one-isr-'))
+    const page = { html: '<p>hi</p>', loaderData: { n: 1 }, generatedAt: 1 }
+
+    await createFileSystemISRCache({ dir }).set('/blog/hi', page)
+    const cache = createFileSystemISRCache({ dir })
+    expect(await cache.get('/blog/hi')).toEqual(page)
+    expect(await cache.get('/blog/other')).toBeNull()
+
+    await cache.delete('/blog/hi')
+    expect(await cache.get('/blog/hi')).toBeNull()
+  })
+
+  it('removes the pages of other builds', async () => {
+    dir = mkdtempSync(join(tmpdir(), 'one-isr-'))
+    const page = { html: '<p>hi</p>', loaderData: null, generatedAt: 1 }
+    const previous = createFileSystemISRCache({ dir: join(dir, 'build-0') })
+    await previous.set('/blog/hi', page)
+    await createFileSystemISRCache({ dir: join(dir, 'build-1') }).set('/blog/hi', page)
+
+    await pruneFileSystemISRCache({ root: dir, keep: 'build-1' })
+    expect(readdirSync(dir)).toEqual(['build-1'])
+
+    // a server still running the pruned build keeps caching
+    await previous.set('/blog/hi', page)
+    expect(await previous.get('/blog/hi')).toEqual(page)
+  })
+})
@@ -0,0 +1,257 @@
+import type { RenderAppProps } from '../types'
+import { isResponse } from '../utils/isResponse'
+import { ISR_REVALIDATORS_KEY } from '../utils/revalidatePath'
+import type { One } from '../vite/types'
+import type { RouteInfoCompiled } from './createRoutesManifest'
+import type { RouteLoaders } from './routeLoaders'
+
+/**
+ * Incremental static regeneration for ssg routes that `export const revalidate`.
+ *
+ * Paths outside generateStaticParams are rendered on their first request and
+ * cached instead of returning a 404. Once a cached page is older than
+ * `revalidate` seconds it keeps being served while one background render
+ * replaces it: like the `loaderCache` export, concurrent requests for a path
+ * share a single pending render. `revalidatePath()` evicts pages on demand.
+ *
+ * Prebuilt pages are served from the build output until the first background
+ * render has cached a newer version.
+ */
+
+export type ISRPage = {
+  html: string
+  loaderData: unknown
+  /** ms timestamp of the render */
+  generatedAt: number
+  /** CACHE_KEY of the build that rendered it, set when the page is cached */
+  buildKey?: string
+}
+
+/**
+ * Storage for regenerated pages keyed by pathname. `one serve` defaults to
+ * `node_modules/.cache/one/isr`, workers keep pages in memory. Replace it with
+ * `setISRCache` to share pages between instances (redis, KV...). Pages embed
+ * hashed asset urls, so ones stored by another build are treated as missing.
+ */
+export type ISRCache = {
+  get: (path: string) => ISRPage | null | undefined | Promise<ISRPage | null | undefined>
+  set: (path: string, page: ISRPage) => void | Promise<void>
+  delete: (path: string) => void | Promise<void>
+}
+
+let _isrCache: ISRCache | null = null
+
+export function setISRCache(cache: ISRCache | null) {
+  _isrCache = cache
+}
+
+export function getISRCache() {
+  return _isrCache
+}
+
+export function isISRRoute(route: RouteInfoCompiled) {
+  return route.type === 'ssg' && route.revalidate !== undefined && !route.isNotFound
+}
+
+/** LRU by Map insertion order, most recently used last */
+export function createMemoryISRCache({ maxEntries = 1000 } = {}): ISRCache {
+  const pages = new Map<string, ISRPage>()
+
+  return {
+    get(path) {
+      const page = pages.get(path)
+      if (page) {
+        pages.delete(path)
+        pages.set(path, page)
+      }
+      return page
+    },
+    set(path, page) {
+      pages.delete(path)
+      pages.set(path, page)
+      if (pages.size > maxEntries) {
+        const oldest = pages.keys().next().value
+        if (oldest !== undefined) pages.delete(oldest)
+      }
+    },
+    delete(path) {
+      pages.delete(path)
+    },
+  }
+}
+
+type RenderISRPage = (
+  route: RouteInfoCompiled,
+  path: string,
+  params: Record<string, string>
+) => Promise<ISRPage | Response | null>
+
+/**
+ * renders a page of an ssg route with `revalidate` the way `one build` would.
+ * the page is shared by every visitor, so loaders get no request.
+ */
+export function createISRPageRenderer({
+  getRouteBuildInfo,
+  runRouteLoaders,
+  render,
+}: {
+  getRouteBuildInfo: (file: string) => Omit<One.RouteBuildInfo, 'loaderData'> | undefined
+  runRouteLoaders: RouteLoaders['runRouteLoaders']
+  render: (props: RenderAppProps) => Promise<string>
+}): RenderISRPage {
+  return async (route, path, params) => {
+    const routeBuildInfo = getRouteBuildInfo(route.file)
+    if (!routeBuildInfo) return null
+
+    const loaderProps = { path, params }
+    let loaded: Awaited<ReturnType<typeof runRouteLoaders>>
+    try {
+      loaded = await runRouteLoaders(route, routeBuildInfo.serverJsPath, loaderProps)
+    } catch (err) {
+      if (isResponse(err)) return err
+      throw err
+    }
+
+    const { pageResult, matches } = loaded
+    if (pageResult.isEnoent) return null
+    if (isResponse(pageResult.loaderData)) return pageResult.loaderData
+
+    globalThis['__vxrnresetState']?.()
+
+    const html = await render({
+      mode: 'ssg',
+      loaderData: pageResult.loaderData,
+      loaderProps,
+      path,
+      preloads: routeBuildInfo.criticalPreloads || routeBuildInfo.preloads,
+      deferredPreloads: routeBuildInfo.deferredPreloads,
+      css: routeBuildInfo.css,
+      cssContents: routeBuildInfo.cssContents,
+      matches,
+    })
+
+    return { html, loaderData: pageResult.loaderData, generatedAt: Date.now() }
+  }
+}
+
+// keeps a background render alive past the response, like ctx.waitUntil on workers
+type WaitUntil = (promise: Promise<unknown>) => void
+
+export function createIncrementalRegeneration({
+  cache,
+  buildKey,
+  renderPage,
+  matchRoute,
+}: {
+  cache: ISRCache
+  buildKey: string
+  // null when the loader 404s, a Response when it redirects. neither is cached.
+  renderPage: RenderISRPage
+  matchRoute: (
+    path: string
+  ) => { route: RouteInfoCompiled; params: Record<string, string> } | null
+}) {
+  const pending = new Map<string, Promise<ISRPage | Response | null>>()
+  // evicted by revalidatePath and not rendered again yet, a prebuilt copy is
+  // older than what was evicted so requests wait for the render instead
+  const evicted = new Set<string>()
+
+  function regenerate(
+    route: RouteInfoCompiled,
+    path: string,
+    params: Record<string, string>
+  ) {
+    let promise = pending.get(path)
+    if (!promise) {
+      promise = (async () => {
+        const page = await renderPage(route, path, params)
+        if (page && !isResponse(page)) {
+          page.buildKey = buildKey
+          await cache.set(path, page)
+        }
+        return page
+      })().finally(() => {
+        pending.delete(path)
+        evicted.delete(path)
+      })
+      pending.set(path, promise)
+    }
+    return promise
+  }
+
+  function regenerateInBackground(
+    route: RouteInfoCompiled,
+    path: string,
+    params: Record<string, string>,
+    waitUntil?: WaitUntil
+  ) {
+    const promise = regenerate(route, path, params).catch((err) => {
+      console.error(`[one] Error regenerating ${path}\n${err?.['stack'] ?? err}`)
+    })
+    waitUntil?.(promise)
+  }
+
+  /**
+   * the cached page for a path, rendering it first on a miss. with `prebuilt`
+   * a miss returns null right away so the built html is served, and renders
+   * in the background when the route has a revalidate interval. runtimes that
+   * stop work once the response is sent pass `waitUntil` for those renders.
+   */
+  async function getPage(
+    route: RouteInfoCompiled,
+    path: string,
+    params: Record<string, string>,
+    { prebuilt = false, waitUntil }: { prebuilt?: boolean; waitUntil?: WaitUntil } = {}
+  ): Promise<ISRPage | Response | null> {
+    const stored = await cache.get(path)
+    // a store shared across deploys can hold pages linking to old assets
+    const page = stored?.buildKey === buildKey ? stored : null
+
+    if (page) {
+      const { revalidate } = route
+      if (
+        typeof revalidate === 'number' &&
+        Date.now() - page.generatedAt >= revalidate * 1000
+      ) {
+        regenerateInBackground(route, path, params, waitUntil)
+      }
+      return page
+    }
+
+    if (prebuilt && !evicted.has(path)) {
+      if (typeof route.revalidate === 'number') {
+        regenerateInBackground(route, path, params, waitUntil)
+      }
+      return null
+    }
+
+    return await regenerate(route, path, params)
+  }
+
+  async function revalidate(paths: string[]) {
+    await Promise.all(
+      paths.map(async (path) => {
+        // a render that started before the data changed would cache it again
+        await pending.get(path)?.catch(() => {})
+        await cache.delete(path)
+        const match = matchRoute(path)
+        if (!match || !isISRRoute(match.route)) return
+        evicted.add(path)
+        regenerateInBackground(match.route, path, match.params)
+      })
+    )
+  }
+
+  const revalidators = (globalThis[ISR_REVALIDATORS_KEY] ||= new Set()) as Set<
+    typeof revalidate
+  >
+  revalidators.add(revalidate)
+
+  return {
+    getPage,
+    revalidate,
+    dispose() {
+      revalidators.delete(revalidate)
+    },
+  }
+}
@@ -0,0 +1,73 @@
+import { createHash } from 'node:crypto'
+import { mkdir, readdir, readFile, rename, rm, writeFile } from 'node:fs/promises'
+import { join } from 'node:path'
+import type { ISRCache, ISRPage } from './isr'
+
+// stored under the project cwd, next to the incremental build cache
+export const isrCacheDir = join('node_modules', '.cache', 'one', 'isr')
+
+/**
+ * one json file per path. writes go through a rename so processes sharing the
+ * directory (`one serve --cluster`) never read a half written page.
+ */
+export function createFileSystemISRCache({ dir }: { dir: string }): ISRCache {
+  let ready: Promise<unknown> | null = null
+
+  function getFile(path: string) {
+    return join(dir, `${createHash('sha1').update(path).digest('base64url')}.json`)
+  }
+
+  return {
+    async get(path) {
+      try {
+        const { path: storedPath, ...page } = JSON.parse(
+          await readFile(getFile(path), 'utf-8')
+        )
+        return storedPath === path ? (page as ISRPage) : null
+      } catch {
+        return null
+      }
+    },
+
+    async set(path, page) {
+      await (ready ||= mkdir(dir, { recursive: true }))
+      const file = getFile(path)
+      const tmpFile = `${file}.${process.pid}.tmp`
+      const json = JSON.stringify({ path, ...page })
+      try {
+        await writeFile(tmpFile, json)
+      } catch (err) {
+        // a server started from a newer build pruned the directory
+        if ((err as any)?.code !== 'ENOENT') throw err
+        await mkdir(dir, { recursive: true })
+        await writeFile(tmpFile, json)
+      }
+      await rename(tmpFile, file)
+    },
+
+    async delete(path) {
+      await rm(getFile(path), { force: true })
+    },
+  }
+}
+
+/** removes the cache directories of every build in `root` except `keep` */
+export async function pruneFileSystemISRCache({
+  root,
+  keep,
+}: {
+  root: string
+  keep: string
+}) {
+  let entries: string[]
+  try {
+    entries = await readdir(root)
+  } catch {
+    return
+  }
+  await Promise.all(
+    entries
+      .filter((name) => name !== keep)
+      .map((name) => rm(join(root, name), { recursive: true, force: true }))
+  )
+}
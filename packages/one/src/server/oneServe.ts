@@ -11,6 +11,7 @@ import {
   compileManifest,
   getSubdomain,
   getURLfromRequestURL,
+  hasRouteFile,
   type RequestHandlers,
   runMiddlewares,
 } from '../createHandleRequest'
@@ -20,27 +21,45 @@ import { toAbsoluteUrl } from '../utils/toAbsolute'
 import { toServerOutputPath } from '../utils/toServerOutputPath'
 import type { One } from '../vite/types'
 import type { RouteInfoCompiled } from './createRoutesManifest'
-import { setSSRLoaderData } from './ssrLoaderData'
+import { createServerRouteImporter } from './importServerRoute'
+import {
+  createIncrementalRegeneration,
+  createISRPageRenderer,
+  createMemoryISRCache,
+  getISRCache,
+  isISRRoute,
+} from './isr'
+import {
+  createFileSystemISRCache,
+  isrCacheDir,
+  pruneFileSystemISRCache,
+} from './isrFileSystemCache'
+import {
+  addPhase,
+  configureRequestMetrics,
+  createPrometheusResponse,
+  finishHonoRequestTiming,
+  forwardRequestTiming,
+  getRequestTiming,
+  markCache,
+  setRequestRoute,
+  startRequestTiming,
+} from './requestMetrics'
+import {
+  getHeaderEntries,
+  getRenderPoolOptions,
+  type HeaderEntries,
+  RenderPoolBusyError,
+  type RenderTask,
+  RenderWorkerPool,
+} from './renderPool'
+import { createRouteLoaders } from './routeLoaders'
+import { createSSRCache } from './ssrCache'
 import { getFetchStaticHtml } from './staticHtmlFetcher'
+import { createStaticHtmlCache } from './staticHtmlCache'
 
 const debugRouter = process.env.ONE_DEBUG_ROUTER
 
-// Bounded map helper: prevents unbounded memory growth by evicting the oldest
-// entry when the map exceeds the specified maximum size. Uses insertion order
-// (Map preserves insertion order) — the first-inserted entry is evicted first.
-const MODULE_CACHE_MAX = 500
-function setBounded<K, V>(map: Map<K, V>, key: K, value: V, max: number): void {
-  if (map.has(key)) {
-    map.set(key, value)
-    return
-  }
-  if (map.size >= max) {
-    const firstKey = map.keys().next().value
-    if (firstKey !== undefined) map.delete(firstKey as K)
-  }
-  map.set(key, value)
-}
-
 // forwards response headers to a hono context, preserving individual
 // set-cookie values (Headers.forEach joins them into one unparseable string)
 function forwardHeaders(response: Response, context: { header: Function }) {
@@ -56,6 +75,14 @@ function forwardHeaders(response: Response, context: { header: Function }) {
   })
 }
 
+// a full render queue is shed instead of growing, see renderPool.ts
+function renderPoolBusyResponse() {
+  return new Response('Service Unavailable', {
+    status: 503,
+    headers: { 'retry-after': '1' },
+  })
+}
+
 async function readStaticHtml(htmlPath: string, outDir = 'dist'): Promise<string | null> {
   const fetchStaticHtml = getFetchStaticHtml()
   if (fetchStaticHtml) {
@@ -95,9 +122,25 @@ export async function oneServe(
   const { isResponse } = await import('../utils/isResponse')
   const { isStatusRedirect } = await import('../utils/isStatus')
   const { resolveResponse } = await import('../vite/resolveResponse')
+  const { mergeHeaders, setResponseHeaders } = await import('../vite/one-server-only')
 
   const isAPIRequest = new WeakMap<any, boolean>()
 
+  const metrics = configureRequestMetrics(oneOptions.server?.metrics)
+  if (metrics.enabled) {
+    app.use('*', async (context, next) => {
+      startRequestTiming(context.req.raw)
+      await next()
+      // unset first so hono doesn't merge the old headers into the timed response
+      const response = context.res
+      context.res = undefined
+      context.res = finishHonoRequestTiming(context.req.raw, response)
+    })
+  }
+  if (metrics.prometheusPath) {
+    app.get(metrics.prometheusPath, () => createPrometheusResponse())
+  }
+
   // add redirects
   const redirects = oneOptions.web?.redirects
   if (redirects) {
@@ -157,131 +200,69 @@ export async function oneServe(
   // SSR responses get no-cache by default — include it in headers to avoid per-response mutation
   const ssrHtmlHeaders = { 'content-type': 'text/html', 'cache-control': 'no-cache' }
 
-  // cache resolved loader functions directly (not just modules)
-  const loaderCache = new Map<string, Function | null>()
-  const moduleImportCache = new Map<string, any>()
-
-  // loader coalescing via static loaderCache export
-  // when a route exports loaderCache, concurrent requests with the same key share one execution
-  const loaderCacheFnMap = new Map<string, Function | null>()
-  const pendingLoaderResults = new Map<
-    string,
-    { promise: Promise<any>; expires: number }
-  >()
-
-  // resolve a route module's loader - sync on cache hit, async on cold start
-  function resolveLoaderSync(
-    serverPath: string | undefined,
-    lazyKey: string | undefined
-  ): Function | null | Promise<Function | null> {
-    const cacheKey = lazyKey || serverPath || ''
-    const cached = loaderCache.get(cacheKey)
-    if (cached !== undefined) return cached // sync!
-
-    // cold path - async import
-    return (async () => {
-      const pathToResolve = serverPath || lazyKey || ''
-      const resolvedPath = toServerOutputPath(pathToResolve, outDir)
-
-      let routeExported: any
-      if (moduleImportCache.has(cacheKey)) {
-        routeExported = moduleImportCache.get(cacheKey)
-      } else {
-        routeExported = lazyKey
-          ? options?.lazyRoutes?.pages?.[lazyKey]
-            ? await options.lazyRoutes.pages[lazyKey]()
-            : await import(toAbsoluteUrl(resolvedPath))
-          : await import(toAbsoluteUrl(serverPath!))
-        setBounded(moduleImportCache, cacheKey, routeExported, MODULE_CACHE_MAX)
-      }
+  const {
+    loaderCache,
+    loaderCacheFnMap,
+    resolveLoaderSync,
+    importAndRunLoader,
+    runRouteLoaders,
+  } = createRouteLoaders({
+    importRoute: createServerRouteImporter({
+      outDir,
+      lazyPages: options?.lazyRoutes?.pages,
+    }),
+  })
 
-      const loader = routeExported?.loader || null
-      setBounded(loaderCache, cacheKey, loader, MODULE_CACHE_MAX)
-      // also cache loaderCache export for coalescing
-      const loaderCacheFn = routeExported?.loaderCache ?? null
-      setBounded(loaderCacheFnMap, cacheKey, loaderCacheFn, MODULE_CACHE_MAX)
-      return loader
-    })()
-  }
+  const ssrCacheOptions = oneOptions.server?.ssrCache
+  const ssrCache = ssrCacheOptions
+    ? createSSRCache(typeof ssrCacheOptions === 'object' ? ssrCacheOptions : undefined)
+    : null
 
-  // shared helper to import a route module and run its loader
-  async function importAndRunLoader(
-    routeId: string,
-    serverPath: string | undefined,
-    lazyKey: string | undefined,
+  // html cache key of an ssr render, built from the loaderCache keys of the
+  // page and its layouts. undefined when a loader has no key with a ttl or its
+  // module isn't loaded yet (the first request computes it after the loaders).
+  function getSSRCacheKey(
+    route: RouteInfoCompiled,
     loaderProps: any
-  ): Promise<{ loaderData: unknown; routeId: string; isEnoent?: boolean }> {
-    if (!serverPath && !lazyKey) {
-      return { loaderData: undefined, routeId }
+  ): { key: string; ttl: number } | undefined {
+    let key = `${route.file}\0${loaderProps?.path || '/'}${loaderProps?.search || ''}`
+    let ttl = Number.POSITIVE_INFINITY
+    let keyed = false
+
+    const ids = route.layouts?.length
+      ? [...route.layouts.map((layout) => layout.contextKey), route.file]
+      : [route.file]
+
+    for (const id of ids) {
+      const loader = loaderCache.get(id)
+      if (loader === undefined) return
+      if (loader === null) continue
+      const result = loaderCacheFnMap.get(id)?.(loaderProps?.params, loaderProps?.request)
+      // a key without ttl only coalesces concurrent loader calls
+      if (!result || typeof result === 'string' || result.key == null) return
+      if (!(result.ttl > 0)) return
+      key += `\0${result.key}`
+      ttl = Math.min(ttl, result.ttl)
+      keyed = true
     }
 
-    // check loaderCache BEFORE resolving the loader (fast path for coalesced requests)
-    const cacheMapKey = lazyKey || serverPath || ''
-    const loaderCacheFn = loaderCacheFnMap.get(cacheMapKey)
-    let coalFullKey: string | undefined
-    let coalTtl = 0
-
-    if (loaderCacheFn) {
-      const cacheResult = loaderCacheFn(loaderProps?.params, loaderProps?.request)
-      const cacheKey = typeof cacheResult === 'string' ? cacheResult : cacheResult?.key
-      coalTtl = typeof cacheResult === 'string' ? 0 : (cacheResult?.ttl ?? 0)
-
-      if (cacheKey != null) {
-        coalFullKey = routeId + '\0' + cacheKey
-        const existing = pendingLoaderResults.get(coalFullKey)
-        // expires=0 means pending or no-TTL (coalesce-only), so !0 is true
-        if (existing && (!existing.expires || Date.now() < existing.expires)) {
-          // coalesce: reuse pending/cached result (never even resolves the loader fn)
-          const loaderData = await existing.promise
-          return { loaderData, routeId }
-        }
-      }
-    }
-
-    try {
-      const loaderOrPromise = resolveLoaderSync(serverPath, lazyKey)
-      const loader =
-        loaderOrPromise instanceof Promise ? await loaderOrPromise : loaderOrPromise
-      if (!loader) {
-        return { loaderData: undefined, routeId }
-      }
-
-      // first caller with loaderCache: execute and register for coalescing
-      if (coalFullKey) {
-        const promise = loader(loaderProps)
-        const entry = { promise, expires: 0 }
-        pendingLoaderResults.set(coalFullKey, entry)
-        promise.then(
-          () => {
-            entry.expires = coalTtl > 0 ? Date.now() + coalTtl : 0
-            if (coalTtl <= 0) {
-              Promise.resolve().then(() => pendingLoaderResults.delete(coalFullKey!))
-            }
-          },
-          () => {
-            pendingLoaderResults.delete(coalFullKey!)
-          }
-        )
-
-        const loaderData = await promise
-        return { loaderData, routeId }
-      }
+    return keyed ? { key, ttl } : undefined
+  }
 
-      // no coalescing: run loader directly
-      const loaderData = await loader(loaderProps)
-      return { loaderData, routeId }
-    } catch (err) {
-      if (isResponse(err)) {
-        throw err
-      }
-      if ((err as any)?.code === 'ENOENT') {
-        return { loaderData: undefined, routeId, isEnoent: true }
-      }
-      console.error(`[one] Error running loader for ${routeId}:`, err)
-      return { loaderData: undefined, routeId }
-    }
+  // headers set with setResponseHeaders so far, kept with a cached render and
+  // replayed on its hits. null when a cookie was set, those are per visitor.
+  async function getCacheableHeaders() {
+    let entries: HeaderEntries = []
+    await setResponseHeaders((headers) => {
+      entries = getHeaderEntries(headers)
+    })
+    return entries.some(([name]) => name === 'set-cookie') ? null : entries
   }
 
+  const serverEntryUrl = toAbsoluteUrl(
+    `${serverOptions.root}/${outDir}/server/_virtual_one-entry.${typeof oneOptions.build?.server === 'object' && oneOptions.build.server.outputFormat === 'cjs' ? 'c' : ''}js`
+  )
+
   // lazy load server entry - sync on cache hit
   let render: ((props: RenderAppProps) => any) | null = null
   let renderStream: ((props: RenderAppProps) => Promise<ReadableStream>) | null = null
@@ -293,11 +274,7 @@ export async function oneServe(
     renderLoading = (async () => {
       const entry = options?.lazyRoutes?.serverEntry
         ? await options.lazyRoutes.serverEntry()
-        : await import(
-            toAbsoluteUrl(
-              `${serverOptions.root}/${outDir}/server/_virtual_one-entry.${typeof oneOptions.build?.server === 'object' && oneOptions.build.server.outputFormat === 'cjs' ? 'c' : ''}js`
-            )
-          )
+        : await import(serverEntryUrl)
       render = entry.default.render as (props: RenderAppProps) => any
       renderStream = entry.default.renderStream as
         | ((props: RenderAppProps) => Promise<ReadableStream>)
@@ -306,8 +283,118 @@ export async function oneServe(
     return renderLoading
   }
 
+  // ssr renders on worker threads, see renderPool.ts. workers (lazyRoutes)
+  // have no threads to spread them over
+  const renderPoolOptions = options?.lazyRoutes
+    ? null
+    : getRenderPoolOptions(oneOptions.server?.renderWorkers)
+  const renderPool = renderPoolOptions
+    ? new RenderWorkerPool(renderPoolOptions, { entry: serverEntryUrl, outDir })
+    : null
+
+  // renders on a render pool thread, headers set during the render apply to
+  // the response like they do for a render on this thread
+  async function renderOnWorker(task: RenderTask) {
+    const result = await renderPool!.render(task)
+    if (result.type === 'stream' || result.type === 'html') {
+      const entries = result.headers
+      if (entries.length) {
+        await setResponseHeaders((headers) => mergeHeaders(headers, new Headers(entries)))
+      }
+    }
+    return result
+  }
+
+  // renders with the server entry, on a render pool thread when there is one
+  function renderHtml(props: RenderAppProps, stream: true): Promise<ReadableStream>
+  function renderHtml(props: RenderAppProps, stream: false): Promise<string>
+  async function renderHtml(props: RenderAppProps, stream: boolean) {
+    if (renderPool?.running) {
+      try {
+        const result = await renderOnWorker({ props, stream })
+        // without loaders the worker only sends back html
+        if (result.type === 'stream') return result.stream
+        if (result.type === 'html') return result.html
+      } catch (err) {
+        // props that can't be cloned (functions in loader data) render here
+        if ((err as Error)?.name !== 'DataCloneError') throw err
+      }
+    }
+    const _rl = ensureRenderLoaded()
+    if (_rl) await _rl
+    return stream ? await renderStream!(props) : await render!(props)
+  }
+
   const clientDir = join(process.cwd(), outDir, 'client')
 
+  // workers (lazyRoutes) read html through their asset binding instead
+  const htmlCacheOptions = oneOptions.server?.htmlCache
+  const htmlCache =
+    htmlCacheOptions && !options?.lazyRoutes
+      ? createStaticHtmlCache({
+          clientDir,
+          etags: buildInfo.htmlEtags,
+          maxBytes:
+            typeof htmlCacheOptions === 'object' ? htmlCacheOptions.maxBytes : undefined,
+        })
+      : null
+
+  if (htmlCache && typeof htmlCacheOptions === 'object' && htmlCacheOptions.preload) {
+    await htmlCache.preload(Object.values(routeMap))
+  }
+
+  const compiledManifest = compileManifest(buildInfo.manifest)
+
+  const renderISRPage = createISRPageRenderer({
+    getRouteBuildInfo: (file) => routeToBuildInfo[file],
+    runRouteLoaders,
+    render: (props) => renderHtml(props, false),
+  })
+
+  // only set up when a route exports revalidate
+  const isr = compiledManifest.pageRoutes.some(isISRRoute)
+    ? createIncrementalRegeneration({
+        cache: getISRCache() || createDefaultISRCache(),
+        buildKey: buildInfo.constants.CACHE_KEY,
+        renderPage: renderISRPage,
+        matchRoute: (path) => compiledManifest.pageMatcher.match(path, hasRouteFile),
+      })
+    : null
+
+  function createDefaultISRCache() {
+    if (options?.lazyRoutes) return createMemoryISRCache()
+    const root = join(process.cwd(), isrCacheDir)
+    const { CACHE_KEY } = buildInfo.constants
+    // pages embed asset urls, so each build starts from an empty cache and the
+    // pages of earlier builds are never read again
+    pruneFileSystemISRCache({ root, keep: CACHE_KEY }).catch((err) => {
+      console.warn(`[one] Error removing old isr pages: ${err}`)
+    })
+    return createFileSystemISRCache({ dir: join(root, CACHE_KEY) })
+  }
+
+  async function respondWithNotFoundPage(request: Request, path: string) {
+    const nfPath = findNearestNotFoundPath(path)
+    const nfHtml = routeMap[nfPath]
+    if (nfHtml) {
+      const cached = await htmlCache?.get(nfHtml)
+      if (cached) {
+        return htmlCache!.respond(cached, request, 404)
+      }
+      try {
+        const html = await readFile(
+          join(process.cwd(), `${outDir}/client`, nfHtml),
+          'utf-8'
+        )
+        return new Response(html, {
+          headers: { 'content-type': 'text/html' },
+          status: 404,
+        })
+      } catch {}
+    }
+    return new Response('404 Not Found', { status: 404 })
+  }
+
   const requestHandlers: RequestHandlers = {
     async handleStaticFile(filePath: string) {
       try {
@@ -342,8 +429,23 @@ export async function oneServe(
       return await import(toAbsoluteUrl(route.contextKey))
     },
 
-    async handleLoader({ route, loaderProps }) {
+    async handleLoader({ request, route, loaderProps }) {
       const routeFile = (route as any).routeFile || route.file
+      const timing = getRequestTiming(request)
+
+      // serve the data the cached page was rendered with
+      if (isr && isISRRoute(route)) {
+        const path = loaderProps?.path || '/'
+        const page = await isr.getPage(
+          { ...route, file: routeFile },
+          path,
+          loaderProps?.params || {}
+        )
+        if (isResponse(page)) throw page
+        if (!page) return make404LoaderJs(path)
+        return `export function loader() { return ${JSON.stringify(page.loaderData)} }`
+      }
+
       const serverPath = toServerOutputPath(route.file, outDir)
 
       let loader: Function | null
@@ -362,8 +464,10 @@ export async function oneServe(
       }
 
       let json
+      const loaderStart = timing ? performance.now() : 0
       try {
         json = await loader(loaderProps)
+        if (timing) addPhase(timing, 'loaders', loaderStart)
       } catch (err) {
         // for file-not-found errors (e.g., missing MDX for non-existent slug),
         // return a 404 signal so the client navigates to +not-found
@@ -386,8 +490,9 @@ export async function oneServe(
       return `export function loader() { return ${JSON.stringify(json)} }`
     },
 
-    async handlePage({ route, url, loaderProps }) {
+    async handlePage({ request, route, url, loaderProps }) {
       const buildInfo = routeToBuildInfo[route.file]
+      const timing = getRequestTiming(request)
 
       if (route.type === 'ssr') {
         if (!buildInfo) {
@@ -397,130 +502,84 @@ export async function oneServe(
           )
         }
 
-        try {
-          // collect layout loaders to run in parallel
-          const layoutRoutes = route.layouts || []
-
-          // fast path: check which layouts actually have loaders (sync on cache hit)
-          // skip importAndRunLoader entirely for layouts with no loader
-          const layoutLoaderPromises: Array<ReturnType<typeof importAndRunLoader>> = []
-          const noLoaderResults: Array<{ loaderData: unknown; routeId: string }> = []
-
-          for (const layout of layoutRoutes) {
-            const serverPath = layout.loaderServerPath || layout.contextKey
-            const cacheKey = layout.contextKey || serverPath || ''
-            const cachedLoader = loaderCache.get(cacheKey)
-
-            if (cachedLoader === null) {
-              // loader already resolved to null - skip the async call entirely
-              noLoaderResults.push({ loaderData: undefined, routeId: layout.contextKey })
-            } else {
-              layoutLoaderPromises.push(
-                importAndRunLoader(
-                  layout.contextKey,
-                  serverPath,
-                  layout.contextKey,
-                  loaderProps
-                )
+        // not-found renders respond with a 404 and are never cached
+        const cachesHtml = !!ssrCache && !route.isNotFound
+        let ssrCacheKey = cachesHtml ? getSSRCacheKey(route, loaderProps) : undefined
+        if (ssrCacheKey) {
+          const cached = ssrCache!.get(ssrCacheKey.key)
+          if (timing) markCache(timing, 'ssr', cached ? 'hit' : 'miss')
+          if (cached) {
+            if (cached.headers.length) {
+              await setResponseHeaders((headers) =>
+                mergeHeaders(headers, new Headers(cached.headers))
               )
             }
+            return new Response(useStreaming ? ssrCache!.toStream(cached) : cached.html, {
+              headers: ssrHtmlHeaders,
+            })
           }
+        }
 
-          // run page loader
-          const pageLoaderPromise = importAndRunLoader(
-            route.file,
-            buildInfo.serverJsPath,
-            route.file,
-            loaderProps
-          )
+        const status = route.isNotFound ? 404 : 200
+        // use ssrHtmlHeaders (includes cache-control: no-cache) to avoid
+        // per-response header mutation in the Hono handler
+        const responseHeaders = route.isNotFound ? htmlHeaders : ssrHtmlHeaders
 
-          // wait for all loaders in parallel
-          let layoutResults: Array<{
-            loaderData: unknown
-            routeId: string
-            isEnoent?: boolean
-          }>
-          let pageResult: { loaderData: unknown; routeId: string; isEnoent?: boolean }
+        try {
+          // the worker runs the loaders as well, their keys aren't known here so
+          // the html isn't cached
+          if (renderPool?.running && renderPool.options.loaders === 'worker') {
+            const renderStart = timing ? performance.now() : 0
+            const result = await renderOnWorker({
+              props: {
+                mode: route.type,
+                loaderProps,
+                path: loaderProps?.path || '/',
+                preloads: buildInfo.criticalPreloads || buildInfo.preloads,
+                deferredPreloads: buildInfo.deferredPreloads,
+                css: buildInfo.css,
+                cssContents: buildInfo.cssContents,
+              },
+              stream: useStreaming,
+              loaders: { route, serverJsPath: buildInfo.serverJsPath },
+            })
+            if (timing) addPhase(timing, 'render', renderStart)
 
-          try {
-            if (layoutLoaderPromises.length === 0) {
-              // fast path: all layout loaders are null or no layouts
-              layoutResults = noLoaderResults
-              pageResult = await pageLoaderPromise
-            } else {
-              const [asyncLayoutResults, pr] = await Promise.all([
-                Promise.all(layoutLoaderPromises),
-                pageLoaderPromise,
-              ])
-              layoutResults = [...noLoaderResults, ...asyncLayoutResults]
-              pageResult = pr
+            if (result.type === 'not-found') {
+              return await respondWithNotFoundPage(request, loaderProps?.path || '/')
             }
-          } catch (err) {
-            // Handle thrown responses (e.g., redirect) from any loader
-            if (isResponse(err)) {
-              return err
+            if (result.type === 'response') {
+              return result.response
             }
-            throw err
+            return new Response(result.type === 'stream' ? result.stream : result.html, {
+              headers: responseHeaders,
+              status,
+            })
           }
 
-          // if loader threw ENOENT, serve the nearest +not-found page
-          if (pageResult.isEnoent) {
-            const nfPath = findNearestNotFoundPath(loaderProps?.path || '/')
-            const nfHtml = routeMap[nfPath]
-            if (nfHtml) {
-              try {
-                const html = await readFile(
-                  join(process.cwd(), `${outDir}/client`, nfHtml),
-                  'utf-8'
-                )
-                return new Response(html, {
-                  headers: { 'content-type': 'text/html' },
-                  status: 404,
-                })
-              } catch {}
-            }
-            return new Response('404 Not Found', { status: 404 })
-          }
+          const loadersStart = timing ? performance.now() : 0
+          const { pageResult, matches, hasLoaderError } = await runRouteLoaders(
+            route,
+            buildInfo.serverJsPath,
+            loaderProps
+          )
+          if (timing) addPhase(timing, 'loaders', loadersStart)
 
-          // build matches array (layouts + page)
-          const matchPathname = loaderProps?.path || '/'
-          const matchParams = loaderProps?.params || {}
-          const matches: One.RouteMatch[] = new Array(layoutResults.length + 1)
-          for (let i = 0; i < layoutResults.length; i++) {
-            const result = layoutResults[i]
-            matches[i] = {
-              routeId: result.routeId,
-              pathname: matchPathname,
-              params: matchParams,
-              loaderData: result.loaderData,
-            }
+          // a failed loader renders without its data, don't keep that around
+          if (hasLoaderError || isResponse(pageResult.loaderData)) {
+            ssrCacheKey = undefined
+          } else if (cachesHtml && !ssrCacheKey) {
+            ssrCacheKey = getSSRCacheKey(route, loaderProps)
           }
-          matches[layoutResults.length] = {
-            routeId: pageResult.routeId,
-            pathname: matchPathname,
-            params: matchParams,
-            loaderData: pageResult.loaderData,
+
+          // if loader threw ENOENT, serve the nearest +not-found page
+          if (pageResult.isEnoent) {
+            return await respondWithNotFoundPage(request, loaderProps?.path || '/')
           }
 
           // for backwards compat, loaderData is still the page's loader data
           const loaderData = pageResult.loaderData
 
-          // populate per-loader WeakMap so layout useLoader gets correct data
-          for (const layout of layoutRoutes) {
-            const key = layout.contextKey
-            const loaderFn = loaderCache.get(key)
-            if (loaderFn) {
-              const result = layoutResults.find((r) => r.routeId === key)
-              if (result) {
-                setSSRLoaderData(loaderFn, result.loaderData)
-              }
-            }
-          }
-          const pageLoaderFn = loaderCache.get(route.file)
-          if (pageLoaderFn) {
-            setSSRLoaderData(pageLoaderFn, pageResult.loaderData)
-          }
-
           // prepare router for this SSR render (lightweight version bump)
           globalThis['__vxrnresetState']?.()
 
@@ -536,25 +595,38 @@ export async function oneServe(
             matches,
           }
 
-          const _rl = ensureRenderLoaded()
-          if (_rl) await _rl
+          // the render pool loads the entry on its own threads
+          const _rl = renderPool?.running ? undefined : ensureRenderLoaded()
+          if (_rl) {
+            const renderLoadStart = timing ? performance.now() : 0
+            await _rl
+            if (timing) addPhase(timing, 'renderLoad', renderLoadStart)
+          }
 
-          const status = route.isNotFound ? 404 : 200
-          // use ssrHtmlHeaders (includes cache-control: no-cache) to avoid
-          // per-response header mutation in the Hono handler
-          const responseHeaders = route.isNotFound ? htmlHeaders : ssrHtmlHeaders
+          const renderStart = timing ? performance.now() : 0
 
           // streaming SSR by default, fall back to buffered with ONE_BUFFERED_SSR=1
           if (useStreaming) {
-            const stream = await renderStream!(renderProps)
+            let stream = await renderHtml(renderProps, true)
+            if (timing) addPhase(timing, 'render', renderStart)
+            const cachedHeaders = ssrCacheKey && (await getCacheableHeaders())
+            if (ssrCacheKey && cachedHeaders) {
+              const { key, ttl } = ssrCacheKey
+              stream = ssrCache!.tee(key, stream, ttl, cachedHeaders)
+            }
             return new Response(stream, {
               headers: responseHeaders,
               status,
             })
           }
 
-          // render is guaranteed loaded after ensureRenderLoaded above
-          const rendered = await render!(renderProps)
+          const rendered = await renderHtml(renderProps, false)
+          if (timing) addPhase(timing, 'render', renderStart)
+
+          const cachedHeaders = ssrCacheKey && (await getCacheableHeaders())
+          if (ssrCacheKey && cachedHeaders && typeof rendered === 'string') {
+            ssrCache!.set(ssrCacheKey.key, rendered, ssrCacheKey.ttl, cachedHeaders)
+          }
 
           return new Response(rendered, {
             headers: responseHeaders,
@@ -565,6 +637,9 @@ export async function oneServe(
           if (isResponse(err)) {
             return err
           }
+          if (err instanceof RenderPoolBusyError) {
+            return renderPoolBusyResponse()
+          }
 
           console.error(`[one] Error rendering SSR route ${route.file}
 
@@ -586,6 +661,7 @@ url: ${url}`)
         if (needsSpaShell) {
           try {
             // run layout loaders only (page content is client-rendered)
+            const loadersStart = timing ? performance.now() : 0
             const layoutResults = await Promise.all(
               layoutRoutes.map((layout: any) => {
                 const serverPath = layout.loaderServerPath || layout.contextKey
@@ -597,6 +673,7 @@ url: ${url}`)
                 )
               })
             )
+            if (timing) addPhase(timing, 'loaders', loadersStart)
 
             const matches: One.RouteMatch[] = layoutResults.map((result) => ({
               routeId: result.routeId,
@@ -607,21 +684,30 @@ url: ${url}`)
 
             globalThis['__vxrnresetState']?.()
 
-            const _rl3 = ensureRenderLoaded()
-            if (_rl3) await _rl3
-            const rendered = await render!({
-              mode: 'spa-shell',
-              // don't pass loaderData for spa-shell - the page loader runs on client
-              // passing {} here would make useLoaderState think data is preloaded
-              loaderData: undefined,
-              loaderProps,
-              path: loaderProps?.path || '/',
-              preloads: buildInfo?.criticalPreloads || buildInfo?.preloads,
-              deferredPreloads: buildInfo?.deferredPreloads,
-              css: buildInfo?.css,
-              cssContents: buildInfo?.cssContents,
-              matches,
-            })
+            const _rl3 = renderPool?.running ? undefined : ensureRenderLoaded()
+            if (_rl3) {
+              const renderLoadStart = timing ? performance.now() : 0
+              await _rl3
+              if (timing) addPhase(timing, 'renderLoad', renderLoadStart)
+            }
+            const renderStart = timing ? performance.now() : 0
+            const rendered = await renderHtml(
+              {
+                mode: 'spa-shell',
+                // don't pass loaderData for spa-shell - the page loader runs on client
+                // passing {} here would make useLoaderState think data is preloaded
+                loaderData: undefined,
+                loaderProps,
+                path: loaderProps?.path || '/',
+                preloads: buildInfo?.criticalPreloads || buildInfo?.preloads,
+                deferredPreloads: buildInfo?.deferredPreloads,
+                css: buildInfo?.css,
+                cssContents: buildInfo?.cssContents,
+                matches,
+              },
+              false
+            )
+            if (timing) addPhase(timing, 'render', renderStart)
 
             return new Response(rendered, {
               headers: htmlHeaders,
@@ -631,12 +717,39 @@ url: ${url}`)
             if (isResponse(err)) {
               return err
             }
+            if (err instanceof RenderPoolBusyError) {
+              return renderPoolBusyResponse()
+            }
             console.error(
               `[one] Error rendering spa-shell for ${route.file}\n${err?.['stack'] ?? err}\nurl: ${url}`
             )
           }
         }
 
+        // ssg routes with revalidate serve their latest render, a miss on a
+        // prebuilt path falls through to the built html below
+        if (isr && isISRRoute(route)) {
+          const prebuilt =
+            !!routeMap[url.pathname] || Object.keys(route.routeKeys).length === 0
+          try {
+            const page = await isr.getPage(
+              route,
+              url.pathname,
+              loaderProps?.params || {},
+              { prebuilt }
+            )
+            if (page) {
+              return isResponse(page)
+                ? page
+                : new Response(page.html, { headers: htmlHeaders })
+            }
+          } catch (err) {
+            console.error(
+              `[one] Error rendering ssg route ${route.file}\n${err?.['stack'] ?? err}\nurl: ${url}`
+            )
+          }
+        }
+
         // for SPA routes (not SSR), look up the HTML file
         const isDynamicRoute = Object.keys(route.routeKeys).length > 0
         // for dynamic SPA routes, use the parameterized path to look up the single HTML file
@@ -657,6 +770,12 @@ url: ${url}`)
             : routeMap[url.pathname] || routeMap[buildInfo?.cleanPath]
 
         if (htmlPath) {
+          const cached = await htmlCache?.get(htmlPath)
+          if (timing && htmlCache) markCache(timing, 'html', cached ? 'hit' : 'miss')
+          if (cached) {
+            return htmlCache!.respond(cached, request, route.isNotFound ? 404 : 200)
+          }
+
           const html = await readStaticHtml(htmlPath, outDir)
 
           if (html) {
@@ -676,12 +795,18 @@ url: ${url}`)
           const notFoundHtmlPath = routeMap[notFoundRoute]
 
           if (notFoundHtmlPath) {
+            // inject 404 marker so client knows this is a 404 response
+            // this prevents hydration mismatch when the URL matches a dynamic route
+            const notFoundMarker = `<script>window.__one404=${JSON.stringify({ originalPath: url.pathname, notFoundPath: notFoundRoute })}</script>`
+
+            const cached = await htmlCache?.get(notFoundHtmlPath)
+            if (cached) {
+              return htmlCache!.respondNotFound(cached, notFoundMarker)
+            }
+
             const notFoundHtml = await readStaticHtml(notFoundHtmlPath, outDir)
 
             if (notFoundHtml) {
-              // inject 404 marker so client knows this is a 404 response
-              // this prevents hydration mismatch when the URL matches a dynamic route
-              const notFoundMarker = `<script>window.__one404=${JSON.stringify({ originalPath: url.pathname, notFoundPath: notFoundRoute })}</script>`
               // inject before </head> or at start of <body>
               const injectedHtml = notFoundHtml.includes('</head>')
                 ? notFoundHtml.replace('</head>', `${notFoundMarker}</head>`)
@@ -713,6 +838,9 @@ url: ${url}`)
     return async (context, next) => {
       try {
         const request = context.req.raw
+        const timing = getRequestTiming(request)
+        // hono matched the route before calling this handler
+        if (timing) timing.phases.match ??= performance.now() - timing.start
 
         if (isDynamicOrNotFound) {
           // Static assets should have the highest priority - which is the behavior of the dev server.
@@ -753,6 +881,7 @@ url: ${url}`)
           if (debugRouter) {
             console.info(`[one] ⚡ ${reqPath} → matched page route: ${route.page} (ssr)`)
           }
+          setRequestRoute(request, route.page, 'page')
           const pathname = reqPath
           // extract search from raw URL (after ?)
           const rawUrl = request.url
@@ -820,7 +949,12 @@ url: ${url}`)
 
             // for ssg routes with dynamic params, check if this path was statically generated
             // if not in routeMap, the slug wasn't in generateStaticParams - return 404
-            if (route.type === 'ssg' && Object.keys(route.routeKeys).length > 0) {
+            // (unless the route has revalidate, then handleLoader renders it on demand)
+            if (
+              route.type === 'ssg' &&
+              Object.keys(route.routeKeys).length > 0 &&
+              !isISRRoute(route)
+            ) {
               if (!routeMap[originalUrl]) {
                 return new Response(
                   make404LoaderJs(originalUrl, 'ssg route not in routeMap'),
@@ -835,6 +969,7 @@ url: ${url}`)
             // preserve query params (platform=ios, etc.) for native CJS conversion
             finalUrl.search = url.search
             const cleanedRequest = new Request(finalUrl, request)
+            forwardRequestTiming(request, cleanedRequest)
             return resolveLoaderRoute(requestHandlers, cleanedRequest, finalUrl, route)
           }
 
@@ -920,8 +1055,6 @@ url: ${url}`)
     }
   }
 
-  const compiledManifest = compileManifest(buildInfo.manifest)
-
   for (const route of compiledManifest.apiRoutes) {
     app.get(route.urlPath, createHonoHandler(route))
     app.on('HEAD', route.urlPath, createHonoHandler(route))
@@ -982,21 +1115,18 @@ url: ${url}`)
       const url = getURLfromRequestURL(request)
       const originalUrl = getPathFromLoaderPath(c.req.path)
 
-      for (const route of compiledManifest.pageRoutes) {
-        if (route.file === '') {
-          // ignore not found route
-          continue
-        }
-
-        if (!route.compiledRegex.test(originalUrl)) {
-          continue
-        }
+      const timing = getRequestTiming(request)
+      const matchStart = timing ? performance.now() : 0
+      const route = compiledManifest.pageMatcher.match(originalUrl, hasRouteFile)?.route
+      if (timing) addPhase(timing, 'match', matchStart)
 
+      if (route) {
         // for ssg routes with dynamic params, check if this path was statically generated
         if (
           route.type === 'ssg' &&
           Object.keys(route.routeKeys).length > 0 &&
-          !routeMap[originalUrl]
+          !routeMap[originalUrl] &&
+          !isISRRoute(route)
         ) {
           c.header('Content-Type', 'text/javascript')
           c.status(200)
@@ -1014,6 +1144,7 @@ url: ${url}`)
         // preserve query params (platform=ios, etc.) for native CJS conversion
         finalUrl.search = url.search
         const cleanedRequest = new Request(finalUrl, request)
+        forwardRequestTiming(request, cleanedRequest)
 
         try {
           const resolved = await resolveLoaderRoute(
@@ -1039,4 +1170,12 @@ url: ${url}`)
 
     return next()
   })
+
+  return {
+    /** stops the render pool threads, call it once the server has closed */
+    async close() {
+      isr?.dispose()
+      await renderPool?.terminate()
+    },
+  }
 }
@@ -0,0 +1,190 @@
+import { mkdtempSync, rmSync, writeFileSync } from 'node:fs'
+import { tmpdir } from 'node:os'
+import { join } from 'node:path'
+import { afterEach, beforeAll, describe, expect, it } from 'vitest'
+import {
+  getRenderPoolOptions,
+  RenderPoolBusyError,
+  type RenderPoolOptions,
+  type RenderResult,
+  RenderWorkerPool,
+} from './renderPool'
+
+// speaks the renderWorker.ts protocol: html is `<threadId>:<path>`, streams send
+// ten chunks with two of them in flight, '/crash' exits the thread
+const fakeWorker = `
+import { parentPort, threadId } from 'node:worker_threads'
+
+const flows = new Map()
+
+parentPort.on('message', async (msg) => {
+  const flow = flows.get(msg.id)
+  if (msg.type === 'ack' || msg.type === 'cancel') {
+    if (!flow) return
+    if (msg.type === 'ack') flow.credits += msg.count
+    else flow.cancelled = true
+    flow.wake?.()
+    return
+  }
+
+  const { id, props, stream } = msg
+  if (props.path === '/crash') process.exit(1)
+  const { delay = 0, heapUsed = 0 } = props.loaderData || {}
+  await new Promise((resolve) => setTimeout(resolve, delay))
+
+  if (!stream) {
+    const html = threadId + ':' + props.path
+    parentPort.postMessage({ type: 'html', id, html, headers: [], heapUsed })
+    return
+  }
+
+  parentPort.postMessage({ type: 'start', id, headers: [['x-render', 'worker']] })
+  const state = { credits: 2, cancelled: false }
+  flows.set(id, state)
+  for (let i = 0; i < 10; i++) {
+    while (!state.credits && !state.cancelled) {
+      await new Promise((resolve) => (state.wake = resolve))
+    }
+    if (state.cancelled) break
+    state.credits--
+    const chunk = new TextEncoder().encode(i + ',')
+    parentPort.postMessage({ type: 'chunk', id, chunk }, [chunk.buffer])
+  }
+  flows.delete(id)
+  parentPort.postMessage({ type: 'end', id, heapUsed })
+})
+`
+
+let dir: string
+let workerPath: string
+let pool: RenderWorkerPool | null = null
+
+beforeAll(() => {
+  dir = mkdtempSync(join(tmpdir(), 'one-render-pool-'))
+  workerPath = join(dir, 'renderWorker.mjs')
+  writeFileSync(workerPath, fakeWorker)
+  return () => rmSync(dir, { recursive: true, force: true })
+})
+
+afterEach(async () => {
+  await pool?.terminate()
+  pool = null
+  delete process.env.ONE_RENDER_WORKERS
+  delete process.env.ONE_CLUSTER_SIZE
+})
+
+function createPool(options: Partial<RenderPoolOptions> = {}) {
+  pool = new RenderWorkerPool(
+    { ...getRenderPoolOptions({ workers: 1 })!, ...options },
+    { entry: '', outDir: 'dist' },
+    workerPath
+  )
+  return pool
+}
+
+function render(path: string, loaderData?: { delay?: number; heapUsed?: number }) {
+  return pool!.render({ props: { mode: 'ssr', path, loaderData }, stream: false })
+}
+
+function getHtml(result: RenderResult) {
+  if (result.type !== 'html') throw new Error(`expected html, got ${result.type}`)
+  return result.html
+}
+
+describe('getRenderPoolOptions', () => {
+  it('is off unless configured', () => {
+    expect(getRenderPoolOptions(undefined)).toBe(null)
+    expect(getRenderPoolOptions(false)).toBe(null)
+  })
+
+  it('fills in defaults', () => {
+    expect(getRenderPoolOptions(3)).toEqual({
+      workers: 3,
+      concurrency: 8,
+      maxQueue: 24,
+      maxRequests: Number.POSITIVE_INFINITY,
+      maxMemoryMB: Number.POSITIVE_INFINITY,
+      loaders: 'main',
+    })
+    expect(getRenderPoolOptions(true)!.workers).toBeGreaterThanOrEqual(1)
+  })
+
+  it('lets ONE_RENDER_WORKERS set the worker count or turn it off', () => {
+    process.env.ONE_RENDER_WORKERS = '2'
+    expect(getRenderPoolOptions(undefined)!.workers).toBe(2)
+    expect(getRenderPoolOptions({ workers: 6, loaders: 'worker' })).toMatchObject({
+      workers: 2,
+      loaders: 'worker',
+    })
+    process.env.ONE_RENDER_WORKERS = '0'
+    expect(getRenderPoolOptions({ workers: 6 })).toBe(null)
+  })
+
+  it('splits the default worker count between cluster processes', () => {
+    const single = getRenderPoolOptions(true)!.workers
+    process.env.ONE_CLUSTER_SIZE = '2'
+    expect(getRenderPoolOptions(true)!.workers).toBeLessThanOrEqual(single)
+    process.env.ONE_CLUSTER_SIZE = '1000'
+    expect(getRenderPoolOptions(true)!.workers).toBe(1)
+    // an explicit count is per process
+    expect(getRenderPoolOptions(3)!.workers).toBe(3)
+  })
+})
+
+describe('RenderWorkerPool', () => {
+  it('streams chunks as the reader takes them', async () => {
+    createPool()
+    const result = await pool!.render({ props: { mode: 'ssr', path: '/' }, stream: true })
+    if (result.type !== 'stream') throw new Error(`expected stream, got ${result.type}`)
+    expect(result.headers).toEqual([['x-render', 'worker']])
+
+    const html = await new Response(result.stream).text()
+    expect(html).toBe('0,1,2,3,4,5,6,7,8,9,')
+  })
+
+  it('stops a stream the reader cancelled', async () => {
+    createPool({ concurrency: 1 })
+    const result = await pool!.render({ props: { mode: 'ssr', path: '/' }, stream: true })
+    if (result.type !== 'stream') throw new Error(`expected stream, got ${result.type}`)
+
+    const reader = result.stream.getReader()
+    await reader.read()
+    await reader.cancel()
+    // the only slot is free again once the worker ended the render
+    expect(getHtml(await render('/next'))).toMatch(/:\/next$/)
+  })
+
+  it('refuses renders once the queue is full', async () => {
+    createPool({ concurrency: 1, maxQueue: 1 })
+    const first = render('/a', { delay: 50 })
+    const second = render('/b')
+    await expect(render('/c')).rejects.toBeInstanceOf(RenderPoolBusyError)
+    expect(getHtml(await first)).toMatch(/:\/a$/)
+    expect(getHtml(await second)).toMatch(/:\/b$/)
+  })
+
+  it('replaces workers after maxRequests renders', async () => {
+    createPool({ maxRequests: 2 })
+    const threads: string[] = []
+    for (const path of ['/1', '/2', '/3', '/4']) {
+      threads.push(getHtml(await render(path)).split(':')[0])
+    }
+    expect(threads[0]).toBe(threads[1])
+    expect(threads[2]).toBe(threads[3])
+    expect(threads[2]).not.toBe(threads[1])
+    expect(pool!.size).toBe(1)
+  })
+
+  it('replaces workers whose heap grew past maxMemoryMB', async () => {
+    createPool({ maxMemoryMB: 1 })
+    const first = getHtml(await render('/1', { heapUsed: 2 * 1024 * 1024 }))
+    const second = getHtml(await render('/2'))
+    expect(second.split(':')[0]).not.toBe(first.split(':')[0])
+  })
+
+  it('fails the renders of a crashed worker and replaces it', async () => {
+    createPool()
+    await expect(render('/crash')).rejects.toThrow('Worker exited')
+    expect(getHtml(await render('/after'))).toMatch(/:\/after$/)
+  })
+})
@@ -0,0 +1,426 @@
+/**
+ * Worker thread pool for ssr renders, enabled with `server.renderWorkers`.
+ *
+ * Each worker imports the server entry and renders pages with it, so a slow
+ * render doesn't hold up other requests on the main thread. Streamed html comes
+ * back in transferred buffers and is flow controlled: a worker sends a few
+ * chunks ahead and then waits until the response reader takes them.
+ *
+ * Renders wait in a bounded queue when every worker is busy, past that they're
+ * refused with RenderPoolBusyError so the server answers 503 instead of piling
+ * up work. Workers are replaced after a number of renders or once their heap
+ * grows past a limit.
+ */
+import { availableParallelism } from 'node:os'
+import { dirname, join } from 'node:path'
+import { fileURLToPath } from 'node:url'
+import { Worker } from 'node:worker_threads'
+import type { LoaderProps, RenderAppProps } from '../types'
+import type { One } from '../vite/types'
+import type { LoaderRoute } from './routeLoaders'
+
+export type RenderWorkersOption = NonNullable<
+  NonNullable<One.PluginOptions['server']>['renderWorkers']
+>
+
+export type RenderPoolOptions = {
+  workers: number
+  concurrency: number
+  maxQueue: number
+  maxRequests: number
+  maxMemoryMB: number
+  loaders: 'main' | 'worker'
+}
+
+export type RenderWorkerData = {
+  /** file url of the server entry */
+  entry: string
+  outDir: string
+}
+
+export type RenderTask = {
+  props: RenderAppProps
+  stream: boolean
+  /** set to run the page and layout loaders in the worker */
+  loaders?: { route: LoaderRoute; serverJsPath?: string }
+}
+
+// headers set during the render, set-cookie values are kept apart
+export type HeaderEntries = [string, string][]
+
+export type RenderResult =
+  | { type: 'stream'; stream: ReadableStream<Uint8Array>; headers: HeaderEntries }
+  | { type: 'html'; html: string; headers: HeaderEntries }
+  /** a response returned or thrown by a loader, like a redirect */
+  | { type: 'response'; response: Response }
+  /** a loader failed with ENOENT */
+  | { type: 'not-found' }
+
+export type SerializedRequest = {
+  url: string
+  method: string
+  headers: HeaderEntries
+}
+
+// the request of the loader props is posted as plain data
+export type SerializedRenderProps = Omit<RenderAppProps, 'loaderProps'> & {
+  loaderProps?: Omit<LoaderProps, 'request'> & { request?: SerializedRequest }
+}
+
+// messages posted to a worker
+export type RenderWorkerTask = {
+  type: 'render'
+  id: number
+  props: SerializedRenderProps
+  stream: boolean
+  loaders?: RenderTask['loaders']
+}
+
+export type RenderWorkerRequest =
+  | RenderWorkerTask
+  | { type: 'ack'; id: number; count: number }
+  | { type: 'cancel'; id: number }
+
+// messages posted back, every one but start and chunk ends the render and
+// carries the heap size of the worker
+export type RenderWorkerResponse =
+  | { type: 'start'; id: number; headers: HeaderEntries }
+  | { type: 'chunk'; id: number; chunk: Uint8Array }
+  | ({ id: number; heapUsed: number } & (
+      | { type: 'end' }
+      | { type: 'html'; html: string; headers: HeaderEntries }
+      | { type: 'response'; status: number; headers: HeaderEntries; body: string | null }
+      | { type: 'not-found' }
+      | { type: 'error'; error: string; stack?: string }
+    ))
+
+export class RenderPoolBusyError extends Error {
+  constructor() {
+    super('[one] render queue is full')
+    this.name = 'RenderPoolBusyError'
+  }
+}
+
+/**
+ * Resolves `server.renderWorkers`, `ONE_RENDER_WORKERS` sets the worker count
+ * and `ONE_RENDER_WORKERS=0` turns the pool off.
+ */
+export function getRenderPoolOptions(
+  setting: RenderWorkersOption | undefined
+): RenderPoolOptions | null {
+  const env = process.env.ONE_RENDER_WORKERS
+  if (env === '0' || env === 'false') return null
+  if (!setting && !env) return null
+
+  const config: Exclude<RenderWorkersOption, boolean | number> =
+    typeof setting === 'object' ? setting : {}
+  const workers =
+    Number(env) ||
+    (typeof setting === 'number' ? setting : config.workers) ||
+    getDefaultWorkerCount()
+  const concurrency = config.concurrency ?? 8
+
+  return {
+    workers,
+    concurrency,
+    maxQueue: config.maxQueue ?? workers * concurrency,
+    maxRequests: config.maxRequests ?? Number.POSITIVE_INFINITY,
+    maxMemoryMB: config.maxMemoryMB ?? Number.POSITIVE_INFINITY,
+    loaders: config.loaders ?? 'main',
+  }
+}
+
+// one less than the cores, the main thread takes the last one. `one serve
+// --cluster` sets ONE_CLUSTER_SIZE and each process gets its share of the cores
+function getDefaultWorkerCount() {
+  const processes = Number(process.env.ONE_CLUSTER_SIZE) || 1
+  return Math.max(1, Math.floor(availableParallelism() / processes) - 1)
+}
+
+export function serializeRequest(request: Request): SerializedRequest {
+  return {
+    url: request.url,
+    method: request.method,
+    headers: getHeaderEntries(request.headers),
+  }
+}
+
+export function getHeaderEntries(headers: Headers): HeaderEntries {
+  const entries: HeaderEntries = []
+  // Headers.forEach joins set-cookie values into one unparseable string
+  for (const cookie of headers.getSetCookie()) {
+    entries.push(['set-cookie', cookie])
+  }
+  headers.forEach((value, key) => {
+    if (key !== 'set-cookie') entries.push([key, value])
+  })
+  return entries
+}
+
+interface Task {
+  msg: RenderWorkerTask
+  resolve: (result: RenderResult) => void
+  reject: (error: Error) => void
+  controller?: ReadableStreamDefaultController<Uint8Array>
+  // chunks enqueued since the worker was last told to send more
+  unacked: number
+  // the reader cancelled the stream, the worker is told to stop
+  cancelled?: boolean
+}
+
+interface PoolWorker {
+  worker: Worker
+  tasks: Map<number, Task>
+  renders: number
+  retiring: boolean
+}
+
+export class RenderWorkerPool {
+  readonly options: RenderPoolOptions
+  private workers: PoolWorker[] = []
+  private queue: Task[] = []
+  private nextId = 0
+  private terminated = false
+  private recentCrashes = 0
+  private lastCrashTime = 0
+  private workerData: RenderWorkerData
+  private workerPath: string
+
+  constructor(
+    options: RenderPoolOptions,
+    workerData: RenderWorkerData,
+    // use .mjs for proper ESM module resolution in worker threads
+    workerPath = join(dirname(fileURLToPath(import.meta.url)), 'renderWorker.mjs')
+  ) {
+    this.options = options
+    this.workerData = workerData
+    this.workerPath = workerPath
+    for (let i = 0; i < options.workers; i++) {
+      this.spawn()
+    }
+  }
+
+  get size() {
+    return this.workers.filter((w) => !w.retiring).length
+  }
+
+  get queued() {
+    return this.queue.length
+  }
+
+  /** false once terminated, or after workers kept crashing */
+  get running() {
+    return !this.terminated
+  }
+
+  private spawn() {
+    const poolWorker: PoolWorker = {
+      worker: new Worker(this.workerPath, { workerData: this.workerData }),
+      tasks: new Map(),
+      renders: 0,
+      retiring: false,
+    }
+    const { worker } = poolWorker
+
+    worker.on('message', (msg: RenderWorkerResponse) => {
+      const task = poolWorker.tasks.get(msg.id)
+      if (!task) return
+
+      switch (msg.type) {
+        case 'start': {
+          task.resolve({
+            type: 'stream',
+            headers: msg.headers,
+            stream: new ReadableStream<Uint8Array>({
+              start: (controller) => {
+                task.controller = controller
+              },
+              // called whenever the reader wants more, let the worker send
+              // as many chunks as were taken
+              pull: () => {
+                if (!task.unacked || task.cancelled) return
+                worker.postMessage({ type: 'ack', id: msg.id, count: task.unacked })
+                task.unacked = 0
+              },
+              cancel: () => {
+                task.cancelled = true
+                worker.postMessage({ type: 'cancel', id: msg.id })
+              },
+            }),
+          })
+          return
+        }
+        case 'chunk': {
+          if (task.cancelled) return
+          task.unacked++
+          task.controller!.enqueue(msg.chunk)
+          return
+        }
+      }
+
+      poolWorker.tasks.delete(msg.id)
+      poolWorker.renders++
+      if (!poolWorker.tasks.size) worker.unref()
+
+      switch (msg.type) {
+        case 'end': {
+          if (!task.cancelled) task.controller!.close()
+          break
+        }
+        case 'html': {
+          task.resolve({ type: 'html', html: msg.html, headers: msg.headers })
+          break
+        }
+        case 'response': {
+          const { body, status, headers } = msg
+          const response = new Response(body, { status, headers })
+          task.resolve({ type: 'response', response })
+          break
+        }
+        case 'not-found': {
+          task.resolve({ type: 'not-found' })
+          break
+        }
+        case 'error': {
+          const error = new Error(msg.error)
+          if (msg.stack) error.stack = msg.stack
+          fail(task, error)
+          break
+        }
+      }
+
+      if (
+        poolWorker.renders >= this.options.maxRequests ||
+        msg.heapUsed > this.options.maxMemoryMB * 1024 * 1024
+      ) {
+        this.retire(poolWorker)
+      }
+      if (poolWorker.retiring && !poolWorker.tasks.size) {
+        worker.terminate()
+      }
+      this.dispatch()
+    })
+
+    worker.on('error', (err) => {
+      console.error('[RenderWorkerPool] Worker error:', err)
+    })
+
+    // a crashed worker fails its renders and is replaced, a retired one has
+    // already been replaced
+    worker.on('exit', () => {
+      this.workers = this.workers.filter((w) => w !== poolWorker)
+      for (const task of poolWorker.tasks.values()) {
+        fail(task, new Error(`[RenderWorkerPool] Worker exited`))
+      }
+      poolWorker.tasks.clear()
+      if (poolWorker.retiring || this.terminated) return
+
+      const now = Date.now()
+      this.recentCrashes = now - this.lastCrashTime < 5000 ? this.recentCrashes + 1 : 1
+      this.lastCrashTime = now
+      if (this.recentCrashes > this.options.workers * 2) {
+        console.error(`[one] too many render worker crashes, stopping the render pool`)
+        this.terminate()
+        return
+      }
+
+      this.spawn()
+      this.dispatch()
+    })
+
+    // only workers with renders in flight keep the process alive, unref after
+    // the listeners are added since adding a message listener refs it again
+    worker.unref()
+    this.workers.push(poolWorker)
+  }
+
+  // stop sending renders to a worker, it exits once its last render is done
+  private retire(poolWorker: PoolWorker) {
+    if (poolWorker.retiring) return
+    poolWorker.retiring = true
+    if (!this.terminated) {
+      this.spawn()
+    }
+  }
+
+  private dispatch() {
+    while (this.queue.length) {
+      // the least busy worker, so renders spread over every core first
+      let target: PoolWorker | undefined
+      for (const poolWorker of this.workers) {
+        if (poolWorker.retiring) continue
+        if (poolWorker.tasks.size >= this.options.concurrency) continue
+        if (!target || poolWorker.tasks.size < target.tasks.size) {
+          target = poolWorker
+        }
+      }
+      if (!target) return
+
+      const task = this.queue.shift()!
+      try {
+        target.worker.postMessage(task.msg)
+      } catch (err) {
+        // props that can't be cloned (functions in loader data), the caller
+        // can render them on the main thread
+        task.reject(err as Error)
+        continue
+      }
+      if (!target.tasks.size) target.worker.ref()
+      target.tasks.set(task.msg.id, task)
+    }
+  }
+
+  render({ props, stream, loaders }: RenderTask): Promise<RenderResult> {
+    if (this.terminated) {
+      return Promise.reject(new Error('Render pool has been terminated'))
+    }
+    if (this.queue.length >= this.options.maxQueue) {
+      return Promise.reject(new RenderPoolBusyError())
+    }
+
+    const { loaderProps, ...rest } = props
+    const request = loaderProps?.request && serializeRequest(loaderProps.request)
+    const msg: RenderWorkerTask = {
+      type: 'render',
+      id: this.nextId++,
+      props: loaderProps ? { ...rest, loaderProps: { ...loaderProps, request } } : rest,
+      stream,
+      // layouts are route nodes, only the fields the loaders use are posted
+      loaders: loaders && {
+        route: {
+          file: loaders.route.file,
+          layouts: loaders.route.layouts?.map(({ contextKey, loaderServerPath }) => ({
+            contextKey,
+            loaderServerPath,
+          })),
+        },
+        serverJsPath: loaders.serverJsPath,
+      },
+    }
+
+    return new Promise((resolve, reject) => {
+      this.queue.push({ msg, resolve, reject, unacked: 0 })
+      this.dispatch()
+    })
+  }
+
+  async terminate() {
+    this.terminated = true
+    const workers = this.workers
+    this.workers = []
+    for (const task of this.queue) {
+      task.reject(new Error('Render pool has been terminated'))
+    }
+    this.queue = []
+    await Promise.all(workers.map((w) => w.worker.terminate()))
+  }
+}
+
+// errors a stream that already started, otherwise rejects the render
+function fail(task: Task, error: Error) {
+  if (task.controller) {
+    if (!task.cancelled) task.controller.error(error)
+  } else {
+    task.reject(error)
+  }
+}
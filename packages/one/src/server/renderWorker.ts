@@ -0,0 +1,184 @@
+/**
+ * Worker thread for ssr renders, see renderPool.ts.
+ */
+import '../polyfills-server'
+
+import { getHeapStatistics } from 'node:v8'
+import { parentPort, workerData } from 'node:worker_threads'
+import type { RenderAppProps } from '../types'
+import { isResponse } from '../utils/isResponse'
+import { asyncHeadersCache, runWithAsyncLocalContext } from '../vite/one-server-only'
+import {
+  getHeaderEntries,
+  type HeaderEntries,
+  type RenderWorkerData,
+  type RenderWorkerRequest,
+  type RenderWorkerResponse,
+  type RenderWorkerTask,
+} from './renderPool'
+import { createServerRouteImporter } from './importServerRoute'
+import { createRouteLoaders } from './routeLoaders'
+
+if (!parentPort) {
+  console.error('Must be run as a worker thread')
+  process.exit(1)
+}
+
+// the environment (VITE_ENVIRONMENT, ONE_CACHE_KEY...) is inherited from the
+// serve process, which sets it up before the pool starts
+const { entry, outDir } = workerData as RenderWorkerData
+const port = parentPort
+
+// chunks sent ahead of the reader before waiting for an ack
+const CHUNK_WINDOW = 8
+
+type Entry = {
+  render: (props: RenderAppProps) => any
+  renderStream: (props: RenderAppProps) => Promise<ReadableStream>
+}
+
+let entryLoading: Promise<Entry> | null = null
+
+function loadEntry() {
+  entryLoading ||= import(entry).then((mod) => mod.default as Entry)
+  return entryLoading
+}
+
+const { runRouteLoaders } = createRouteLoaders({
+  importRoute: createServerRouteImporter({ outDir }),
+})
+
+type Flow = { credits: number; cancelled: boolean; wake: (() => void) | null }
+const flows = new Map<number, Flow>()
+
+const textEncoder = new TextEncoder()
+
+function post(msg: RenderWorkerResponse, transfer?: ArrayBuffer[]) {
+  port.postMessage(msg, transfer)
+}
+
+// headers set with setResponseHeaders during loaders or the render
+function getResponseHeaders(id: object): HeaderEntries {
+  const cache: WeakMap<any, Headers> =
+    globalThis['__vxrnasyncHeadersCache'] ?? asyncHeadersCache
+  const headers = cache.get(id)
+  return headers ? getHeaderEntries(headers) : []
+}
+
+async function pipe(id: number, stream: ReadableStream) {
+  const flow: Flow = { credits: CHUNK_WINDOW, cancelled: false, wake: null }
+  flows.set(id, flow)
+  const reader = stream.getReader()
+  try {
+    while (true) {
+      while (!flow.credits && !flow.cancelled) {
+        await new Promise<void>((resolve) => {
+          flow.wake = resolve
+        })
+      }
+      if (flow.cancelled) {
+        await reader.cancel()
+        return
+      }
+      const { done, value } = await reader.read()
+      if (done) return
+      // copy into a buffer of our own: react enqueues views of buffers it
+      // keeps using, and transferring detaches the whole underlying buffer
+      const chunk: Uint8Array =
+        typeof value === 'string' ? textEncoder.encode(value) : value.slice()
+      flow.credits--
+      post({ type: 'chunk', id, chunk }, [chunk.buffer as ArrayBuffer])
+    }
+  } finally {
+    flows.delete(id)
+  }
+}
+
+async function render({ id, props: serialized, stream, loaders }: RenderWorkerTask) {
+  const { loaderProps, ...rest } = serialized
+  const props: RenderAppProps = rest
+  if (loaderProps) {
+    const { request } = loaderProps
+    props.loaderProps = {
+      ...loaderProps,
+      request: request && new Request(request.url, request),
+    }
+  }
+
+  await runWithAsyncLocalContext(async (alsId) => {
+    if (loaders) {
+      const { pageResult, matches } = await runRouteLoaders(
+        loaders.route,
+        loaders.serverJsPath,
+        props.loaderProps
+      )
+      if (pageResult.isEnoent) {
+        post({ type: 'not-found', id, heapUsed: getHeapUsed() })
+        return
+      }
+      if (isResponse(pageResult.loaderData)) {
+        throw pageResult.loaderData
+      }
+      props.loaderData = pageResult.loaderData
+      props.matches = matches
+    }
+
+    // prepare router for this SSR render (lightweight version bump)
+    globalThis['__vxrnresetState']?.()
+
+    const { render, renderStream } = await loadEntry()
+
+    if (!stream) {
+      const html = await render(props)
+      const headers = getResponseHeaders(alsId)
+      post({ type: 'html', id, html, headers, heapUsed: getHeapUsed() })
+      return
+    }
+
+    const body = await renderStream(props)
+    post({ type: 'start', id, headers: getResponseHeaders(alsId) })
+    await pipe(id, body)
+    post({ type: 'end', id, heapUsed: getHeapUsed() })
+  })
+}
+
+function getHeapUsed() {
+  return getHeapStatistics().used_heap_size
+}
+
+port.on('message', (msg: RenderWorkerRequest) => {
+  if (msg.type === 'render') {
+    render(msg).catch(async (err) => {
+      // responses thrown by loaders (redirects) are sent as they are
+      if (isResponse(err)) {
+        post({
+          type: 'response',
+          id: msg.id,
+          status: err.status,
+          headers: getHeaderEntries(err.headers),
+          body: err.body ? await err.text() : null,
+          heapUsed: getHeapUsed(),
+        })
+        return
+      }
+      post({
+        type: 'error',
+        id: msg.id,
+        error: err instanceof Error ? err.message : String(err),
+        stack: err instanceof Error ? err.stack : undefined,
+        heapUsed: getHeapUsed(),
+      })
+    })
+    return
+  }
+
+  const flow = flows.get(msg.id)
+  if (!flow) return
+  if (msg.type === 'ack') {
+    flow.credits += msg.count
+  } else {
+    flow.cancelled = true
+  }
+  flow.wake?.()
+  flow.wake = null
+})
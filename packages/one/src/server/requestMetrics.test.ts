@@ -0,0 +1,114 @@
+import { afterEach, describe, expect, it } from 'vitest'
+import {
+  addPhase,
+  configureRequestMetrics,
+  getPrometheusMetrics,
+  getRequestTiming,
+  markCache,
+  type RequestMetrics,
+  setRequestMetricsHandler,
+  setRequestRoute,
+  withRequestMetrics,
+} from './requestMetrics'
+
+function collectMetrics() {
+  const reported: RequestMetrics[] = []
+  setRequestMetricsHandler((metrics) => {
+    reported.push(metrics)
+  })
+  return reported
+}
+
+afterEach(() => {
+  setRequestMetricsHandler(null)
+})
+
+describe('request metrics', () => {
+  it('does nothing until a server turns it on', () => {
+    expect(configureRequestMetrics(undefined)).toEqual({
+      enabled: false,
+      prometheusPath: null,
+    })
+    expect(getRequestTiming(new Request('http://localhost/'))).toBeUndefined()
+  })
+
+  it('times phases and reports once the body was sent', async () => {
+    const reported = collectMetrics()
+    expect(configureRequestMetrics(true).enabled).toBe(true)
+
+    const handler = withRequestMetrics(async (request: Request) => {
+      const timing = getRequestTiming(request)!
+      setRequestRoute(request, '/blog/[slug]', 'page')
+      addPhase(timing, 'loaders', performance.now() - 5)
+      markCache(timing, 'ssr', 'miss')
+      return new Response('<p>hi</p>', { headers: { 'content-type': 'text/html' } })
+    })
+
+    const response = await handler(new Request('http://localhost/blog/a?x=1'))
+    const header = response.headers.get('server-timing')!
+    expect(header.startsWith('loaders;dur=')).toBe(true)
+    expect(header.includes('ssr-cache;desc=miss')).toBe(true)
+    expect(response.headers.get('content-type')).toBe('text/html')
+
+    // nothing is reported before the body is read
+    expect(reported).toHaveLength(0)
+    expect(await response.text()).toBe('<p>hi</p>')
+
+    expect(reported).toHaveLength(1)
+    expect(reported[0]).toMatchObject({
+      method: 'GET',
+      path: '/blog/a',
+      route: '/blog/[slug]',
+      type: 'page',
+      status: 200,
+      cache: { ssr: 'miss' },
+    })
+    expect(reported[0].phases.loaders! >= 5).toBe(true)
+    expect(reported[0].firstByteMs! <= reported[0].totalMs).toBe(true)
+  })
+
+  it('skips requests no route handled', async () => {
+    const reported = collectMetrics()
+    configureRequestMetrics(true)
+
+    const handler = withRequestMetrics(async () => new Response('static'))
+    const response = await handler(new Request('http://localhost/favicon.ico'))
+    expect(response.headers.get('server-timing')).toBeNull()
+    await response.text()
+    expect(reported).toHaveLength(0)
+  })
+
+  it('keeps a cache miss once any lookup missed', async () => {
+    configureRequestMetrics(true)
+    const handler = withRequestMetrics(async (request: Request) => {
+      const timing = getRequestTiming(request)!
+      markCache(timing, 'loader', 'hit')
+      markCache(timing, 'loader', 'miss')
+      markCache(timing, 'loader', 'hit')
+      return timing.cache.loader
+    })
+    expect(await handler(new Request('http://localhost/'))).toBe('miss')
+  })
+
+  it('writes latency histograms per route', async () => {
+    const { prometheusPath } = configureRequestMetrics({
+      serverTiming: false,
+      prometheus: true,
+    })
+    expect(prometheusPath).toBe('/__one/metrics')
+
+    const handler = withRequestMetrics(async (request: Request) => {
+      setRequestRoute(request, '/api/"quoted"', 'api')
+      return new Response(null, { status: 204 })
+    })
+    const response = await handler(new Request('http://localhost/api/x'))
+    expect(response.headers.get('server-timing')).toBeNull()
+
+    const text = getPrometheusMetrics()
+    const labels = 'route="/api/\\"quoted\\"",type="api",status="204"'
+    const bucket = `one_request_duration_seconds_bucket{${labels},le="10"} 1`
+    expect(text.includes(bucket)).toBe(true)
+    expect(text.includes(`one_request_duration_seconds_count{${labels}} 1`)).toBe(true)
+    expect(text.includes('# TYPE one_request_duration_seconds histogram')).toBe(true)
+  })
+})
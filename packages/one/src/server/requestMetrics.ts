@@ -0,0 +1,409 @@
+import { isResponse } from '../utils/isResponse'
+import type { One } from '../vite/types'
+
+/**
+ * Per-request phase timing for the production servers and the dev server.
+ *
+ * Enabled with `server.metrics`, or by registering a handler with
+ * `setRequestMetricsHandler` before the server is created. When neither is set
+ * the servers don't wrap anything and every helper below returns after a single
+ * boolean check.
+ *
+ * Timings are kept per Request in a WeakMap, the same way the url of a request
+ * is cached, so they can be recorded anywhere a handler has the request without
+ * threading an extra argument through RequestHandlers.
+ */
+
+export type RequestPhase =
+  /** route matching */
+  | 'match'
+  /** importing middleware modules */
+  | 'middlewareLoad'
+  /** running the middleware chain, excluding what it wraps */
+  | 'middleware'
+  /** layout and page loaders */
+  | 'loaders'
+  /** importing the server render entry, only on cold starts */
+  | 'renderLoad'
+  /** full render, or until the shell is ready when streaming */
+  | 'render'
+
+export type CacheResult = 'hit' | 'miss'
+
+export type RequestMetrics = {
+  method: string
+  path: string
+  /** route pattern, e.g. `/blog/[slug]` */
+  route: string
+  type: 'page' | 'loader' | 'api'
+  status: number
+  /** ms per phase, phases that didn't run are left out */
+  phases: Partial<Record<RequestPhase, number>>
+  /** which server caches answered the request */
+  cache: {
+    /** a `loaderCache` key reused a pending or cached loader result */
+    loader?: CacheResult
+    /** `server.ssrCache` */
+    ssr?: CacheResult
+    /** `server.htmlCache` */
+    html?: CacheResult
+  }
+  /** ms until the response (headers) was ready */
+  responseMs: number
+  /** ms until the first body chunk was sent, undefined without a body */
+  firstByteMs?: number
+  /** ms until the body was fully sent or the client went away */
+  totalMs: number
+  /** the client cancelled the body before it was fully sent */
+  aborted?: boolean
+}
+
+export type RequestTiming = {
+  start: number
+  method: string
+  path: string
+  route?: string
+  type?: RequestMetrics['type']
+  phases: RequestMetrics['phases']
+  cache: RequestMetrics['cache']
+}
+
+export type RequestMetricsOptions = NonNullable<One.PluginOptions['server']>['metrics']
+
+type RequestMetricsHandler = (metrics: RequestMetrics) => void
+
+export const DEFAULT_PROMETHEUS_PATH = '/__one/metrics'
+
+let _handler: RequestMetricsHandler | null = null
+let _serverTiming = false
+let _prometheus = false
+// set once a server is created with metrics on, checked before any WeakMap access
+let _active = false
+
+const timings = new WeakMap<Request, RequestTiming>()
+
+/**
+ * Called once per request after its body was sent. Register it before the
+ * server is created, e.g. at the top of a custom server or worker entry.
+ */
+export function setRequestMetricsHandler(handler: RequestMetricsHandler | null) {
+  _handler = handler
+}
+
+/**
+ * Applies `server.metrics`, returns whether requests should be timed. Also
+ * returns the Prometheus path when that endpoint is on.
+ */
+export function configureRequestMetrics(options: RequestMetricsOptions | undefined): {
+  enabled: boolean
+  prometheusPath: string | null
+} {
+  const config: Exclude<RequestMetricsOptions, boolean | undefined> =
+    typeof options === 'object' ? options : {}
+  _serverTiming = !!options && config.serverTiming !== false
+  _prometheus = !!config.prometheus
+  const enabled = !!options || !!_handler
+  if (enabled) _active = true
+  return {
+    enabled,
+    prometheusPath: config.prometheus
+      ? typeof config.prometheus === 'string'
+        ? config.prometheus
+        : DEFAULT_PROMETHEUS_PATH
+      : null,
+  }
+}
+
+export function getRequestTiming(
+  request: Request | undefined
+): RequestTiming | undefined {
+  if (!_active || !request) return
+  return timings.get(request)
+}
+
+// handlers that rebuild the request (loader urls) keep timing the original one
+export function forwardRequestTiming(from: Request, to: Request) {
+  if (!_active) return
+  const timing = timings.get(from)
+  if (timing) timings.set(to, timing)
+}
+
+export function setRequestRoute(
+  request: Request,
+  route: string,
+  type: RequestMetrics['type']
+) {
+  const timing = getRequestTiming(request)
+  if (timing) {
+    timing.route = route
+    timing.type = type
+  }
+}
+
+// adds the time since startedAt to a phase, phases that run more than once add up
+export function addPhase(timing: RequestTiming, phase: RequestPhase, startedAt: number) {
+  const ms = performance.now() - startedAt
+  timing.phases[phase] = (timing.phases[phase] || 0) + ms
+  return ms
+}
+
+// a request only counts as a hit when every lookup of that cache hit
+export function markCache(
+  timing: RequestTiming,
+  cache: keyof RequestTiming['cache'],
+  result: CacheResult
+) {
+  if (timing.cache[cache] !== 'miss') {
+    timing.cache[cache] = result
+  }
+}
+
+function round(ms: number) {
+  return Math.round(ms * 100) / 100
+}
+
+function getServerTimingHeader(timing: RequestTiming, responseMs: number) {
+  let header = ''
+  for (const phase in timing.phases) {
+    header += `${phase};dur=${round(timing.phases[phase])}, `
+  }
+  for (const cache in timing.cache) {
+    header += `${cache}-cache;desc=${timing.cache[cache]}, `
+  }
+  return `${header}total;dur=${round(responseMs)}`
+}
+
+function report(
+  timing: RequestTiming,
+  status: number,
+  responseMs: number,
+  firstByteMs: number | undefined,
+  aborted: boolean
+) {
+  const phases: RequestMetrics['phases'] = {}
+  for (const phase in timing.phases) {
+    phases[phase] = round(timing.phases[phase])
+  }
+
+  const metrics: RequestMetrics = {
+    method: timing.method,
+    path: timing.path,
+    route: timing.route!,
+    type: timing.type!,
+    status,
+    phases,
+    cache: timing.cache,
+    responseMs: round(responseMs),
+    firstByteMs: firstByteMs === undefined ? undefined : round(firstByteMs),
+    totalMs: round(performance.now() - timing.start),
+    ...(aborted && { aborted }),
+  }
+
+  if (_prometheus) {
+    recordPrometheus(metrics)
+  }
+
+  if (_handler) {
+    try {
+      _handler(metrics)
+    } catch (err) {
+      console.error(`[one] Error in request metrics handler`, err)
+    }
+  }
+}
+
+// passes the body through, noting the first chunk and the end of the stream
+function timeBody(
+  timing: RequestTiming,
+  body: ReadableStream<Uint8Array>,
+  status: number,
+  responseMs: number
+) {
+  const reader = body.getReader()
+  let firstByteMs: number | undefined
+
+  return new ReadableStream<Uint8Array>({
+    async pull(controller) {
+      try {
+        const { done, value } = await reader.read()
+        if (done) {
+          controller.close()
+          report(timing, status, responseMs, firstByteMs, false)
+          return
+        }
+        firstByteMs ??= performance.now() - timing.start
+        controller.enqueue(value)
+      } catch (err) {
+        controller.error(err)
+        report(timing, status, responseMs, firstByteMs, true)
+      }
+    },
+    cancel(reason) {
+      report(timing, status, responseMs, firstByteMs, true)
+      return reader.cancel(reason)
+    },
+  })
+}
+
+function finishRequestTiming<T>(timing: RequestTiming, reply: T): T {
+  // preload probes, static files and other requests no route handled
+  if (!timing.route) return reply
+
+  const responseMs = performance.now() - timing.start
+
+  if (!isResponse(reply)) {
+    // dev handlers can reply with a string
+    report(timing, reply ? 200 : 404, responseMs, undefined, false)
+    return reply
+  }
+
+  if (!reply.body) {
+    report(timing, reply.status, responseMs, undefined, false)
+    if (!_serverTiming) return reply
+  }
+
+  const headers = new Headers(reply.headers)
+  if (_serverTiming) {
+    headers.set('server-timing', getServerTimingHeader(timing, responseMs))
+  }
+
+  return new Response(
+    reply.body ? timeBody(timing, reply.body, reply.status, responseMs) : null,
+    { status: reply.status, statusText: reply.statusText, headers }
+  ) as T
+}
+
+export function startRequestTiming(request: Request): RequestTiming {
+  const url = request.url
+  const queryIndex = url.indexOf('?')
+  const pathStart = url.indexOf('/', url.indexOf('//') + 2)
+  const timing: RequestTiming = {
+    start: performance.now(),
+    method: request.method,
+    path: url.slice(pathStart, queryIndex === -1 ? undefined : queryIndex),
+    phases: {},
+    cache: {},
+  }
+  timings.set(request, timing)
+  return timing
+}
+
+/**
+ * Wraps a request handler so each request is timed and reported, the returned
+ * response carries the `Server-Timing` header.
+ */
+export function withRequestMetrics<A extends unknown[], R>(
+  handler: (request: Request, ...args: A) => Promise<R>
+) {
+  return async (request: Request, ...args: A): Promise<R> => {
+    const timing = startRequestTiming(request)
+    return finishRequestTiming(timing, await handler(request, ...args))
+  }
+}
+
+/** @internal for hono, which hands over the response after the handler ran */
+export function finishHonoRequestTiming(request: Request, response: Response) {
+  const timing = timings.get(request)
+  return timing ? finishRequestTiming(timing, response) : response
+}
+
+// prometheus
+
+const BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10]
+
+type Histogram = { labels: string; counts: number[]; sum: number; count: number }
+
+const durations = new Map<string, Histogram>()
+const phaseTotals = new Map<string, { labels: string; sum: number; count: number }>()
+const cacheTotals = new Map<string, { labels: string; count: number }>()
+
+function escapeLabel(value: string) {
+  return value.replace(/\\/g, '\\\\').replace(/"/g, '\\"').replace(/\n/g, '\\n')
+}
+
+function recordPrometheus(metrics: RequestMetrics) {
+  const route = `route="${escapeLabel(metrics.route)}",type="${metrics.type}"`
+
+  const key = `${route},status="${metrics.status}"`
+  let histogram = durations.get(key)
+  if (!histogram) {
+    const counts = new Array(BUCKETS.length).fill(0)
+    histogram = { labels: key, counts, sum: 0, count: 0 }
+    durations.set(key, histogram)
+  }
+  const seconds = metrics.totalMs / 1000
+  for (let i = 0; i < BUCKETS.length; i++) {
+    if (seconds <= BUCKETS[i]) histogram.counts[i]++
+  }
+  histogram.sum += seconds
+  histogram.count++
+
+  for (const phase in metrics.phases) {
+    const phaseKey = `${route},phase="${phase}"`
+    let total = phaseTotals.get(phaseKey)
+    if (!total) {
+      total = { labels: phaseKey, sum: 0, count: 0 }
+      phaseTotals.set(phaseKey, total)
+    }
+    total.sum += metrics.phases[phase] / 1000
+    total.count++
+  }
+
+  for (const cache in metrics.cache) {
+    const cacheKey = `cache="${cache}",result="${metrics.cache[cache]}"`
+    let total = cacheTotals.get(cacheKey)
+    if (!total) {
+      total = { labels: cacheKey, count: 0 }
+      cacheTotals.set(cacheKey, total)
+    }
+    total.count++
+  }
+}
+
+/**
+ * Request metrics in the Prometheus text format, served by `server.metrics`
+ * with `prometheus` on. Use it to expose them from a custom server.
+ */
+export function getPrometheusMetrics(): string {
+  const lines = [
+    '# HELP one_request_duration_seconds Time until the response body was sent.',
+    '# TYPE one_request_duration_seconds histogram',
+  ]
+  for (const { labels, counts, sum, count } of durations.values()) {
+    for (let i = 0; i < BUCKETS.length; i++) {
+      const le = BUCKETS[i]
+      lines.push(`one_request_duration_seconds_bucket{${labels},le="${le}"} ${counts[i]}`)
+    }
+    lines.push(`one_request_duration_seconds_bucket{${labels},le="+Inf"} ${count}`)
+    lines.push(`one_request_duration_seconds_sum{${labels}} ${sum}`)
+    lines.push(`one_request_duration_seconds_count{${labels}} ${count}`)
+  }
+
+  lines.push(
+    '# HELP one_request_phase_seconds Time spent per request phase.',
+    '# TYPE one_request_phase_seconds summary'
+  )
+  for (const { labels, sum, count } of phaseTotals.values()) {
+    lines.push(`one_request_phase_seconds_sum{${labels}} ${sum}`)
+    lines.push(`one_request_phase_seconds_count{${labels}} ${count}`)
+  }
+
+  lines.push(
+    '# HELP one_cache_requests_total Requests answered per server cache result.',
+    '# TYPE one_cache_requests_total counter'
+  )
+  for (const { labels, count } of cacheTotals.values()) {
+    lines.push(`one_cache_requests_total{${labels}} ${count}`)
+  }
+
+  return `${lines.join('\n')}\n`
+}
+
+export function createPrometheusResponse() {
+  return new Response(getPrometheusMetrics(), {
+    headers: {
+      'content-type': 'text/plain; version=0.0.4',
+      'cache-control': 'no-store',
+    },
+  })
+}
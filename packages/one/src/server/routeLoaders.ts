@@ -0,0 +1,294 @@
+/**
+ * Route loaders for the production servers.
+ *
+ * Imports route modules on demand, caches their loaders and `loaderCache`
+ * exports, and coalesces concurrent calls that share a cache key. Used by
+ * oneServe, its render workers and the worker handler, which each pass in how
+ * route modules are imported. Nothing here touches node apis.
+ */
+import { isResponse } from '../utils/isResponse'
+import type { One } from '../vite/types'
+import type { RouteNode } from '../router/Route'
+import { getRequestTiming, markCache } from './requestMetrics'
+import { setSSRLoaderData } from './ssrLoaderData'
+
+// Bounded map helper: prevents unbounded memory growth by evicting the oldest
+// entry when the map exceeds the specified maximum size. Uses insertion order
+// (Map preserves insertion order) — the first-inserted entry is evicted first.
+const MODULE_CACHE_MAX = 500
+function setBounded<K, V>(map: Map<K, V>, key: K, value: V, max: number): void {
+  if (map.has(key)) {
+    map.set(key, value)
+    return
+  }
+  if (map.size >= max) {
+    const firstKey = map.keys().next().value
+    if (firstKey !== undefined) map.delete(firstKey as K)
+  }
+  map.set(key, value)
+}
+
+// the parts of a route needed to run its loaders, plain data so the route can
+// be posted to a render worker
+export type LoaderRoute = {
+  file: string
+  layouts?: Pick<RouteNode, 'contextKey' | 'loaderServerPath'>[]
+}
+
+// imports the module of a route, null when there is none
+export type ImportRoute = (
+  serverPath: string | undefined,
+  lazyKey: string | undefined
+) => Promise<any>
+
+export type RouteLoaders = ReturnType<typeof createRouteLoaders>
+
+export function createRouteLoaders({ importRoute }: { importRoute: ImportRoute }) {
+  // cache resolved loader functions directly (not just modules)
+  const loaderCache = new Map<string, Function | null>()
+  const moduleImportCache = new Map<string, any>()
+
+  // loader coalescing via static loaderCache export
+  // when a route exports loaderCache, concurrent requests with the same key share one execution
+  const loaderCacheFnMap = new Map<string, Function | null>()
+  const pendingLoaderResults = new Map<
+    string,
+    { promise: Promise<any>; expires: number }
+  >()
+
+  // resolve a route module's loader - sync on cache hit, async on cold start
+  function resolveLoaderSync(
+    serverPath: string | undefined,
+    lazyKey: string | undefined
+  ): Function | null | Promise<Function | null> {
+    const cacheKey = lazyKey || serverPath || ''
+    const cached = loaderCache.get(cacheKey)
+    if (cached !== undefined) return cached // sync!
+
+    // cold path - async import
+    return (async () => {
+      let routeExported: any
+      if (moduleImportCache.has(cacheKey)) {
+        routeExported = moduleImportCache.get(cacheKey)
+      } else {
+        routeExported = await importRoute(serverPath, lazyKey)
+        setBounded(moduleImportCache, cacheKey, routeExported, MODULE_CACHE_MAX)
+      }
+
+      const loader = routeExported?.loader || null
+      setBounded(loaderCache, cacheKey, loader, MODULE_CACHE_MAX)
+      // also cache loaderCache export for coalescing
+      const loaderCacheFn = routeExported?.loaderCache ?? null
+      setBounded(loaderCacheFnMap, cacheKey, loaderCacheFn, MODULE_CACHE_MAX)
+      return loader
+    })()
+  }
+
+  // shared helper to import a route module and run its loader
+  async function importAndRunLoader(
+    routeId: string,
+    serverPath: string | undefined,
+    lazyKey: string | undefined,
+    loaderProps: any
+  ): Promise<{
+    loaderData: unknown
+    routeId: string
+    isEnoent?: boolean
+    isError?: boolean
+  }> {
+    if (!serverPath && !lazyKey) {
+      return { loaderData: undefined, routeId }
+    }
+
+    // check loaderCache BEFORE resolving the loader (fast path for coalesced requests)
+    const cacheMapKey = lazyKey || serverPath || ''
+    const loaderCacheFn = loaderCacheFnMap.get(cacheMapKey)
+    let coalFullKey: string | undefined
+    let coalTtl = 0
+
+    if (loaderCacheFn) {
+      const cacheResult = loaderCacheFn(loaderProps?.params, loaderProps?.request)
+      const cacheKey = typeof cacheResult === 'string' ? cacheResult : cacheResult?.key
+      coalTtl = typeof cacheResult === 'string' ? 0 : (cacheResult?.ttl ?? 0)
+
+      if (cacheKey != null) {
+        coalFullKey = routeId + '\0' + cacheKey
+        const existing = pendingLoaderResults.get(coalFullKey)
+        const timing = getRequestTiming(loaderProps?.request)
+        // expires=0 means pending or no-TTL (coalesce-only), so !0 is true
+        if (existing && (!existing.expires || Date.now() < existing.expires)) {
+          if (timing) markCache(timing, 'loader', 'hit')
+          // coalesce: reuse pending/cached result (never even resolves the loader fn)
+          const loaderData = await existing.promise
+          return { loaderData, routeId }
+        }
+        if (timing) markCache(timing, 'loader', 'miss')
+      }
+    }
+
+    try {
+      const loaderOrPromise = resolveLoaderSync(serverPath, lazyKey)
+      const loader =
+        loaderOrPromise instanceof Promise ? await loaderOrPromise : loaderOrPromise
+      if (!loader) {
+        return { loaderData: undefined, routeId }
+      }
+
+      // first caller with loaderCache: execute and register for coalescing
+      if (coalFullKey) {
+        const promise = loader(loaderProps)
+        const entry = { promise, expires: 0 }
+        pendingLoaderResults.set(coalFullKey, entry)
+        promise.then(
+          () => {
+            entry.expires = coalTtl > 0 ? Date.now() + coalTtl : 0
+            if (coalTtl <= 0) {
+              Promise.resolve().then(() => pendingLoaderResults.delete(coalFullKey!))
+            }
+          },
+          () => {
+            pendingLoaderResults.delete(coalFullKey!)
+          }
+        )
+
+        const loaderData = await promise
+        return { loaderData, routeId }
+      }
+
+      // no coalescing: run loader directly
+      const loaderData = await loader(loaderProps)
+      return { loaderData, routeId }
+    } catch (err) {
+      if (isResponse(err)) {
+        throw err
+      }
+      if ((err as any)?.code === 'ENOENT') {
+        return { loaderData: undefined, routeId, isEnoent: true }
+      }
+      console.error(`[one] Error running loader for ${routeId}:`, err)
+      return { loaderData: undefined, routeId, isError: true }
+    }
+  }
+
+  // runs layout and page loaders in parallel and builds the matches array.
+  // responses thrown by a loader (redirects) propagate to the caller.
+  async function runRouteLoaders(
+    route: LoaderRoute,
+    serverJsPath: string | undefined,
+    loaderProps: any
+  ) {
+    const layoutRoutes = route.layouts || []
+
+    // fast path: check which layouts actually have loaders (sync on cache hit)
+    // skip importAndRunLoader entirely for layouts with no loader
+    const layoutLoaderPromises: Array<ReturnType<typeof importAndRunLoader>> = []
+    const noLoaderResults: Array<{ loaderData: unknown; routeId: string }> = []
+
+    for (const layout of layoutRoutes) {
+      const serverPath = layout.loaderServerPath || layout.contextKey
+      const cacheKey = layout.contextKey || serverPath || ''
+      const cachedLoader = loaderCache.get(cacheKey)
+
+      if (cachedLoader === null) {
+        // loader already resolved to null - skip the async call entirely
+        noLoaderResults.push({ loaderData: undefined, routeId: layout.contextKey })
+      } else {
+        layoutLoaderPromises.push(
+          importAndRunLoader(
+            layout.contextKey,
+            serverPath,
+            layout.contextKey,
+            loaderProps
+          )
+        )
+      }
+    }
+
+    // run page loader
+    const pageLoaderPromise = importAndRunLoader(
+      route.file,
+      serverJsPath,
+      route.file,
+      loaderProps
+    )
+
+    // wait for all loaders in parallel
+    let layoutResults: Array<{
+      loaderData: unknown
+      routeId: string
+      isEnoent?: boolean
+      isError?: boolean
+    }>
+    let pageResult: Awaited<typeof pageLoaderPromise>
+
+    if (layoutLoaderPromises.length === 0) {
+      // fast path: all layout loaders are null or no layouts
+      layoutResults = noLoaderResults
+      pageResult = await pageLoaderPromise
+    } else {
+      const [asyncLayoutResults, pr] = await Promise.all([
+        Promise.all(layoutLoaderPromises),
+        pageLoaderPromise,
+      ])
+      layoutResults = [...noLoaderResults, ...asyncLayoutResults]
+      pageResult = pr
+    }
+
+    // build matches array (layouts + page)
+    const matchPathname = loaderProps?.path || '/'
+    const matchParams = loaderProps?.params || {}
+    const matches: One.RouteMatch[] = new Array(layoutResults.length + 1)
+    for (let i = 0; i < layoutResults.length; i++) {
+      const result = layoutResults[i]
+      matches[i] = {
+        routeId: result.routeId,
+        pathname: matchPathname,
+        params: matchParams,
+        loaderData: result.loaderData,
+      }
+    }
+    matches[layoutResults.length] = {
+      routeId: pageResult.routeId,
+      pathname: matchPathname,
+      params: matchParams,
+      loaderData: pageResult.loaderData,
+    }
+
+    // populate per-loader WeakMap so layout useLoader gets correct data
+    for (const layout of layoutRoutes) {
+      const key = layout.contextKey
+      const loaderFn = loaderCache.get(key)
+      if (loaderFn) {
+        const result = layoutResults.find((r) => r.routeId === key)
+        if (result) {
+          setSSRLoaderData(loaderFn, result.loaderData)
+        }
+      }
+    }
+    const pageLoaderFn = loaderCache.get(route.file)
+    if (pageLoaderFn) {
+      setSSRLoaderData(pageLoaderFn, pageResult.loaderData)
+    }
+
+    const hasLoaderError = !!pageResult.isError || layoutResults.some((r) => r.isError)
+
+    return { pageResult, matches, hasLoaderError }
+  }
+
+  // drops every cached module and loader, for when the routes are swapped
+  function clear() {
+    loaderCache.clear()
+    moduleImportCache.clear()
+    loaderCacheFnMap.clear()
+    pendingLoaderResults.clear()
+  }
+
+  return {
+    loaderCache,
+    loaderCacheFnMap,
+    resolveLoaderSync,
+    importAndRunLoader,
+    runRouteLoaders,
+    clear,
+  }
+}
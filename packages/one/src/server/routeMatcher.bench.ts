@@ -0,0 +1,46 @@
+import { bench, describe } from 'vitest'
+import { compileManifest } from '../createHandleRequest'
+import { createRoutesManifest } from './createRoutesManifest'
+
+// run with: bun run vitest bench --run src/server/routeMatcher.bench.ts
+// trie lookups should stay roughly flat as the route count grows, while the
+// linear scan grows with it
+
+function createSyntheticManifest(sections: number) {
+  const files = ['./_layout.tsx', './index.tsx', './+not-found.tsx']
+  for (let i = 0; i < sections; i++) {
+    files.push(
+      `./section${i}/index.tsx`,
+      `./section${i}/[id].tsx`,
+      `./section${i}/[id]/edit.tsx`,
+      `./section${i}/docs/[...path].tsx`
+    )
+  }
+  return compileManifest(createRoutesManifest(files, { platform: 'web' })!)
+}
+
+for (const sections of [250, 1000, 4000]) {
+  const compiled = createSyntheticManifest(sections)
+  const last = sections - 1
+  const pathnames = [
+    `/section${last}`,
+    `/section${last}/42`,
+    `/section${last}/42/edit`,
+    `/section${last}/docs/a/b/c`,
+    '/missing/route',
+  ]
+
+  describe(`${compiled.pageRoutes.length} page routes`, () => {
+    bench('trie', () => {
+      for (const pathname of pathnames) {
+        compiled.pageMatcher.match(pathname)
+      }
+    })
+
+    bench('linear regex scan', () => {
+      for (const pathname of pathnames) {
+        compiled.pageRoutes.find((route) => route.compiledRegex.test(pathname))
+      }
+    })
+  })
+}
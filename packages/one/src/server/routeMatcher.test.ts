@@ -0,0 +1,161 @@
+import { describe, expect, it } from 'vitest'
+import { compileManifest } from '../createHandleRequest'
+import { createRoutesManifest } from './createRoutesManifest'
+import type { RouteInfoCompiled } from './createRoutesManifest'
+import { parseNamedRegex } from './routeMatcher'
+import type { RouteInfo } from '../vite/types'
+
+const files = [
+  './_layout.tsx',
+  './index.tsx',
+  './about.tsx',
+  './+not-found.tsx',
+  './blog/index.tsx',
+  './blog/new.tsx',
+  './blog/[slug].tsx',
+  './blog/[slug]/edit.tsx',
+  './blog/+not-found.tsx',
+  './docs/[...path].tsx',
+  './shop/[[...filters]].tsx',
+  './(marketing)/_layout.tsx',
+  './(marketing)/pricing.tsx',
+  './(app)/_layout.tsx',
+  './(app)/[user]/index.tsx',
+  './(app)/[user]/[repo].tsx',
+  './(app)/[user]/settings.tsx',
+  './api/health+api.ts',
+  './api/users/[id]+api.ts',
+  './api/files/[...path]+api.ts',
+]
+
+function getCompiled() {
+  const manifest = createRoutesManifest(files, { platform: 'web' })!
+  return compileManifest(manifest)
+}
+
+// the behavior the trie replaces: first route in manifest order wins
+function linearMatch(routes: RouteInfoCompiled[], pathname: string) {
+  for (const route of routes) {
+    const match = route.compiledRegex.exec(pathname)
+    if (!match) continue
+    const params: Record<string, string> = {}
+    if (match.groups) {
+      for (const [key, value] of Object.entries(match.groups)) {
+        params[route.routeKeys[key]] = value as string
+      }
+    }
+    return { route, params }
+  }
+  return null
+}
+
+const paths = [
+  '/',
+  '//',
+  '/about',
+  '/about/',
+  '/blog',
+  '/blog/new',
+  '/blog/hello',
+  '/blog/hello/',
+  '/blog/hello/edit',
+  '/blog/hello/edit/more',
+  '/blog/+not-found',
+  '/docs',
+  '/docs/a',
+  '/docs/a/b/c',
+  '/docs/a/b/c/',
+  '/docs//',
+  '/shop',
+  '/shop/',
+  '/shop/red/large',
+  '/pricing',
+  '/(marketing)/pricing',
+  '/natew',
+  '/natew/one',
+  '/natew/settings',
+  '/natew/one/extra',
+  '/api/health',
+  '/api/users/1',
+  '/api/files/a/b.txt',
+  '/nope/nope/nope',
+  'relative',
+  '',
+]
+
+describe('createRouteMatcher', () => {
+  it('matches the same route and params as scanning the manifest in order', () => {
+    const compiled = getCompiled()
+    for (const pathname of paths) {
+      expect(compiled.pageMatcher.match(pathname), pathname).toEqual(
+        linearMatch(compiled.pageRoutes, pathname)
+      )
+      expect(compiled.apiMatcher.match(pathname), pathname).toEqual(
+        linearMatch(compiled.apiRoutes, pathname)
+      )
+    }
+  })
+
+  it('keeps static > param > catch-all > +not-found specificity', () => {
+    const { pageMatcher } = getCompiled()
+    expect(pageMatcher.match('/blog/new')?.route.file).toBe('./blog/new.tsx')
+    expect(pageMatcher.match('/blog/hello')).toMatchObject({
+      route: { file: './blog/[slug].tsx' },
+      params: { slug: 'hello' },
+    })
+    expect(pageMatcher.match('/natew/settings')?.route.file).toBe(
+      './(app)/[user]/settings.tsx'
+    )
+    expect(pageMatcher.match('/docs/a/b/c')).toMatchObject({
+      route: { file: './docs/[...path].tsx' },
+      params: { path: 'a/b/c' },
+    })
+    expect(pageMatcher.match('/blog/a/b/c')?.route.file).toBe('./blog/+not-found.tsx')
+    expect(pageMatcher.match('/nope/nope/nope')?.route.file).toBe('./+not-found.tsx')
+  })
+
+  it('handles optional catch-alls and groups', () => {
+    const { pageMatcher } = getCompiled()
+    expect(pageMatcher.match('/shop')).toMatchObject({
+      route: { file: './shop/[[...filters]].tsx' },
+      params: { filters: undefined },
+    })
+    expect(pageMatcher.match('/shop/red/large')?.params).toEqual({
+      filters: 'red/large',
+    })
+    expect(pageMatcher.match('/pricing')?.route.file).toBe('./(marketing)/pricing.tsx')
+    expect(pageMatcher.match('/natew/one')).toMatchObject({
+      route: { file: './(app)/[user]/[repo].tsx' },
+      params: { user: 'natew', repo: 'one' },
+    })
+  })
+
+  it('returns the next match in order when a route is filtered out', () => {
+    const { pageMatcher } = getCompiled()
+    const notDynamic = (route: RouteInfoCompiled) =>
+      route.page.endsWith('/+not-found') || Object.keys(route.routeKeys).length === 0
+    expect(pageMatcher.match('/blog/hello', notDynamic)?.route.file).toBe(
+      './blog/+not-found.tsx'
+    )
+    expect(pageMatcher.match('/about', () => false)).toBeNull()
+  })
+
+  it('falls back to the regex for routes outside the generated grammar', () => {
+    const route: RouteInfo = {
+      file: './custom.tsx',
+      page: '/custom',
+      namedRegex: '^/custom-(?<id>\\d+)$',
+      urlPath: '/custom',
+      urlCleanPath: '/custom',
+      routeKeys: { id: 'id' },
+      type: 'ssr',
+    }
+    expect(parseNamedRegex(route.namedRegex)).toBeNull()
+    const compiled = compileManifest({ pageRoutes: [route], apiRoutes: [] })
+    expect(compiled.pageMatcher.match('/custom-12')).toMatchObject({
+      route: { file: './custom.tsx' },
+      params: { id: '12' },
+    })
+    expect(compiled.pageMatcher.match('/custom-ab')).toBeNull()
+  })
+})
@@ -0,0 +1,368 @@
+import type { RouteInfoCompiled } from './createRoutesManifest'
+
+/**
+ * Segment trie over compiled routes.
+ *
+ * The server manifest is sorted by specificity (see getServerManifest) and
+ * the request paths used to walk it linearly, running each route's regex
+ * until one matched. With thousands of routes that scan dominates loader
+ * requests. This matcher parses each route's `namedRegex` back into segments
+ * once, inserts them into a trie, and on lookup returns the matching route
+ * with the lowest manifest index - the same route the linear scan returns,
+ * so ordering rules stay owned by the manifest.
+ *
+ * Routes whose regex doesn't follow the generated grammar are kept in a
+ * small fallback list that's still tested with the regex.
+ */
+
+export type RouteMatch<T extends RouteInfoCompiled = RouteInfoCompiled> = {
+  route: T
+  params: Record<string, string>
+}
+
+export type RouteMatcher<T extends RouteInfoCompiled = RouteInfoCompiled> = {
+  /**
+   * Find the first route (in manifest order) that matches `pathname` and
+   * passes `filter`, along with its params.
+   */
+  match: (pathname: string, filter?: (route: T) => boolean) => RouteMatch<T> | null
+}
+
+type Token =
+  | { type: 'static'; value: string }
+  | { type: 'group'; values: string[] }
+  | { type: 'param'; key: string }
+  | { type: 'catchAll'; key: string }
+  | { type: 'optionalCatchAll'; key: string }
+
+type Terminal<T> = {
+  index: number
+  route: T
+  // regex group keys of the dynamic segments, in path order
+  keys: string[]
+}
+
+type TrieNode<T> = {
+  static: Map<string, TrieNode<T>> | null
+  param: TrieNode<T> | null
+  catchAll: TrieNode<T> | null
+  optionalCatchAll: TrieNode<T> | null
+  terminals: Terminal<T>[] | null
+  // lowest route index reachable from this node, used to prune the search
+  minIndex: number
+}
+
+function createNode<T>(): TrieNode<T> {
+  return {
+    static: null,
+    param: null,
+    catchAll: null,
+    optionalCatchAll: null,
+    terminals: null,
+    minIndex: Number.POSITIVE_INFINITY,
+  }
+}
+
+const regexPrefix = '^'
+const regexSuffix = '(?:/)?$'
+const paramRe = /^\/\(\?<(\w+)>\(\?!\\\+not-found\$\)\[\^\/\]\+\?\)/
+const catchAllRe = /^\/\(\?<(\w+)>\.\+\?\)/
+const optionalCatchAllRe = /^\(\?:\/\(\?<(\w+)>\.\+\?\)\)\?/
+const multiGroupRe = /^\(\?:\/\\\(\(\?:(.*?)\)\\\)\)\?/
+const singleGroupRe = /^\(\?:\/(\\\(.*?\\\))\)\?/
+
+function unescapeRegex(str: string) {
+  return str.replace(/\\(.)/g, '$1')
+}
+
+/**
+ * Parse a `namedRegex` produced by getServerManifest's getPathMeta back into
+ * segment tokens. Returns null for anything outside that grammar.
+ */
+export function parseNamedRegex(namedRegex: string): Token[] | null {
+  if (!namedRegex.startsWith(regexPrefix) || !namedRegex.endsWith(regexSuffix)) {
+    return null
+  }
+
+  let rest = namedRegex.slice(regexPrefix.length, -regexSuffix.length)
+  const tokens: Token[] = []
+
+  while (rest) {
+    let match: RegExpExecArray | null
+
+    if ((match = paramRe.exec(rest))) {
+      tokens.push({ type: 'param', key: match[1] })
+    } else if ((match = catchAllRe.exec(rest))) {
+      tokens.push({ type: 'catchAll', key: match[1] })
+    } else if ((match = optionalCatchAllRe.exec(rest))) {
+      tokens.push({ type: 'optionalCatchAll', key: match[1] })
+    } else if ((match = multiGroupRe.exec(rest))) {
+      tokens.push({
+        type: 'group',
+        values: match[1].split('|').map((name) => `(${unescapeRegex(name)})`),
+      })
+    } else if ((match = singleGroupRe.exec(rest))) {
+      tokens.push({ type: 'group', values: [unescapeRegex(match[1])] })
+    } else if (rest[0] === '/') {
+      // static segment: escaped literal up to the next unescaped / or (
+      let i = 1
+      let value = ''
+      while (i < rest.length && rest[i] !== '/' && rest[i] !== '(') {
+        if (rest[i] === '\\') {
+          i++
+        }
+        value += rest[i]
+        i++
+      }
+      if (/[|{}[\]^$+*?.)]/.test(unescapedSpecials(rest.slice(1, i)))) {
+        return null
+      }
+      tokens.push({ type: 'static', value })
+      rest = rest.slice(i)
+      continue
+    } else {
+      return null
+    }
+
+    rest = rest.slice(match[0].length)
+  }
+
+  return tokens
+}
+
+// regex specials left unescaped in a static segment mean the regex isn't a
+// plain literal, so the route can't be represented in the trie
+function unescapedSpecials(source: string) {
+  return source.replace(/\\./g, '')
+}
+
+// expand group tokens (each may be skipped or take one of its names) into
+// plain token lists
+function expandGroups(tokens: Token[]): Token[][] {
+  let variants: Token[][] = [[]]
+  for (const token of tokens) {
+    if (token.type !== 'group') {
+      for (const variant of variants) variant.push(token)
+      continue
+    }
+    const next: Token[][] = []
+    for (const variant of variants) {
+      // greedy optional in the regex: try consuming the group first
+      for (const value of token.values) {
+        next.push([...variant, { type: 'static', value }])
+      }
+      next.push(variant)
+    }
+    variants = next
+  }
+  return variants
+}
+
+function insert<T>(root: TrieNode<T>, tokens: Token[], terminal: Terminal<T>) {
+  let node = root
+  if (terminal.index < node.minIndex) node.minIndex = terminal.index
+
+  for (const token of tokens) {
+    let child: TrieNode<T>
+    switch (token.type) {
+      case 'static': {
+        node.static ||= new Map()
+        let existing = node.static.get(token.value)
+        if (!existing) {
+          existing = createNode()
+          node.static.set(token.value, existing)
+        }
+        child = existing
+        break
+      }
+      case 'param': {
+        child = node.param ||= createNode()
+        break
+      }
+      case 'catchAll': {
+        child = node.catchAll ||= createNode()
+        break
+      }
+      case 'optionalCatchAll': {
+        child = node.optionalCatchAll ||= createNode()
+        break
+      }
+      default: {
+        throw new Error(`Unexpected token in route matcher: ${token.type}`)
+      }
+    }
+    node = child
+    if (terminal.index < node.minIndex) node.minIndex = terminal.index
+  }
+
+  node.terminals ||= []
+  node.terminals.push(terminal)
+  node.terminals.sort((a, b) => a.index - b.index)
+}
+
+function getKeys(tokens: Token[]): string[] {
+  const keys: string[] = []
+  for (const token of tokens) {
+    if (token.type !== 'static' && token.type !== 'group') {
+      keys.push(token.key)
+    }
+  }
+  return keys
+}
+
+function toParams(
+  routeKeys: Record<string, string>,
+  keys: string[],
+  values: Array<string | undefined>
+): Record<string, string> {
+  const params: Record<string, string> = {}
+  for (let i = 0; i < keys.length; i++) {
+    params[routeKeys[keys[i]]] = values[i] as string
+  }
+  return params
+}
+
+// split a pathname into segments, each of which was preceded by a slash:
+// '' -> [], '/' -> [''], '/a/b' -> ['a', 'b']
+function splitPath(pathname: string): string[] | null {
+  if (pathname === '') return []
+  if (pathname[0] !== '/') return null
+  return pathname.slice(1).split('/')
+}
+
+export function createRouteMatcher<T extends RouteInfoCompiled>(
+  routes: T[]
+): RouteMatcher<T> {
+  const root = createNode<T>()
+  const fallback: Array<{ index: number; route: T }> = []
+
+  for (let index = 0; index < routes.length; index++) {
+    const route = routes[index]
+    const tokens = parseNamedRegex(route.namedRegex)
+    if (!tokens) {
+      fallback.push({ index, route })
+      continue
+    }
+    const keys = getKeys(tokens)
+    for (const variant of expandGroups(tokens)) {
+      insert(root, variant, { index, route, keys })
+    }
+  }
+
+  // mutable search state, reset per match() call
+  let best: Terminal<T> | null = null
+  let bestValues: Array<string | undefined> = []
+  let currentFilter: ((route: T) => boolean) | undefined
+  const values: Array<string | undefined> = []
+
+  // depth-first in the same order the regex backtracks, so for a given route
+  // the first match found captures the same values the regex would
+  function visit(node: TrieNode<T>, segments: string[], i: number): void {
+    if (best && node.minIndex >= best.index) return
+
+    const remaining = segments.length - i
+
+    // the regex ends with (?:/)?$, so one trailing empty segment is allowed
+    if (node.terminals && (remaining === 0 || (remaining === 1 && !segments[i]))) {
+      for (const terminal of node.terminals) {
+        if (best && terminal.index >= best.index) break
+        if (currentFilter && !currentFilter(terminal.route)) continue
+        best = terminal
+        bestValues = values.slice()
+        break
+      }
+    }
+
+    if (remaining === 0) {
+      if (node.optionalCatchAll) {
+        values.push(undefined)
+        visit(node.optionalCatchAll, segments, i)
+        values.pop()
+      }
+      return
+    }
+
+    if (node.static) {
+      const child = node.static.get(segments[i])
+      if (child) visit(child, segments, i + 1)
+    }
+
+    if (node.param) {
+      const segment = segments[i]
+      // mirrors the (?!\+not-found$) lookahead, which only applies at the
+      // very end of the input
+      if (segment && !(remaining === 1 && segment === '+not-found')) {
+        values.push(segment)
+        visit(node.param, segments, i + 1)
+        values.pop()
+      }
+    }
+
+    if (node.catchAll) {
+      visitCatchAll(node.catchAll, segments, i)
+    }
+
+    if (node.optionalCatchAll) {
+      // greedy optional: try capturing before skipping
+      visitCatchAll(node.optionalCatchAll, segments, i)
+      values.push(undefined)
+      visit(node.optionalCatchAll, segments, i)
+      values.pop()
+    }
+  }
+
+  // catch-alls consume one or more segments, shortest first like the lazy .+?
+  function visitCatchAll(node: TrieNode<T>, segments: string[], i: number) {
+    let value = segments[i]
+    for (let end = i + 1; end <= segments.length; end++) {
+      if (end > i + 1) value += '/' + segments[end - 1]
+      if (!value) continue
+      values.push(value)
+      visit(node, segments, end)
+      values.pop()
+    }
+  }
+
+  function match(pathname: string, filter?: (route: T) => boolean): RouteMatch<T> | null {
+    const segments = splitPath(pathname)
+    if (!segments) return null
+
+    let found: { index: number; route: T; params: Record<string, string> } | null = null
+
+    currentFilter = filter
+    try {
+      visit(root, segments, 0)
+
+      if (best) {
+        found = {
+          index: best.index,
+          route: best.route,
+          params: toParams(best.route.routeKeys, best.keys, bestValues),
+        }
+      }
+    } finally {
+      best = null
+      bestValues = []
+      currentFilter = undefined
+    }
+
+    for (const entry of fallback) {
+      if (found && entry.index >= found.index) break
+      if (filter && !filter(entry.route)) continue
+      const result = entry.route.compiledRegex.exec(pathname)
+      if (!result) continue
+      const params: Record<string, string> = {}
+      if (result.groups) {
+        for (const [key, value] of Object.entries(result.groups)) {
+          params[entry.route.routeKeys[key]] = value as string
+        }
+      }
+      found = { index: entry.index, route: entry.route, params }
+      break
+    }
+
+    return found ? { route: found.route, params: found.params } : null
+  }
+
+  return { match }
+}
@@ -0,0 +1,94 @@
+import { afterEach, describe, expect, it } from 'vitest'
+import { createSSRCache, type SSRCacheEvent, setSSRCacheStatsHandler } from './ssrCache'
+
+const textEncoder = new TextEncoder()
+
+function streamOf(...chunks: string[]) {
+  return new ReadableStream<Uint8Array>({
+    start(controller) {
+      for (const chunk of chunks) controller.enqueue(textEncoder.encode(chunk))
+      controller.close()
+    },
+  })
+}
+
+function collectEvents() {
+  const events: string[] = []
+  setSSRCacheStatsHandler((event: SSRCacheEvent) => {
+    events.push(`${event.type} ${event.key}`)
+  })
+  return events
+}
+
+const tick = () => new Promise((resolve) => setTimeout(resolve, 0))
+
+afterEach(() => {
+  setSSRCacheStatsHandler(null)
+})
+
+describe('createSSRCache', () => {
+  it('stores a streamed render while sending it', async () => {
+    const cache = createSSRCache()
+    const events = collectEvents()
+
+    expect(cache.get('a')).toBeNull()
+    const sent = cache.tee('a', streamOf('<p>', 'hi</p>'), 1000, [['x-page', 'a']])
+    expect(await new Response(sent).text()).toBe('<p>hi</p>')
+    await tick()
+
+    const entry = cache.get('a')!
+    expect(await new Response(cache.toStream(entry)).text()).toBe('<p>hi</p>')
+    expect(entry.headers).toEqual([['x-page', 'a']])
+    expect(events).toEqual(['miss a', 'hit a'])
+    expect(cache.stats).toEqual({
+      hits: 1,
+      misses: 1,
+      evictions: 0,
+      entries: 1,
+      bytes: 9,
+    })
+  })
+
+  it('expires entries after their ttl', async () => {
+    const cache = createSSRCache()
+    cache.set('a', '<p>a</p>', 5)
+    expect(cache.get('a')).not.toBeNull()
+    await new Promise((resolve) => setTimeout(resolve, 10))
+    expect(cache.get('a')).toBeNull()
+    expect(cache.stats.entries).toBe(0)
+  })
+
+  it('evicts the least recently used entries past maxBytes', () => {
+    const cache = createSSRCache({ maxBytes: 20 })
+    const events = collectEvents()
+
+    cache.set('a', '0123456789', 1000)
+    cache.set('b', '0123456789', 1000)
+    cache.get('a')
+    cache.set('c', '0123456789', 1000)
+
+    expect(events).toEqual(['hit a', 'evict b'])
+    expect(cache.stats).toMatchObject({ entries: 2, bytes: 20, evictions: 1 })
+
+    // larger than the whole cache, never stored
+    cache.set('d', '0'.repeat(21), 1000)
+    expect(cache.stats.entries).toBe(2)
+  })
+
+  it('skips renders that error or outgrow the cache', async () => {
+    const cache = createSSRCache({ maxBytes: 4 })
+
+    await new Response(cache.tee('big', streamOf('012', '345'), 1000)).text()
+
+    const failing = new ReadableStream<Uint8Array>({
+      start(controller) {
+        controller.enqueue(textEncoder.encode('<p>'))
+        controller.error(new Error('render failed'))
+      },
+    })
+    await new Response(cache.tee('failed', failing, 1000)).text().catch(() => {})
+    await tick()
+
+    expect(cache.stats.entries).toBe(0)
+  })
+})
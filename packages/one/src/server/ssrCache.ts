@@ -0,0 +1,177 @@
+/**
+ * In-memory cache for rendered html of ssr routes, enabled with `server.ssrCache`.
+ *
+ * Routes opt in through their `loaderCache` export: a page is only cached when
+ * every loader on it (page and layouts) returns a key with a `ttl`, and the
+ * entry lives for the shortest of those ttls. A hit skips both the loaders and
+ * the React render. Streamed renders are tee'd, so the first visitor still gets
+ * the page progressively while a copy is collected for the cache. Headers the
+ * render set with `setResponseHeaders` are stored with the html and sent again
+ * on hits, renders that set cookies are never cached.
+ *
+ * Entries live in a byte-bounded LRU (Map insertion order, most recently used
+ * last).
+ */
+
+export const DEFAULT_SSR_CACHE_MAX_BYTES = 50 * 1024 * 1024
+
+export type SSRCacheStats = {
+  hits: number
+  misses: number
+  evictions: number
+  entries: number
+  bytes: number
+}
+
+export type SSRCacheEvent = {
+  type: 'hit' | 'miss' | 'evict'
+  key: string
+  /** size of the entry, 0 for misses */
+  bytes: number
+  /** running totals of the cache that emitted the event */
+  stats: SSRCacheStats
+}
+
+type SSRCacheStatsHandler = (event: SSRCacheEvent) => void
+
+let _statsHandler: SSRCacheStatsHandler | null = null
+
+/**
+ * Called synchronously for every hit, miss and eviction of the ssr cache, use
+ * it to feed metrics.
+ */
+export function setSSRCacheStatsHandler(handler: SSRCacheStatsHandler | null) {
+  _statsHandler = handler
+}
+
+export type SSRCacheEntry = {
+  html: Uint8Array
+  /** set with setResponseHeaders by the render, replayed on hits */
+  headers: [string, string][]
+  bytes: number
+  expires: number
+}
+
+const textEncoder = new TextEncoder()
+
+function concat(chunks: Uint8Array[], bytes: number) {
+  if (chunks.length === 1) return chunks[0]
+  const out = new Uint8Array(bytes)
+  let offset = 0
+  for (const chunk of chunks) {
+    out.set(chunk, offset)
+    offset += chunk.byteLength
+  }
+  return out
+}
+
+export function createSSRCache({
+  maxBytes = DEFAULT_SSR_CACHE_MAX_BYTES,
+}: { maxBytes?: number } = {}) {
+  const entries = new Map<string, SSRCacheEntry>()
+  const stats: SSRCacheStats = { hits: 0, misses: 0, evictions: 0, entries: 0, bytes: 0 }
+
+  function emit(type: SSRCacheEvent['type'], key: string, bytes: number) {
+    _statsHandler?.({ type, key, bytes, stats })
+  }
+
+  function remove(key: string, entry: SSRCacheEntry) {
+    entries.delete(key)
+    stats.bytes -= entry.bytes
+    stats.entries = entries.size
+  }
+
+  function get(key: string): SSRCacheEntry | null {
+    const entry = entries.get(key)
+    if (entry && Date.now() < entry.expires) {
+      // bump to most recently used
+      entries.delete(key)
+      entries.set(key, entry)
+      stats.hits++
+      emit('hit', key, entry.bytes)
+      return entry
+    }
+    if (entry) remove(key, entry)
+    stats.misses++
+    emit('miss', key, 0)
+    return null
+  }
+
+  function set(key: string, html: Uint8Array, ttl: number, headers: [string, string][]) {
+    const bytes = html.byteLength
+    // too large to ever fit, serve it without caching
+    if (bytes > maxBytes) return
+    const existing = entries.get(key)
+    if (existing) remove(key, existing)
+    entries.set(key, { html, headers, bytes, expires: Date.now() + ttl })
+    stats.bytes += bytes
+    stats.entries = entries.size
+    while (stats.bytes > maxBytes) {
+      const oldest = entries.keys().next().value
+      if (oldest === undefined) break
+      const entry = entries.get(oldest)!
+      remove(oldest, entry)
+      stats.evictions++
+      emit('evict', oldest, entry.bytes)
+    }
+  }
+
+  function setRendered(
+    key: string,
+    html: string,
+    ttl: number,
+    headers: [string, string][] = []
+  ) {
+    set(key, textEncoder.encode(html), ttl, headers)
+  }
+
+  /**
+   * returns a branch of `stream` to send to the client and stores the other
+   * one once the render completes. errored or oversized renders aren't cached.
+   */
+  function tee(
+    key: string,
+    stream: ReadableStream,
+    ttl: number,
+    headers: [string, string][] = []
+  ): ReadableStream {
+    const [response, copy] = stream.tee()
+
+    void (async () => {
+      const reader = copy.getReader()
+      const chunks: Uint8Array[] = []
+      let bytes = 0
+      try {
+        while (true) {
+          const { done, value } = await reader.read()
+          if (done) break
+          const chunk = typeof value === 'string' ? textEncoder.encode(value) : value
+          bytes += chunk.byteLength
+          if (bytes > maxBytes) {
+            await reader.cancel()
+            return
+          }
+          chunks.push(chunk)
+        }
+      } catch {
+        return
+      }
+      set(key, concat(chunks, bytes), ttl, headers)
+    })()
+
+    return response
+  }
+
+  function toStream(entry: SSRCacheEntry): ReadableStream<Uint8Array> {
+    return new ReadableStream({
+      start(controller) {
+        controller.enqueue(entry.html)
+        controller.close()
+      },
+    })
+  }
+
+  return { get, set: setRendered, tee, toStream, stats }
+}
+
+export type SSRCache = ReturnType<typeof createSSRCache>
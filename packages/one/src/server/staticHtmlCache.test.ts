@@ -0,0 +1,139 @@
+import { mkdtempSync, rmSync, writeFileSync } from 'node:fs'
+import { tmpdir } from 'node:os'
+import { join } from 'node:path'
+import { brotliDecompressSync, gunzipSync } from 'node:zlib'
+import { afterEach, beforeEach, describe, expect, it } from 'vitest'
+import { precompressHtml } from '../cli/precompressHtml'
+import { createStaticHtmlCache } from './staticHtmlCache'
+
+let clientDir: string
+
+const aboutHtml = '<html><head><title>about</title></head><body>about</body></html>'
+const notFoundHtml = '<html><head></head><body>not found</body></html>'
+
+beforeEach(() => {
+  clientDir = mkdtempSync(join(tmpdir(), 'one-html-cache-'))
+  writeFileSync(join(clientDir, 'about.html'), aboutHtml)
+  writeFileSync(join(clientDir, 'other.html'), aboutHtml.replaceAll('about', 'other'))
+  writeFileSync(join(clientDir, '+not-found.html'), notFoundHtml)
+})
+
+afterEach(() => {
+  rmSync(clientDir, { recursive: true, force: true })
+})
+
+function request(headers: Record<string, string> = {}) {
+  return new Request('http://localhost/about', { headers })
+}
+
+async function getCache(maxBytes?: number) {
+  const etags = await precompressHtml({
+    clientDir,
+    htmlPaths: ['about.html', 'other.html', '+not-found.html', 'missing.html'],
+    concurrency: 2,
+  })
+  return { etags, cache: createStaticHtmlCache({ clientDir, etags, maxBytes }) }
+}
+
+describe('createStaticHtmlCache', () => {
+  it('serves the precompressed variant the client accepts', async () => {
+    const { etags, cache } = await getCache()
+    expect(Object.keys(etags).sort()).toEqual([
+      '+not-found.html',
+      'about.html',
+      'other.html',
+    ])
+
+    const entry = (await cache.get('about.html'))!
+    expect(entry.etag).toBe(etags['about.html'])
+
+    const br = cache.respond(entry, request({ 'accept-encoding': 'gzip, br' }), 200)
+    expect(br.headers.get('content-encoding')).toBe('br')
+    expect(br.headers.get('vary')).toBe('Accept-Encoding')
+    const brBody = Buffer.from(await br.arrayBuffer())
+    expect(brotliDecompressSync(brBody).toString()).toBe(aboutHtml)
+
+    const gz = cache.respond(entry, request({ 'accept-encoding': 'gzip' }), 200)
+    expect(gz.headers.get('content-encoding')).toBe('gzip')
+    expect(gunzipSync(Buffer.from(await gz.arrayBuffer())).toString()).toBe(aboutHtml)
+
+    const plain = cache.respond(entry, request(), 200)
+    expect(plain.headers.get('content-encoding')).toBeNull()
+    expect(await plain.text()).toBe(aboutHtml)
+  })
+
+  it('answers a matching If-None-Match with a 304', async () => {
+    const { cache } = await getCache()
+    const entry = (await cache.get('about.html'))!
+
+    const first = cache.respond(entry, request({ 'accept-encoding': 'br' }), 200)
+    const etag = first.headers.get('etag')!
+    expect(etag).toMatch(/-br"$/)
+
+    const revalidated = cache.respond(entry, request({ 'if-none-match': etag }), 200)
+    expect(revalidated.status).toBe(304)
+    expect(await revalidated.text()).toBe('')
+
+    const weak = cache.respond(entry, request({ 'if-none-match': `W/${etag}` }), 200)
+    expect(weak.status).toBe(304)
+
+    const changed = cache.respond(entry, request({ 'if-none-match': '"other"' }), 200)
+    expect(changed.status).toBe(200)
+
+    for (const encoding of ['br', 'gzip']) {
+      const headers = { 'accept-encoding': encoding }
+      const variant = cache.respond(entry, request(headers), 200).headers.get('etag')!
+      const response = cache.respond(
+        entry,
+        request({ ...headers, 'if-none-match': variant }),
+        200
+      )
+      expect(response.status).toBe(304)
+      expect(response.headers.get('etag')).toBe(variant)
+    }
+
+    const notFound = cache.respond(entry, request({ 'if-none-match': etag }), 404)
+    expect(notFound.status).toBe(404)
+    expect(notFound.headers.get('etag')).toBeNull()
+  })
+
+  it('ignores compressed siblings that no longer match the html', async () => {
+    const { cache } = await getCache()
+    writeFileSync(join(clientDir, 'about.html'), '<html>edited</html>')
+
+    const entry = (await cache.get('about.html'))!
+    expect(entry.br).toBeUndefined()
+    const response = cache.respond(entry, request({ 'accept-encoding': 'br' }), 200)
+    expect(response.headers.get('content-encoding')).toBeNull()
+    expect(await response.text()).toBe('<html>edited</html>')
+  })
+
+  it('injects the 404 marker without rescanning the html', async () => {
+    const { cache } = await getCache()
+    const entry = (await cache.get('+not-found.html'))!
+    expect(entry.notFoundParts).toHaveLength(2)
+
+    const response = cache.respondNotFound(entry, '<script>marker</script>')
+    expect(response.status).toBe(404)
+    expect(await response.text()).toBe(
+      '<html><head><script>marker</script></head><body>not found</body></html>'
+    )
+  })
+
+  it('evicts the least recently used entries past maxBytes', async () => {
+    const { cache } = await getCache()
+    const about = (await cache.get('about.html'))!
+    const { cache: bounded } = await getCache(Math.floor(about.bytes * 1.5))
+
+    const first = await bounded.get('about.html')
+    expect(bounded.get('about.html')).toBe(first)
+
+    await bounded.get('other.html')
+    // about.html was evicted, so this is a fresh load
+    const reloaded = bounded.get('about.html')
+    expect(reloaded).toBeInstanceOf(Promise)
+    expect(await reloaded).not.toBe(first)
+
+    expect(await bounded.get('missing.html')).toBeNull()
+  })
+})
@@ -0,0 +1,237 @@
+import { createHash } from 'node:crypto'
+import { readFile } from 'node:fs/promises'
+import { join } from 'node:path'
+import { pLimit } from '../utils/pLimit'
+
+/**
+ * In-memory cache for built SSG/SPA html, enabled with `server.htmlCache`.
+ *
+ * Entries hold the raw bytes plus the brotli/gzip siblings `one build` wrote
+ * next to each html file, so a hit is a map lookup and a memcpy instead of a
+ * disk read and an on-the-fly compression. Entries live in a byte-bounded LRU
+ * (Map insertion order, most recently used last).
+ */
+
+export const DEFAULT_HTML_CACHE_MAX_BYTES = 50 * 1024 * 1024
+
+/**
+ * strong etag for a static html file, written to buildInfo at build time and
+ * recomputed when the server loads the file.
+ */
+export function getHtmlEtag(content: Uint8Array | string): string {
+  return `"${createHash('sha1').update(content).digest('base64url')}"`
+}
+
+type Encoding = 'br' | 'gzip'
+
+export type StaticHtmlEntry = {
+  etag: string
+  identity: Uint8Array
+  br?: Uint8Array
+  gzip?: Uint8Array
+  bytes: number
+  // +not-found html gets a per-request marker injected, so it's kept split
+  // around the injection point (a single part when there's nowhere to inject)
+  notFoundParts?: [before: string, after?: string]
+}
+
+export type StaticHtmlCache = {
+  get: (htmlPath: string) => StaticHtmlEntry | null | Promise<StaticHtmlEntry | null>
+  preload: (htmlPaths: string[]) => Promise<void>
+  respond: (entry: StaticHtmlEntry, request: Request, status: number) => Response
+  respondNotFound: (entry: StaticHtmlEntry, marker: string) => Response
+}
+
+const textDecoder = new TextDecoder()
+
+// variant etags: the same content encoded differently is a different
+// representation, so each encoding gets its own strong etag
+function getVariantEtag(etag: string, encoding: Encoding | undefined) {
+  if (!encoding) return etag
+  return `${etag.slice(0, -1)}-${encoding === 'br' ? 'br' : 'gz'}"`
+}
+
+// takes the base etag, a validator for any encoding of the same content matches
+function matchesIfNoneMatch(header: string | null, etag: string) {
+  if (!header) return false
+  if (header.trim() === '*') return true
+  const base = etag.slice(1, -1)
+  for (let candidate of header.split(',')) {
+    candidate = candidate.trim()
+    // If-None-Match uses weak comparison
+    if (candidate.startsWith('W/')) candidate = candidate.slice(2)
+    candidate = candidate.slice(1, -1).replace(/-(?:br|gz)$/, '')
+    if (candidate === base) return true
+  }
+  return false
+}
+
+// ignores q-values, same as serveStaticAssets in vxrn
+function pickEncoding(
+  entry: StaticHtmlEntry,
+  header: string | null
+): Encoding | undefined {
+  if (!header) return undefined
+  let gzip = false
+  for (const part of header.split(',')) {
+    const encoding = part.split(';')[0].trim().toLowerCase()
+    if (encoding === 'br' && entry.br) return 'br'
+    if (encoding === 'gzip' && entry.gzip) gzip = true
+  }
+  return gzip ? 'gzip' : undefined
+}
+
+function splitForNotFoundMarker(html: string): [before: string, after?: string] {
+  // inject before </head> or at start of <body>
+  let index = html.indexOf('</head>')
+  if (index === -1) index = html.indexOf('<body')
+  if (index === -1) return [html]
+  return [html.slice(0, index), html.slice(index)]
+}
+
+async function readOptional(path: string) {
+  try {
+    return new Uint8Array(await readFile(path))
+  } catch {
+    return undefined
+  }
+}
+
+export function createStaticHtmlCache({
+  clientDir,
+  etags = {},
+  maxBytes = DEFAULT_HTML_CACHE_MAX_BYTES,
+}: {
+  clientDir: string
+  etags?: Record<string, string>
+  maxBytes?: number
+}): StaticHtmlCache {
+  const entries = new Map<string, StaticHtmlEntry>()
+  const pending = new Map<string, Promise<StaticHtmlEntry | null>>()
+  let totalBytes = 0
+
+  function store(htmlPath: string, entry: StaticHtmlEntry) {
+    // too large to ever fit, serve it without caching
+    if (entry.bytes > maxBytes) return
+    const existing = entries.get(htmlPath)
+    if (existing) {
+      totalBytes -= existing.bytes
+      entries.delete(htmlPath)
+    }
+    entries.set(htmlPath, entry)
+    totalBytes += entry.bytes
+    while (totalBytes > maxBytes) {
+      const oldest = entries.keys().next().value
+      if (oldest === undefined) break
+      totalBytes -= entries.get(oldest)!.bytes
+      entries.delete(oldest)
+    }
+  }
+
+  async function load(htmlPath: string): Promise<StaticHtmlEntry | null> {
+    const fsPath = join(clientDir, htmlPath)
+    const identity = await readOptional(fsPath)
+    if (!identity) return null
+
+    const etag = getHtmlEtag(identity)
+    const entry: StaticHtmlEntry = { etag, identity, bytes: identity.byteLength }
+
+    if (htmlPath.endsWith('+not-found.html')) {
+      entry.notFoundParts = splitForNotFoundMarker(textDecoder.decode(identity))
+      entry.bytes += identity.byteLength
+    }
+
+    // only trust the compressed siblings when they were written from these
+    // exact bytes, otherwise the html changed after the build
+    if (etags[htmlPath] === etag) {
+      const [br, gzip] = await Promise.all([
+        readOptional(`${fsPath}.br`),
+        readOptional(`${fsPath}.gz`),
+      ])
+      if (br) {
+        entry.br = br
+        entry.bytes += br.byteLength
+      }
+      if (gzip) {
+        entry.gzip = gzip
+        entry.bytes += gzip.byteLength
+      }
+    }
+
+    store(htmlPath, entry)
+    return entry
+  }
+
+  function get(
+    htmlPath: string
+  ): StaticHtmlEntry | null | Promise<StaticHtmlEntry | null> {
+    const entry = entries.get(htmlPath)
+    if (entry) {
+      // bump to most recently used
+      entries.delete(htmlPath)
+      entries.set(htmlPath, entry)
+      return entry
+    }
+
+    let promise = pending.get(htmlPath)
+    if (!promise) {
+      promise = load(htmlPath).finally(() => pending.delete(htmlPath))
+      pending.set(htmlPath, promise)
+    }
+    return promise
+  }
+
+  async function preload(htmlPaths: string[]) {
+    const limit = pLimit(8)
+    await Promise.all(
+      [...new Set(htmlPaths)].map((htmlPath) =>
+        limit(async () => {
+          if (totalBytes >= maxBytes) return
+          try {
+            await get(htmlPath)
+          } catch {
+            // a file that fails to load is retried lazily on request
+          }
+        })
+      )
+    )
+  }
+
+  function respond(entry: StaticHtmlEntry, request: Request, status: number) {
+    const encoding = pickEncoding(entry, request.headers.get('accept-encoding'))
+    const headers = new Headers({
+      'content-type': 'text/html',
+      vary: 'Accept-Encoding',
+    })
+
+    if (status === 200) {
+      const etag = getVariantEtag(entry.etag, encoding)
+      headers.set('etag', etag)
+      if (matchesIfNoneMatch(request.headers.get('if-none-match'), entry.etag)) {
+        return new Response(null, { status: 304, headers })
+      }
+    }
+
+    if (encoding) {
+      headers.set('content-encoding', encoding)
+    }
+
+    return new Response(
+      encoding === 'br' ? entry.br : encoding === 'gzip' ? entry.gzip : entry.identity,
+      { status, headers }
+    )
+  }
+
+  function respondNotFound(entry: StaticHtmlEntry, marker: string) {
+    if (!entry.notFoundParts) {
+      entry.notFoundParts = splitForNotFoundMarker(textDecoder.decode(entry.identity))
+    }
+    const [before, after] = entry.notFoundParts
+    return new Response(after === undefined ? before : before + marker + after, {
+      status: 404,
+      headers: { 'content-type': 'text/html' },
+    })
+  }
+
+  return { get, preload, respond, respondNotFound }
+}
@@ -3,10 +3,12 @@ import {
   LOADER_JS_POSTFIX_UNCACHED,
   PRELOAD_JS_POSTFIX_REGEX,
 } from '../constants'
+import type { WorkerExecutionContext } from '../createAPIRoute'
 import {
   compileManifest,
   getSubdomain,
   getURLfromRequestURL,
+  hasRouteFile,
   type RequestHandlers,
   resolveAPIRoute,
   resolveLoaderRoute,
@@ -18,7 +20,23 @@ import { isResponse } from '../utils/isResponse'
 import { resolveResponse } from '../vite/resolveResponse'
 import type { One } from '../vite/types'
 import type { RouteInfoCompiled } from './createRoutesManifest'
-import { setSSRLoaderData } from './ssrLoaderData'
+import {
+  createIncrementalRegeneration,
+  createISRPageRenderer,
+  createMemoryISRCache,
+  getISRCache,
+  isISRRoute,
+} from './isr'
+import {
+  addPhase,
+  configureRequestMetrics,
+  createPrometheusResponse,
+  forwardRequestTiming,
+  getRequestTiming,
+  setRequestRoute,
+  withRequestMetrics,
+} from './requestMetrics'
+import { createRouteLoaders } from './routeLoaders'
 import { getFetchStaticHtml } from './staticHtmlFetcher'
 
 export type LazyRoutes = {
@@ -49,8 +67,10 @@ export function createWorkerHandler(options: WorkerHandlerOptions) {
   let routeMap = options.buildInfo.routeMap
   let currentPreloads = options.buildInfo.preloads
   let currentCssPreloads = options.buildInfo.cssPreloads
+  let cacheKey = options.buildInfo.constants.CACHE_KEY
 
   const debugRouter = process.env.ONE_DEBUG_ROUTER
+  const metrics = configureRequestMetrics(oneOptions.server?.metrics)
 
   // compile redirects for fast matching
   const redirects = oneOptions.web?.redirects
@@ -76,14 +96,22 @@ export function createWorkerHandler(options: WorkerHandlerOptions) {
   const htmlHeaders = { 'content-type': 'text/html' }
   const ssrHtmlHeaders = { 'content-type': 'text/html', 'cache-control': 'no-cache' }
 
-  // caches
-  const loaderCache = new Map<string, Function | null>()
-  const moduleImportCache = new Map<string, any>()
-  const loaderCacheFnMap = new Map<string, Function | null>()
-  const pendingLoaderResults = new Map<
-    string,
-    { promise: Promise<any>; expires: number }
-  >()
+  // route modules only come from lazyRoutes, the caches are cleared when they're swapped
+  const { resolveLoaderSync, importAndRunLoader, runRouteLoaders, clear } =
+    createRouteLoaders({
+      importRoute: async (_serverPath, lazyKey) => {
+        const page = lazyKey && currentLazyRoutes.pages[lazyKey]
+        if (!page) {
+          console.warn(`[one/worker] no lazy route for ${lazyKey}`)
+          return null
+        }
+        return await page()
+      },
+    })
+
+  // ctx.waitUntil of each request, keeps background isr renders alive after
+  // the stale page has been sent
+  const requestWaitUntil = new WeakMap<Request, WorkerExecutionContext['waitUntil']>()
 
   // render entry (lazy loaded from serverEntry)
   let render: ((props: RenderAppProps) => any) | null = null
@@ -131,95 +159,29 @@ export function createWorkerHandler(options: WorkerHandlerOptions) {
     return null
   }
 
-  // resolve a route module's loader - sync on cache hit, async on cold start
-  function resolveLoaderSync(
-    lazyKey: string | undefined
-  ): Function | null | Promise<Function | null> {
-    const cacheKey = lazyKey || ''
-    const cached = loaderCache.get(cacheKey)
-    if (cached !== undefined) return cached
-
-    return (async () => {
-      let routeExported: any
-      if (moduleImportCache.has(cacheKey)) {
-        routeExported = moduleImportCache.get(cacheKey)
-      } else if (lazyKey && currentLazyRoutes.pages[lazyKey]) {
-        routeExported = await currentLazyRoutes.pages[lazyKey]()
-        moduleImportCache.set(cacheKey, routeExported)
-      } else {
-        console.warn(`[one/worker] no lazy route for ${cacheKey}`)
-        loaderCache.set(cacheKey, null)
-        return null
-      }
-
-      const loader = routeExported?.loader || null
-      loaderCache.set(cacheKey, loader)
-      loaderCacheFnMap.set(cacheKey, routeExported?.loaderCache ?? null)
-      return loader
-    })()
+  const renderISRPage = createISRPageRenderer({
+    getRouteBuildInfo: (file) => routeToBuildInfo[file],
+    runRouteLoaders,
+    render: async (props) => {
+      const _rl = ensureRenderLoaded()
+      if (_rl) await _rl
+      return await render!(props)
+    },
+  })
+
+  // only set up when a route exports revalidate, pages are kept in memory
+  // unless setISRCache provided a shared store
+  function createISR() {
+    if (!compiledManifest.pageRoutes.some(isISRRoute)) return null
+    return createIncrementalRegeneration({
+      cache: getISRCache() || createMemoryISRCache(),
+      buildKey: cacheKey,
+      renderPage: renderISRPage,
+      matchRoute: (path) => compiledManifest.pageMatcher.match(path, hasRouteFile),
+    })
   }
 
-  // import and run a loader with coalescing support
-  async function importAndRunLoader(
-    routeId: string,
-    lazyKey: string | undefined,
-    loaderProps: any
-  ): Promise<{ loaderData: unknown; routeId: string; isEnoent?: boolean }> {
-    if (!lazyKey) return { loaderData: undefined, routeId }
-
-    // check loaderCache coalescing before resolving
-    const cacheMapKey = lazyKey
-    const loaderCacheFn = loaderCacheFnMap.get(cacheMapKey)
-    let coalFullKey: string | undefined
-    let coalTtl = 0
-
-    if (loaderCacheFn) {
-      const cacheResult = loaderCacheFn(loaderProps?.params, loaderProps?.request)
-      const cacheKey = typeof cacheResult === 'string' ? cacheResult : cacheResult?.key
-      coalTtl = typeof cacheResult === 'string' ? 0 : (cacheResult?.ttl ?? 0)
-
-      if (cacheKey != null) {
-        coalFullKey = routeId + '\0' + cacheKey
-        const existing = pendingLoaderResults.get(coalFullKey)
-        if (existing && (!existing.expires || Date.now() < existing.expires)) {
-          const loaderData = await existing.promise
-          return { loaderData, routeId }
-        }
-      }
-    }
-
-    try {
-      const loaderOrPromise = resolveLoaderSync(lazyKey)
-      const loader =
-        loaderOrPromise instanceof Promise ? await loaderOrPromise : loaderOrPromise
-      if (!loader) return { loaderData: undefined, routeId }
-
-      if (coalFullKey) {
-        const promise = loader(loaderProps)
-        const entry = { promise, expires: 0 }
-        pendingLoaderResults.set(coalFullKey, entry)
-        promise.then(
-          () => {
-            entry.expires = coalTtl > 0 ? Date.now() + coalTtl : 0
-            if (coalTtl <= 0)
-              Promise.resolve().then(() => pendingLoaderResults.delete(coalFullKey!))
-          },
-          () => pendingLoaderResults.delete(coalFullKey!)
-        )
-        const loaderData = await promise
-        return { loaderData, routeId }
-      }
-
-      const loaderData = await loader(loaderProps)
-      return { loaderData, routeId }
-    } catch (err) {
-      if (isResponse(err)) throw err
-      if ((err as any)?.code === 'ENOENT')
-        return { loaderData: undefined, routeId, isEnoent: true }
-      console.error(`[one] Error running loader for ${routeId}:`, err)
-      return { loaderData: undefined, routeId }
-    }
-  }
+  let isr = createISR()
 
   // request handlers - worker-only, always uses lazyRoutes
   const requestHandlers: RequestHandlers = {
@@ -244,12 +206,27 @@ export function createWorkerHandler(options: WorkerHandlerOptions) {
       return null
     },
 
-    async handleLoader({ route, loaderProps }) {
+    async handleLoader({ request, route, loaderProps }) {
       const routeFile = (route as any).routeFile || route.file
+      const timing = getRequestTiming(request)
+
+      // serve the data the cached page was rendered with
+      if (isr && isISRRoute(route)) {
+        const path = loaderProps?.path || '/'
+        const page = await isr.getPage(
+          { ...route, file: routeFile },
+          path,
+          loaderProps?.params || {},
+          { waitUntil: requestWaitUntil.get(request) }
+        )
+        if (isResponse(page)) throw page
+        if (!page) return make404LoaderJs(path)
+        return `export function loader() { return ${JSON.stringify(page.loaderData)} }`
+      }
 
       let loader: Function | null
       try {
-        const loaderResult = resolveLoaderSync(routeFile)
+        const loaderResult = resolveLoaderSync(undefined, routeFile)
         loader = loaderResult instanceof Promise ? await loaderResult : loaderResult
       } catch (err) {
         if ((err as any)?.code === 'ERR_MODULE_NOT_FOUND') return null
@@ -259,8 +236,10 @@ export function createWorkerHandler(options: WorkerHandlerOptions) {
       if (!loader) return null
 
       let json
+      const loaderStart = timing ? performance.now() : 0
       try {
         json = await loader(loaderProps)
+        if (timing) addPhase(timing, 'loaders', loaderStart)
       } catch (err) {
         if ((err as any)?.code === 'ENOENT') {
           return make404LoaderJs(
@@ -275,8 +254,9 @@ export function createWorkerHandler(options: WorkerHandlerOptions) {
       return `export function loader() { return ${JSON.stringify(json)} }`
     },
 
-    async handlePage({ route, url, loaderProps }) {
+    async handlePage({ request, route, url, loaderProps }) {
       const routeBuildInfo = routeToBuildInfo[route.file]
+      const timing = getRequestTiming(request)
 
       if (route.type === 'ssr') {
         if (!routeBuildInfo) {
@@ -287,64 +267,13 @@ export function createWorkerHandler(options: WorkerHandlerOptions) {
         }
 
         try {
-          const layoutRoutes = route.layouts || []
-
-          // fast path: skip layouts with no loader
-          const layoutLoaderPromises: Array<ReturnType<typeof importAndRunLoader>> = []
-          const noLoaderResults: Array<{
-            loaderData: unknown
-            routeId: string
-          }> = []
-
-          for (const layout of layoutRoutes) {
-            const cacheKey = layout.contextKey || ''
-            const cachedLoader = loaderCache.get(cacheKey)
-
-            if (cachedLoader === null) {
-              noLoaderResults.push({
-                loaderData: undefined,
-                routeId: layout.contextKey,
-              })
-            } else {
-              layoutLoaderPromises.push(
-                importAndRunLoader(layout.contextKey, layout.contextKey, loaderProps)
-              )
-            }
-          }
-
-          const pageLoaderPromise = importAndRunLoader(
-            route.file,
-            route.file,
+          const loadersStart = timing ? performance.now() : 0
+          const { pageResult, matches } = await runRouteLoaders(
+            route,
+            routeBuildInfo.serverJsPath,
             loaderProps
           )
-
-          let layoutResults: Array<{
-            loaderData: unknown
-            routeId: string
-            isEnoent?: boolean
-          }>
-          let pageResult: {
-            loaderData: unknown
-            routeId: string
-            isEnoent?: boolean
-          }
-
-          try {
-            if (layoutLoaderPromises.length === 0) {
-              layoutResults = noLoaderResults
-              pageResult = await pageLoaderPromise
-            } else {
-              const [asyncLayoutResults, pr] = await Promise.all([
-                Promise.all(layoutLoaderPromises),
-                pageLoaderPromise,
-              ])
-              layoutResults = [...noLoaderResults, ...asyncLayoutResults]
-              pageResult = pr
-            }
-          } catch (err) {
-            if (isResponse(err)) return err
-            throw err
-          }
+          if (timing) addPhase(timing, 'loaders', loadersStart)
 
           // loader ENOENT → serve nearest +not-found page
           if (pageResult.isEnoent) {
@@ -362,40 +291,8 @@ export function createWorkerHandler(options: WorkerHandlerOptions) {
             return new Response('404 Not Found', { status: 404 })
           }
 
-          // build matches array (layouts + page)
-          const matchPathname = loaderProps?.path || '/'
-          const matchParams = loaderProps?.params || {}
-          const matches: One.RouteMatch[] = new Array(layoutResults.length + 1)
-          for (let i = 0; i < layoutResults.length; i++) {
-            const result = layoutResults[i]
-            matches[i] = {
-              routeId: result.routeId,
-              pathname: matchPathname,
-              params: matchParams,
-              loaderData: result.loaderData,
-            }
-          }
-          matches[layoutResults.length] = {
-            routeId: pageResult.routeId,
-            pathname: matchPathname,
-            params: matchParams,
-            loaderData: pageResult.loaderData,
-          }
-
           const loaderData = pageResult.loaderData
 
-          // populate per-loader WeakMap for layout useLoader
-          for (const layout of layoutRoutes) {
-            const key = layout.contextKey
-            const loaderFn = loaderCache.get(key)
-            if (loaderFn) {
-              const result = layoutResults.find((r) => r.routeId === key)
-              if (result) setSSRLoaderData(loaderFn, result.loaderData)
-            }
-          }
-          const pageLoaderFn = loaderCache.get(route.file)
-          if (pageLoaderFn) setSSRLoaderData(pageLoaderFn, pageResult.loaderData)
-
           globalThis['__vxrnresetState']?.()
 
           const renderProps = {
@@ -411,17 +308,24 @@ export function createWorkerHandler(options: WorkerHandlerOptions) {
           }
 
           const _rl = ensureRenderLoaded()
-          if (_rl) await _rl
+          if (_rl) {
+            const renderLoadStart = timing ? performance.now() : 0
+            await _rl
+            if (timing) addPhase(timing, 'renderLoad', renderLoadStart)
+          }
 
           const status = route.isNotFound ? 404 : 200
           const responseHeaders = route.isNotFound ? htmlHeaders : ssrHtmlHeaders
+          const renderStart = timing ? performance.now() : 0
 
           if (useStreaming) {
             const stream = await renderStream!(renderProps)
+            if (timing) addPhase(timing, 'render', renderStart)
             return new Response(stream, { headers: responseHeaders, status })
           }
 
           const rendered = await render!(renderProps)
+          if (timing) addPhase(timing, 'render', renderStart)
           return new Response(rendered, { headers: responseHeaders, status })
         } catch (err) {
           if (isResponse(err)) return err
@@ -442,11 +346,18 @@ export function createWorkerHandler(options: WorkerHandlerOptions) {
 
         if (needsSpaShell) {
           try {
+            const loadersStart = timing ? performance.now() : 0
             const layoutResults = await Promise.all(
               layoutRoutes.map((layout: any) =>
-                importAndRunLoader(layout.contextKey, layout.contextKey, loaderProps)
+                importAndRunLoader(
+                  layout.contextKey,
+                  undefined,
+                  layout.contextKey,
+                  loaderProps
+                )
               )
             )
+            if (timing) addPhase(timing, 'loaders', loadersStart)
 
             const matches: One.RouteMatch[] = layoutResults.map((result) => ({
               routeId: result.routeId,
@@ -458,9 +369,14 @@ export function createWorkerHandler(options: WorkerHandlerOptions) {
             globalThis['__vxrnresetState']?.()
 
             const _rl = ensureRenderLoaded()
-            if (_rl) await _rl
+            if (_rl) {
+              const renderLoadStart = timing ? performance.now() : 0
+              await _rl
+              if (timing) addPhase(timing, 'renderLoad', renderLoadStart)
+            }
 
             const spaRouteBuildInfo = routeToBuildInfo[route.file]
+            const renderStart = timing ? performance.now() : 0
             const rendered = await render!({
               mode: 'spa-shell',
               loaderData: undefined,
@@ -473,6 +389,7 @@ export function createWorkerHandler(options: WorkerHandlerOptions) {
               cssContents: spaRouteBuildInfo?.cssContents,
               matches,
             })
+            if (timing) addPhase(timing, 'render', renderStart)
 
             return new Response(rendered, {
               headers: htmlHeaders,
@@ -486,6 +403,30 @@ export function createWorkerHandler(options: WorkerHandlerOptions) {
           }
         }
 
+        // ssg routes with revalidate serve their latest render, a miss on a
+        // prebuilt path falls through to the built html below
+        if (isr && isISRRoute(route)) {
+          const prebuilt =
+            !!routeMap[url.pathname] || Object.keys(route.routeKeys).length === 0
+          try {
+            const page = await isr.getPage(
+              route,
+              url.pathname,
+              loaderProps?.params || {},
+              { prebuilt, waitUntil: requestWaitUntil.get(request) }
+            )
+            if (page) {
+              return isResponse(page)
+                ? page
+                : new Response(page.html, { headers: htmlHeaders })
+            }
+          } catch (err) {
+            console.error(
+              `[one] Error rendering ssg route ${route.file}\n${err?.['stack'] ?? err}\nurl: ${url}`
+            )
+          }
+        }
+
         // static HTML lookup for SPA/SSG
         const isDynamicRoute = Object.keys(route.routeKeys).length > 0
         const routeCleanPath = route.urlCleanPath.replace(/\?/g, '')
@@ -574,6 +515,15 @@ export function createWorkerHandler(options: WorkerHandlerOptions) {
     const url = getURLfromRequestURL(request)
     const pathname = url.pathname
     const method = request.method
+    const timing = getRequestTiming(request)
+
+    if (pathname === metrics.prometheusPath) {
+      return createPrometheusResponse()
+    }
+
+    const ctx = executionCtx as WorkerExecutionContext | undefined
+    const waitUntil = ctx?.waitUntil?.bind(ctx)
+    if (isr && waitUntil) requestWaitUntil.set(request, waitUntil)
 
     // 1. redirects
     if (compiledRedirects) {
@@ -625,15 +575,17 @@ export function createWorkerHandler(options: WorkerHandlerOptions) {
     if (pathname.endsWith(LOADER_JS_POSTFIX_UNCACHED)) {
       const originalUrl = getPathFromLoaderPath(pathname)
 
-      for (const route of compiledManifest.pageRoutes) {
-        if (route.file === '') continue
-        if (!route.compiledRegex.test(originalUrl)) continue
+      const matchStart = timing ? performance.now() : 0
+      const route = compiledManifest.pageMatcher.match(originalUrl, hasRouteFile)?.route
+      if (timing) addPhase(timing, 'match', matchStart)
 
-        // ssg dynamic route not in routeMap → 404
+      if (route) {
+        // ssg dynamic route not in routeMap → 404, unless rendered on demand
         if (
           route.type === 'ssg' &&
           Object.keys(route.routeKeys).length > 0 &&
-          !routeMap[originalUrl]
+          !routeMap[originalUrl] &&
+          !isISRRoute(route)
         ) {
           return new Response(make404LoaderJs(originalUrl, 'ssg route not in routeMap'), {
             headers: { 'Content-Type': 'text/javascript' },
@@ -659,6 +611,8 @@ export function createWorkerHandler(options: WorkerHandlerOptions) {
         const finalUrl = new URL(originalUrl, url.origin)
         finalUrl.search = url.search
         const cleanedRequest = new Request(finalUrl, request)
+        forwardRequestTiming(request, cleanedRequest)
+        if (isr && waitUntil) requestWaitUntil.set(cleanedRequest, waitUntil)
 
         try {
           return await resolveLoaderRoute(
@@ -687,29 +641,34 @@ export function createWorkerHandler(options: WorkerHandlerOptions) {
     }
 
     // 5. API routes (any method)
-    for (const route of compiledManifest.apiRoutes) {
-      if (route.compiledRegex.test(pathname)) {
-        if (debugRouter)
-          console.info(`[one] ⚡ ${pathname} → matched API route: ${route.page}`)
-        const response = await resolveAPIRoute(
-          requestHandlers,
-          request,
-          url,
-          route,
-          env,
-          executionCtx
-        )
-        if (response && isResponse(response)) {
-          return setCacheHeaders(response, route, true)
-        }
-        return null
+    const matchStart = timing ? performance.now() : 0
+    const apiRoute = compiledManifest.apiMatcher.match(pathname)?.route
+    if (timing) addPhase(timing, 'match', matchStart)
+    if (apiRoute) {
+      if (debugRouter)
+        console.info(`[one] ⚡ ${pathname} → matched API route: ${apiRoute.page}`)
+      const response = await resolveAPIRoute(
+        requestHandlers,
+        request,
+        url,
+        apiRoute,
+        env,
+        executionCtx
+      )
+      if (response && isResponse(response)) {
+        return setCacheHeaders(response, apiRoute, true)
       }
+      return null
     }
 
     // 6. page routes (GET only)
     if (method === 'GET') {
-      for (const route of compiledManifest.pageRoutes) {
-        if (!route.compiledRegex.test(pathname)) continue
+      const pageMatchStart = timing ? performance.now() : 0
+      const pageMatch = compiledManifest.pageMatcher.match(pathname)
+      if (timing) addPhase(timing, 'match', pageMatchStart)
+
+      if (pageMatch) {
+        const { route, params } = pageMatch
 
         if (debugRouter) {
           console.info(
@@ -719,14 +678,7 @@ export function createWorkerHandler(options: WorkerHandlerOptions) {
 
         // fast path: SSR without middleware
         if (route.type === 'ssr' && !route.middlewares?.length) {
-          const params: Record<string, string> = {}
-          const match = route.compiledRegex.exec(pathname)
-          if (match?.groups) {
-            for (const [key, value] of Object.entries(match.groups)) {
-              params[route.routeKeys[key]] = value as string
-            }
-          }
-
+          setRequestRoute(request, route.page, 'page')
           const loaderProps = {
             path: pathname,
             search: url.search,
@@ -778,17 +730,22 @@ export function createWorkerHandler(options: WorkerHandlerOptions) {
     routeMap = newBuildInfo.routeMap
     currentPreloads = newBuildInfo.preloads
     currentCssPreloads = newBuildInfo.cssPreloads
+    cacheKey = newBuildInfo.constants.CACHE_KEY
     if (newLazyRoutes) currentLazyRoutes = newLazyRoutes
 
     // clear all caches
-    loaderCache.clear()
-    moduleImportCache.clear()
-    loaderCacheFnMap.clear()
-    pendingLoaderResults.clear()
+    clear()
     render = null
     renderStream = null
     renderLoading = null
+
+    // cached pages reference the previous build's assets
+    isr?.dispose()
+    isr = createISR()
   }
 
-  return { handleRequest, updateRoutes }
+  return {
+    handleRequest: metrics.enabled ? withRequestMetrics(handleRequest) : handleRequest,
+    updateRoutes,
+  }
 }
@@ -25,7 +25,18 @@ export async function generateRouteTypes(
     return acc
   }, {})
   const context = globbedRoutesToRouteContext(routes, routerRoot)
-  const declarations = getTypedRoutesDeclarationFile(context)
+  await writeRouteTypes(outFile, getTypedRoutesDeclarationFile(context))
+
+  // If experimental.typedRoutesGeneration is enabled, inject helpers into route files
+  if (typedRoutesMode) {
+    await injectTypedRouteHelpers(routerRoot, routePaths, typedRoutesMode)
+  }
+}
+
+/**
+ * Writes the declarations to `outFile`, leaving it untouched if they are the same.
+ */
+export async function writeRouteTypes(outFile: string, declarations: string) {
   const outDir = dirname(outFile)
   let currentDeclarations: string | undefined
   try {
@@ -40,44 +51,47 @@ export async function generateRouteTypes(
     await FSExtra.ensureDir(outDir)
     await writeFile(outFile, declarations)
   }
+}
 
-  // If experimental.typedRoutesGeneration is enabled, inject helpers into route files
-  if (typedRoutesMode) {
-    const mode: InjectMode = typedRoutesMode === 'type' ? 'type' : 'runtime'
-
-    // Inject helpers into each route file
-    for (const routePath of routePaths) {
-      // Skip non-route files (layouts, middlewares, type definitions, etc.)
-      if (
-        routePath.includes('_layout') ||
-        routePath.includes('+api') ||
-        routePath.startsWith('_') ||
-        routePath.endsWith('.d.ts')
-      ) {
-        continue
-      }
+export async function injectTypedRouteHelpers(
+  routerRoot: string,
+  routePaths: string[],
+  typedRoutesMode: 'type' | 'runtime'
+) {
+  const mode: InjectMode = typedRoutesMode === 'type' ? 'type' : 'runtime'
 
-      // Convert route path to route name
-      // e.g., "./app/(site)/docs/[slug]+ssg.tsx" -> "/(site)/docs/[slug]"
-      const fullPath = join(process.cwd(), routerRoot, routePath)
-      const routeName = routePath
-        .replace(/^\.\//, '')
-        .replace(/\+[^/]*$/, '') // Remove +ssg, +ssr, etc.
-        .replace(/\/index$/, '')
-        .replace(/index$/, '')
-      let cleanRouteName = removeSupportedExtensions(routeName).replace(/\/?index$/, '')
+  // Inject helpers into each route file
+  for (const routePath of routePaths) {
+    // Skip non-route files (layouts, middlewares, type definitions, etc.)
+    if (
+      routePath.includes('_layout') ||
+      routePath.includes('+api') ||
+      routePath.startsWith('_') ||
+      routePath.endsWith('.d.ts')
+    ) {
+      continue
+    }
 
-      // Ensure leading slash
-      if (!cleanRouteName.startsWith('/')) {
-        cleanRouteName = '/' + cleanRouteName
-      }
+    // Convert route path to route name
+    // e.g., "./app/(site)/docs/[slug]+ssg.tsx" -> "/(site)/docs/[slug]"
+    const fullPath = join(process.cwd(), routerRoot, routePath)
+    const routeName = routePath
+      .replace(/^\.\//, '')
+      .replace(/\+[^/]*$/, '') // Remove +ssg, +ssr, etc.
+      .replace(/\/index$/, '')
+      .replace(/index$/, '')
+    let cleanRouteName = removeSupportedExtensions(routeName).replace(/\/?index$/, '')
 
-      // Skip routes without dynamic segments (no params to type)
-      if (!cleanRouteName.includes('[')) {
-        continue
-      }
+    // Ensure leading slash
+    if (!cleanRouteName.startsWith('/')) {
+      cleanRouteName = '/' + cleanRouteName
+    }
 
-      await injectRouteHelpers(fullPath, cleanRouteName, mode)
+    // Skip routes without dynamic segments (no params to type)
+    if (!cleanRouteName.includes('[')) {
+      continue
     }
+
+    await injectRouteHelpers(fullPath, cleanRouteName, mode)
   }
 }
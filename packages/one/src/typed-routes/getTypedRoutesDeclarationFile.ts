@@ -1,4 +1,4 @@
-import { getRoutes } from '../router/getRoutes'
+import { getRoutes, type Options } from '../router/getRoutes'
 import { isTypedRoute, removeSupportedExtensions } from '../router/matchers'
 import type { RouteNode } from '../router/Route'
 import type { One } from '../vite/types'
@@ -8,18 +8,28 @@ const CATCH_ALL = /\[\.\.\..+?\]/g
 // /[param1] - Match [param1]
 const SLUG = /\[.+?\]/g
 
+export const typedRoutesOptions: Options = {
+  platformRoutes: false, // We don't need to generate platform specific routes
+  ignoreEntryPoints: true,
+  ignoreRequireErrors: true,
+  // importMode: 'async',
+}
+
 export function getTypedRoutesDeclarationFile(ctx: One.RouteContext) {
+  return getRoutesDeclarationFile(getRoutes(ctx, typedRoutesOptions))
+}
+
+/**
+ * Declarations for routes from getRoutes or a RouteTree, created with
+ * typedRoutesOptions.
+ */
+export function getRoutesDeclarationFile(routeNode: RouteNode | null) {
   const staticRoutes = new Set<string>()
   const dynamicRoutes = new Set<string>()
   const dynamicRouteContextKeys = new Set<string>()
 
   walkRouteNode(
-    getRoutes(ctx, {
-      platformRoutes: false, // We don't need to generate platform specific routes
-      ignoreEntryPoints: true,
-      ignoreRequireErrors: true,
-      // importMode: 'async',
-    }),
+    routeNode,
     '',
     staticRoutes,
     dynamicRoutes,
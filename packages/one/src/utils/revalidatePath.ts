@@ -0,0 +1,19 @@
+// set up by the server for every handler serving ssg routes with `revalidate`.
+// kept on globalThis since api routes can import a separate copy of one.
+export const ISR_REVALIDATORS_KEY = '__oneISRRevalidators'
+
+/**
+ * Evicts pages of ssg routes that `export const revalidate` from the server's
+ * regeneration cache and renders them again in the background. Call it from an
+ * API route or webhook once the data behind those pages changed.
+ *
+ * @example
+ * await revalidatePath('/blog/hello', '/blog')
+ */
+export async function revalidatePath(...paths: string[]): Promise<void> {
+  const revalidators = globalThis[ISR_REVALIDATORS_KEY] as
+    | Set<(paths: string[]) => Promise<void>>
+    | undefined
+  if (!revalidators?.size) return
+  await Promise.all([...revalidators].map((revalidate) => revalidate(paths)))
+}
@@ -52,4 +52,21 @@ describe(createRouteIndex, () => {
     expect(routeIndex.update('unlink', addedRoute)).toBe(true)
     expect(routeIndex.getPaths()).toEqual(['./index.tsx'])
   })
+
+  it('patches the route trees it created', () => {
+    writeRoute('_layout.tsx')
+    writeRoute('index.tsx')
+    const routeIndex = createRouteIndex({ routerRoot: join(testDir!, 'app') })
+    const routeTree = routeIndex.createRouteTree({ ignoreEntryPoints: true })
+    const routes = () => routeTree.getRoutes()!.children.map((child) => child.contextKey)
+
+    expect(routes()).toEqual(['./index.tsx', '', ''])
+
+    const addedRoute = writeRoute('about.tsx')
+    routeIndex.update('add', addedRoute)
+    expect(routes()).toEqual(['./about.tsx', './index.tsx', '', ''])
+
+    routeIndex.update('unlink', addedRoute)
+    expect(routes()).toEqual(['./index.tsx', '', ''])
+  })
 })
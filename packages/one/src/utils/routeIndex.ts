@@ -1,5 +1,7 @@
 import micromatch from 'micromatch'
 import path from 'node:path'
+import { createRouteTree, type Options, type RouteTree } from '../router/getRoutes'
+import { createMockModuleWithContext } from '../server/createRoutesManifest'
 import { globDir } from './globDir'
 import { isPathInsideDirectory, isRouteFilePath } from './routeFileWatch'
 
@@ -23,12 +25,26 @@ export function createRouteIndex({
 }) {
   const absoluteRouterRoot = path.resolve(routerRoot)
   const routePaths = new Set(getRoutePaths(absoluteRouterRoot, ignoredRouteFiles))
+  const routeTrees: RouteTree[] = []
 
   return {
     getPaths() {
       return [...routePaths].sort()
     },
 
+    /**
+     * A route tree over these paths that later updates patch in place, so a
+     * new or removed file doesn't rebuild the routes from scratch.
+     */
+    createRouteTree(options: Options) {
+      const routeTree = createRouteTree(
+        createMockModuleWithContext([...routePaths].sort()),
+        options
+      )
+      routeTrees.push(routeTree)
+      return routeTree
+    },
+
     update(event: string, filePath: string) {
       if (event !== 'add' && event !== 'delete' && event !== 'unlink') return false
       if (!isPathInsideDirectory(filePath, absoluteRouterRoot)) return false
@@ -46,12 +62,19 @@ export function createRouteIndex({
       }
 
       if (event === 'add') {
-        const size = routePaths.size
+        if (routePaths.has(routePath)) return false
         routePaths.add(routePath)
-        return routePaths.size !== size
+        for (const routeTree of routeTrees) {
+          routeTree.add(routePath)
+        }
+        return true
       }
 
-      return routePaths.delete(routePath)
+      if (!routePaths.delete(routePath)) return false
+      for (const routeTree of routeTrees) {
+        routeTree.remove(routePath)
+      }
+      return true
     },
   }
 }
@@ -13,8 +13,10 @@ export const serverlessVercelNodeJsConfig = {
   //   https://vercel.com/docs/build-output-api/v3/primitives#edge-functions
   // runtime: 'edge',
   // regions: 'all',
-  // @TODO: We could support ISR in the future as well.
-  // Requires a larger discusion of how to handle ISR in general.
+  // @TODO: ssg routes can `export const revalidate`, which `one serve` and
+  // workers handle with their own cache (server/isr.ts). vercel output still
+  // only ships the prebuilt html, mapping revalidate onto prerender functions
+  // would let vercel regenerate them too.
   //   https://vercel.com/docs/build-output-api/v3/primitives#prerender-functions
   // We would need to generate the bypassToken and copy *.html fallback files to the *.func folder.
   //   https://vercel.com/docs/build-output-api/v3/primitives#fallback-static-file
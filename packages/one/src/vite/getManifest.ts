@@ -1,15 +1,25 @@
-import { createRoutesManifest } from '../server/createRoutesManifest'
+import type { RouteTree } from '../router/getRoutes'
+import {
+  createRoutesManifest,
+  createRoutesManifestFromTree,
+} from '../server/createRoutesManifest'
 import { getRoutePaths } from '../utils/routeIndex'
 
 export function getManifest({
   routerRoot,
   ignoredRouteFiles,
   routePaths: routePathsIn,
+  routeTree,
 }: {
   routerRoot: string
   ignoredRouteFiles?: string[]
   routePaths?: string[]
+  /** kept up to date by the dev server, see RouteIndex.createRouteTree */
+  routeTree?: RouteTree
 }) {
+  if (routeTree) {
+    return createRoutesManifestFromTree(routeTree)
+  }
   const routePaths = routePathsIn ?? getRoutePaths(routerRoot, ignoredRouteFiles)
   return createRoutesManifest(routePaths, {
     platform: 'web',
@@ -9,6 +9,7 @@ import type { ModuleRunner } from 'vite/module-runner'
 import { getSpaHeaderElements } from '../../constants'
 import { createHandleRequest } from '../../createHandleRequest'
 import type { RouteNode } from '../../router/Route' // used for type in runLoaderWithTracking
+import { getRoutesManifestOptions } from '../../server/createRoutesManifest'
 import type { RenderAppProps } from '../../types'
 import { getPageExport } from '../../utils/getPageExport'
 import { getRouterRootFromOneOptions } from '../../utils/getRouterRootFromOneOptions'
@@ -87,6 +88,8 @@ export function createFileSystemRouterPlugin(
     deps.add(routePath)
   }
 
+  // patched by routeIndex.update, so a route file change doesn't reparse every route
+  const routeTree = routeIndex.createRouteTree(getRoutesManifestOptions({}))
   let handleRequest = createRequestHandler()
   // handle only one at a time in dev mode to avoid "Detected multiple renderers concurrently" errors
   let renderPromise: Promise<void> | null = null
@@ -605,7 +608,8 @@ export function createFileSystemRouterPlugin(
       {
         routerRoot,
         ignoredRouteFiles: options.router?.ignoredRouteFiles,
-        routePaths: routeIndex.getPaths(),
+        routeTree,
+        metrics: options.server?.metrics,
       }
     )
   }
@@ -1,7 +1,14 @@
-import { join, resolve } from 'node:path'
+import { join, relative, resolve } from 'node:path'
 import { debounce } from 'perfect-debounce'
 import type { Plugin } from 'vite'
-import { generateRouteTypes } from '../../typed-routes/generateRouteTypes'
+import {
+  injectTypedRouteHelpers,
+  writeRouteTypes,
+} from '../../typed-routes/generateRouteTypes'
+import {
+  getRoutesDeclarationFile,
+  typedRoutesOptions,
+} from '../../typed-routes/getTypedRoutesDeclarationFile'
 import { getRouterRootFromOneOptions } from '../../utils/getRouterRootFromOneOptions'
 import type { RouteIndex } from '../../utils/routeIndex'
 import { isRouteFileWatchEvent } from '../../utils/routeFileWatch'
@@ -26,16 +33,28 @@ export function generateFileSystemRouteTypesPlugin(
       const typedRoutesGeneration =
         options.router?.experimental?.typedRoutesGeneration || undefined
 
+      // patched by routeIndex.update, so new files don't reparse every route
+      const routeTree = routeIndex.createRouteTree(typedRoutesOptions)
+      let routesChanged = false
+      // files to inject route helpers into, only the ones that were added or edited
+      const changedRoutePaths = new Set<string>()
+
+      async function generateRouteTypes() {
+        if (routesChanged) {
+          routesChanged = false
+          await writeRouteTypes(outFile, getRoutesDeclarationFile(routeTree.getRoutes()))
+        }
+
+        if (typedRoutesGeneration && changedRoutePaths.size) {
+          const routePaths = new Set(routeIndex.getPaths())
+          const changed = [...changedRoutePaths].filter((path) => routePaths.has(path))
+          changedRoutePaths.clear()
+          await injectTypedRouteHelpers(routerRoot, changed, typedRoutesGeneration)
+        }
+      }
+
       // on change ./app stuff lets reload this to pick up any route changes
-      const generateRouteTypesDebounced = debounce(async () => {
-        await generateRouteTypes(
-          outFile,
-          routerRoot,
-          options.router?.ignoredRouteFiles,
-          typedRoutesGeneration,
-          routeIndex.getPaths()
-        )
-      }, 100)
+      const generateRouteTypesDebounced = debounce(generateRouteTypes, 100)
       const fileWatcherChangeListener = (type: string, path: string) => {
         if (
           isRouteFileWatchEvent({
@@ -46,6 +65,13 @@ export function generateFileSystemRouteTypesPlugin(
           })
         ) {
           routeIndex.update(type, path)
+          // edits don't change the routes, but may need helpers injected again
+          if (type !== 'change') {
+            routesChanged = true
+          }
+          if (typedRoutesGeneration && type !== 'unlink' && type !== 'delete') {
+            changedRoutePaths.add(`./${relative(appDir, path).replaceAll('\\', '/')}`)
+          }
           return generateRouteTypesDebounced()
         }
       }
@@ -55,13 +81,13 @@ export function generateFileSystemRouteTypesPlugin(
       return () => {
         // once on startup:
 
-        generateRouteTypes(
-          outFile,
-          routerRoot,
-          options.router?.ignoredRouteFiles,
-          typedRoutesGeneration,
-          routeIndex.getPaths()
-        )
+        routesChanged = true
+        if (typedRoutesGeneration) {
+          for (const routePath of routeIndex.getPaths()) {
+            changedRoutePaths.add(routePath)
+          }
+        }
+        generateRouteTypes()
       }
     },
   } satisfies Plugin
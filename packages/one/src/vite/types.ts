@@ -38,6 +38,9 @@ export type RouteInfo<TRegex = string> = {
   // module instead of importing the route's server bundle. avoids evaluating
   // page modules in workerd for routes that have no loader export.
   hasLoader?: boolean
+  // `export const revalidate` of an ssg route, set at build time. when set the
+  // server renders unknown params on demand and regenerates stale pages.
+  revalidate?: number | false
 }
 
 export namespace One {
@@ -604,6 +607,156 @@ export namespace One {
        * @default true
        */
       loggingEnabled?: boolean
+
+      /**
+       * Serve SSG and SPA html from memory instead of reading it from disk on
+       * every request. `one build` writes brotli and gzip variants plus a
+       * content hash for each html file, and `one serve` keeps them in a
+       * byte-bounded LRU, negotiates Accept-Encoding, sends strong ETags and
+       * answers matching If-None-Match requests with a 304.
+       *
+       * Not used on workers, which serve html through their asset binding.
+       *
+       * @example
+       * htmlCache: { maxBytes: 100 * 1024 * 1024, preload: true }
+       *
+       * @default false
+       */
+      htmlCache?:
+        | boolean
+        | {
+            /**
+             * Upper bound for cached html, counting every encoded variant.
+             * @default 50MB
+             */
+            maxBytes?: number
+
+            /**
+             * Load every built html file at startup (until maxBytes is reached)
+             * instead of on first request.
+             * @default false
+             */
+            preload?: boolean
+          }
+
+      /**
+       * Cache the rendered html of ssr routes in memory. A route opts in by
+       * exporting `loaderCache`: when every loader on the page (page and
+       * layouts) returns a `{ key, ttl }`, the html is cached under those keys
+       * and the url for the shortest ttl. Hits skip both loaders and rendering,
+       * streamed renders are tee'd into the cache as they're sent.
+       *
+       * Use `setSSRCacheStatsHandler` from `one/serve` to observe hits, misses
+       * and evictions.
+       *
+       * @example
+       * ssrCache: { maxBytes: 100 * 1024 * 1024 }
+       *
+       * @default false
+       */
+      ssrCache?:
+        | boolean
+        | {
+            /**
+             * Upper bound for cached html.
+             * @default 50MB
+             */
+            maxBytes?: number
+          }
+
+      /**
+       * Time each request through its phases: route match, middleware imports,
+       * the middleware chain, loaders, the render entry import and the render
+       * (up to the shell when streaming). Responses get a `Server-Timing`
+       * header, and a handler registered with `setRequestMetricsHandler` from
+       * `one/serve` receives the timings, time to first byte and which caches
+       * answered once the body was sent.
+       *
+       * Registering a handler turns timing on without this option. With both
+       * off, requests aren't wrapped at all.
+       *
+       * @example
+       * metrics: { prometheus: '/internal/metrics' }
+       *
+       * @default false
+       */
+      metrics?:
+        | boolean
+        | {
+            /**
+             * Send a `Server-Timing` header with the phases.
+             * @default true
+             */
+            serverTiming?: boolean
+
+            /**
+             * Serve latency histograms per route in the Prometheus text format.
+             * `true` serves them on `/__one/metrics`, a string sets the path.
+             * @default false
+             */
+            prometheus?: boolean | string
+          }
+
+      /**
+       * Render ssr pages (and spa shells and ssg regenerations) on worker
+       * threads instead of the main event loop, so a slow render doesn't hold
+       * up static, api and loader requests, and one process can use every core
+       * without `--cluster`. Each worker imports its own copy of the server
+       * entry. Streamed html is sent back in transferred buffers, a few chunks
+       * ahead of the client.
+       *
+       * Renders wait for a free worker in a bounded queue, once it's full new
+       * renders are answered with a 503 and `retry-after`.
+       *
+       * `ONE_RENDER_WORKERS` overrides the worker count, `0` turns it off.
+       *
+       * @example
+       * renderWorkers: { workers: 4, maxRequests: 10_000, maxMemoryMB: 512 }
+       *
+       * @default false
+       */
+      renderWorkers?:
+        | boolean
+        | number
+        | {
+            /**
+             * @default one less than the cpu count
+             */
+            workers?: number
+
+            /**
+             * Renders in flight on each worker. Streams waiting on a slow
+             * client or loaders waiting on io leave the thread free for others.
+             * @default 8
+             */
+            concurrency?: number
+
+            /**
+             * Renders waiting for a free worker before new ones get a 503.
+             * @default workers * concurrency
+             */
+            maxQueue?: number
+
+            /**
+             * Replace a worker after it rendered this many pages.
+             * @default unlimited
+             */
+            maxRequests?: number
+
+            /**
+             * Replace a worker once its heap grows past this size.
+             * @default unlimited
+             */
+            maxMemoryMB?: number
+
+            /**
+             * Where page and layout loaders run. `'worker'` moves loaders and
+             * their imports off the main thread too, but renders of those
+             * routes aren't kept in `ssrCache`.
+             * @default 'main'
+             */
+            loaders?: 'main' | 'worker'
+          }
     }
 
     /**
@@ -632,6 +785,20 @@ export namespace One {
        */
       workers?: boolean
 
+      /**
+       * Reuse static pages from the previous build when nothing they depend on
+       * changed: their server module graph, layout and middleware chunks, css,
+       * preloads, params and the data their loaders return. Loaders still run
+       * on every build, only rendering and writing is skipped.
+       *
+       * The manifest and reusable output live in `node_modules/.cache/one/incremental`.
+       * Pages embed the CACHE_KEY, so pin `ONE_CACHE_KEY` between builds to get
+       * any reuse. `ONE_BUILD_INCREMENTAL=0|1` overrides this value.
+       *
+       * @default false
+       */
+      incremental?: boolean
+
       /**
        * Scan client bundles for leaked secrets (API keys, tokens, passwords)
        * after building. Catches accidental exposure of server-side secrets
@@ -762,6 +929,12 @@ export namespace One {
      */
     cssContentsByPath?: Record<string, string>
 
+    /**
+     * Strong ETags keyed by html path, written when `server.htmlCache` is on.
+     * Each html file also has `.br` and `.gz` siblings next to it.
+     */
+    htmlEtags?: Record<string, string>
+
     // for quick checking if preload exists
     preloads: Record<string, boolean>
     cssPreloads: Record<string, boolean>
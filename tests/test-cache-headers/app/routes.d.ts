@@ -11,6 +11,8 @@ declare module 'one' {
         | `/_sitemap`
         | `/middleware`
         | `/ssr/cache-headers`
+        | `/ssr/cached-cookie`
+        | `/ssr/cached-headers`
         | `/ssr/cookie-test`
       DynamicRoutes: never
       DynamicRouteTemplate: never
@@ -0,0 +1,23 @@
+import { setResponseHeaders, useLoader } from 'one'
+
+export const loaderCache = () => ({ key: 'cached-cookie', ttl: 60_000 })
+
+export async function loader() {
+  await setResponseHeaders((headers) => {
+    headers.set('Set-Cookie', 'visitor=first; Path=/; HttpOnly')
+  })
+
+  return {
+    timestamp: Date.now(),
+  }
+}
+
+export default function CachedCookieTest() {
+  const data = useLoader(loader)
+
+  return (
+    <div>
+      <span id="timestamp">{data.timestamp}</span>
+    </div>
+  )
+}
@@ -0,0 +1,25 @@
+import { setResponseHeaders, useLoader } from 'one'
+
+export const loaderCache = () => ({ key: 'cached-headers', ttl: 60_000 })
+
+export async function loader() {
+  await setResponseHeaders((headers) => {
+    headers.set('Cache-Control', 'public, s-maxage=60')
+    headers.set('X-Cached-Header', 'from-loader')
+  })
+
+  return {
+    timestamp: Date.now(),
+  }
+}
+
+export default function CachedHeadersTest() {
+  const data = useLoader(loader)
+
+  return (
+    <div>
+      <h1>Cached Headers Test</h1>
+      <span id="timestamp">{data.timestamp}</span>
+    </div>
+  )
+}
@@ -1,6 +1,7 @@
 import { describe, expect, it } from 'vitest'
 
 const serverUrl = process.env.ONE_SERVER_URL
+const isProd = process.env.TEST_ONLY === 'prod'
 
 describe('Cache Headers / ISR', () => {
   describe('SSR routes with setResponseHeaders', () => {
@@ -31,6 +32,40 @@ describe('Cache Headers / ISR', () => {
     })
   })
 
+  describe('SSR routes cached with ssrCache', () => {
+    const getTimestamp = (html: string) => html.match(/id="timestamp">(\d+)</)?.[1]
+
+    it('should replay loader headers on cached responses', async () => {
+      const first = await fetch(`${serverUrl}/ssr/cached-headers`)
+      const firstTimestamp = getTimestamp(await first.text())
+      const second = await fetch(`${serverUrl}/ssr/cached-headers`)
+      const secondTimestamp = getTimestamp(await second.text())
+
+      if (isProd) {
+        expect(secondTimestamp).toBe(firstTimestamp)
+      }
+      for (const response of [first, second]) {
+        expect(response.status).toBe(200)
+        expect(response.headers.get('cache-control')).toBe('public, s-maxage=60')
+        expect(response.headers.get('x-cached-header')).toBe('from-loader')
+        expect(response.headers.get('content-type')).toContain('text/html')
+      }
+    })
+
+    it('should not cache renders that set cookies', async () => {
+      const first = await fetch(`${serverUrl}/ssr/cached-cookie`)
+      const firstTimestamp = getTimestamp(await first.text())
+      await new Promise((resolve) => setTimeout(resolve, 5))
+      const second = await fetch(`${serverUrl}/ssr/cached-cookie`)
+      const secondTimestamp = getTimestamp(await second.text())
+
+      expect(secondTimestamp).not.toBe(firstTimestamp)
+      for (const response of [first, second]) {
+        expect(response.headers.get('set-cookie')).toContain('visitor=first')
+      }
+    })
+  })
+
   describe('API routes with Response headers', () => {
     it('should return cache-control headers set on Response', async () => {
       const response = await fetch(`${serverUrl}/api/cache-headers`)
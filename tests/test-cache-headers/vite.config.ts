@@ -9,6 +9,9 @@ export default {
           ignoreConfigErrors: true,
         },
       },
+      server: {
+        ssrCache: true,
+      },
     }),
   ],
 } satisfies UserConfig